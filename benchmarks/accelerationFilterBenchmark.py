@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: NumPy filter bank vs. the per-sample Python moving average
+that MPU6050.get_calibrated_acceleration() used.
+
+Run from the project root:
+    python -m benchmarks.accelerationFilterBenchmark [--rate 1000] [--seconds 10] [--block 100]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.accelerationFilter import AccelerationFilterBank
+
+
+def legacy_moving_average(samples, window_size):
+    """The old approach: list of tuples and three generator sums for every sample."""
+    window = []
+    out = []
+    for ax, ay, az in samples:
+        window.append((ax, ay, az))
+        if len(window) > window_size:
+            window.pop(0)
+        n = len(window)
+        out.append((
+            sum(sample[0] for sample in window) / n,
+            sum(sample[1] for sample in window) / n,
+            sum(sample[2] for sample in window) / n,
+        ))
+    return out
+
+
+def run_blocks(filter_bank, data, block):
+    for start in range(0, len(data), block):
+        filter_bank.process(data[start:start + block])
+
+
+def measure(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=1000, help="input sample rate in Hz")
+    parser.add_argument("--seconds", type=float, default=10.0, help="seconds of input data")
+    parser.add_argument("--block", type=int, default=100, help="samples per process() call")
+    parser.add_argument("--window", type=int, default=20, help="moving average window")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    count = int(args.rate * args.seconds)
+    data = rng.normal(0.0, 0.3, size=(count, 3))
+    data_tuples = [tuple(row) for row in data.tolist()]
+
+    configs = {
+        "moving_average": {"moving_average": {"window_size": args.window}},
+        "low_pass": {"low_pass": {"cutoff_hz": 3.0, "sample_rate": args.rate}},
+        "median": {"median": {"window_size": 5}},
+        "peak_hold": {"peak_hold": {"hold_samples": args.rate}},
+        "median+low_pass": {"median": {"window_size": 5},
+                            "low_pass": {"cutoff_hz": 3.0, "sample_rate": args.rate}},
+    }
+
+    print(f"{count} samples ({args.seconds:g} s at {args.rate} Hz), blocks of {args.block}")
+    print(f"{'filter':<22}{'total ms':>10}{'us/sample':>11}{'CPU @ rate':>12}")
+
+    def report(name, seconds):
+        per_sample = seconds / count * 1e6
+        cpu = seconds / args.seconds * 100
+        print(f"{name:<22}{seconds * 1000:>10.1f}{per_sample:>11.3f}{cpu:>11.2f}%")
+        return seconds
+
+    legacy = report("legacy per-sample", measure(lambda: legacy_moving_average(data_tuples, args.window)))
+
+    for name, options in configs.items():
+        stages = name.split("+")
+        seconds = measure(lambda: run_blocks(AccelerationFilterBank(stages, **options), data, args.block))
+        report(name, seconds)
+        if name == "moving_average":
+            print(f"{'':<22}speed-up vs legacy: {legacy / seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Benchmark: the whole dashboard, headless.
+
+Builds the dashboard of main.py (DashboardBackend, main.qml, sensor workers)
+on the offscreen platform with every sensor on a deterministic source:
+seeded simulations for the DHT11 and MPU6050, a replayed GPS capture, and a
+mock GPIO chip with an RPM pulse train for the GPIO drivers. Every view is
+shown for --seconds and the report (JSON) has the sensor tick latencies
+(read start to handled on the GUI thread), the frames rendered and the
+frame time percentiles per view, the sensor latency histograms, the
+startup timeline, the CPU time and the peak RSS, to compare commits.
+
+Run from the project root:
+    python -m benchmarks.dashboardBenchmark [--seconds 10] [--views gps,data] [--output report.json]
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6 import __version__ as pyside_version
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtWidgets import QApplication
+
+import main as dashboard
+from src.sensors.GPIOService import GPIOService, MockChip
+from benchmarks.gpsReplayBenchmark import percentile, synthetic_capture
+
+RPM_PIN = 17
+LDR_PINS = (22, 10)
+BUTTON_PINS = (5, 6)
+
+
+def summary(values):
+    """Percentiles in ms of a list of ms values."""
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 3),
+        "p90": round(percentile(values, 90), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+class RPMSignal:
+    """Ignition pulses on the mock chip for a slowly varying engine speed."""
+
+    def __init__(self, chip, pin=RPM_PIN, low=900, high=5500, period=20.0):
+        self.chip = chip
+        self.pin = pin
+        self.low = low
+        self.high = high
+        self.period = period
+        self.pulses = 0
+        self._running = False
+        self._thread = None
+
+    def rpm_at(self, t):
+        middle = (self.low + self.high) / 2
+        return middle - (self.high - self.low) / 2 * math.cos(2 * math.pi * t / self.period)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+    def _run(self):
+        start = time.monotonic()
+        due = start
+        while self._running:
+            due += 60.0 / self.rpm_at(due - start)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.chip.pulse(self.pin, int(due * 1e9))
+            self.pulses += 1
+
+
+class FrameRecorder:
+    """
+    Frame timing from the QQuickWindow signals, per view: the frame time is
+    beforeSynchronizing to frameSwapped (sync + render), the interval is the
+    time between two swaps. The signals may come from the render thread.
+    """
+
+    def __init__(self, window, backend):
+        self.backend = backend
+        self.recording = False
+        self.frames = {}  # view -> ([frame ms], [interval ms])
+        self._sync_ns = None
+        self._swap_ns = None
+        window.beforeSynchronizing.connect(self._on_sync, Qt.DirectConnection)
+        window.frameSwapped.connect(self._on_swap, Qt.DirectConnection)
+
+    def _on_sync(self):
+        self._sync_ns = time.perf_counter_ns()
+
+    def _on_swap(self):
+        now = time.perf_counter_ns()
+        if self.recording and self._sync_ns is not None:
+            frame_ms, interval_ms = self.frames.setdefault(self.backend.currentView, ([], []))
+            frame_ms.append((now - self._sync_ns) / 1e6)
+            if self._swap_ns is not None:
+                interval_ms.append((now - self._swap_ns) / 1e6)
+        self._swap_ns = now if self.recording else None
+        self._sync_ns = None
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(dashboard.__file__)), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="time per view")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds after a view switch that are not measured")
+    parser.add_argument("--views", default=",".join(dashboard.VIEWS), help="comma separated views to measure")
+    parser.add_argument("--gps-replay", metavar="FILE", help="GPS capture (default: a synthetic route)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the sensor simulations")
+    parser.add_argument("--log", action="store_true", help="also record the telemetry log")
+    parser.add_argument("--size", type=int, default=800, help="window size in pixels (the display is 800x800)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    views = args.views.split(",")
+    for view in views:
+        if view not in dashboard.VIEWS:
+            parser.error(f"unknown view {view!r}, use {dashboard.VIEWS}")
+
+    random.seed(args.seed)
+    output = os.path.abspath(args.output) if args.output else None
+
+    # The JSON report is the only thing on stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(args, views)
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+        print(f"[INFO] Report written to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+def run(args, views):
+    """Build the dashboard, show the views and return the report dict."""
+    # Settings, calibration, trip checkpoint and logs go to a scratch folder
+    workdir = tempfile.mkdtemp(prefix="dashboard-benchmark-")
+    gps_file = os.path.abspath(args.gps_replay) if args.gps_replay else os.path.join(workdir, "route.nmeacap")
+    if not args.gps_replay:
+        synthetic_capture(gps_file, epochs=int(args.seconds * len(views)) + 60)
+    os.chdir(workdir)
+
+    dashboard_args, qt_args = dashboard.parse_args(
+        ["--gps-replay", gps_file, "--log-dir", os.path.join(workdir, "logs")]
+        + ([] if args.log else ["--no-log"])
+    )
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    # Buttons idle (pulled up), both light sensors see daylight
+    chip = MockChip({pin: 1 for pin in BUTTON_PINS + LDR_PINS})
+    rpm_signal = RPMSignal(chip)
+
+    started = time.perf_counter()
+    app_state = dashboard.build_dashboard(app, dashboard_args, simulate=True, gpio=GPIOService(chip=chip))
+    if app_state is None:
+        sys.exit("main.qml failed to load")
+    build_seconds = time.perf_counter() - started
+
+    window = app_state.window
+    window.setWidth(args.size)
+    window.setHeight(args.size)
+
+    backend = app_state.backend
+    frames = FrameRecorder(window, backend)
+    ticks = {}
+
+    def on_tick(name, read_ns, handled_ns):
+        if frames.recording:
+            ticks.setdefault(name, []).append((handled_ns - read_ns) / 1e6)
+
+    app_state.scheduler.on_tick = on_tick
+
+    # Show every view for args.seconds, measure after the warmup
+    schedule = list(views)
+
+    def next_view():
+        frames.recording = False
+        if not schedule:
+            app.quit()
+            return
+        view = schedule.pop(0)
+        backend.currentView = view
+        QTimer.singleShot(int(args.warmup * 1000), start_measuring)
+        QTimer.singleShot(int((args.warmup + args.seconds) * 1000), next_view)
+
+    def start_measuring():
+        frames.recording = True
+
+    cpu_start = time.process_time()
+    usage_start = resource.getrusage(resource.RUSAGE_SELF) if resource else None
+    wall_start = time.perf_counter()
+
+    rpm_signal.start()
+    app_state.scheduler.start()
+    QTimer.singleShot(0, next_view)
+    app.aboutToQuit.connect(rpm_signal.stop)
+    app.exec()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pyside": pyside_version,
+        "platform": app.platformName(),
+        "seconds_per_view": args.seconds,
+        "seed": args.seed,
+        "build_seconds": round(build_seconds, 3),
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(cpu / wall * 100, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "rpm_pulses": rpm_signal.pulses,
+        "views": {},
+        "ticks": {name: summary(latencies) for name, latencies in sorted(ticks.items())},
+        # Read / apply / read-to-frame histograms of the whole run (src/latencyStats.py)
+        "latency": app_state.scheduler.stats.snapshot(),
+        # Imports, QML load, first frame and sensor bring-up (src/startupTimeline.py)
+        "startup": app_state.timeline.snapshot(),
+    }
+    if usage_start:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        report["cpu_user_seconds"] = round(usage.ru_utime - usage_start.ru_utime, 3)
+        report["cpu_system_seconds"] = round(usage.ru_stime - usage_start.ru_stime, 3)
+
+    for view in views:
+        frame_ms, interval_ms = frames.frames.get(view, ([], []))
+        report["views"][view] = {
+            "frames": len(frame_ms),
+            "fps": round(len(frame_ms) / args.seconds, 1),
+            "frame_ms": summary(frame_ms),
+            "interval_ms": summary(interval_ms),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    main()
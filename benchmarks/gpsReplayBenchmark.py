@@ -0,0 +1,84 @@
+"""
+Benchmark: replay a GPS capture through the VK162GPS reader path.
+
+Reports parser throughput and the time from the chunk that completes an
+epoch being read to the fix snapshot being published. Without --file a
+synthetic route (one epoch per second, split into 64 byte serial reads)
+is generated.
+
+Run from the project root:
+    python -m benchmarks.gpsReplayBenchmark [--file capture.nmeacap] [--speed 0] [--epochs 3600]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.sensors.VK162GPS import VK162GPS
+from src.sensors.NMEACapture import write_capture
+from benchmarks.nmeaParserBenchmark import synthetic_corpus
+
+
+def synthetic_capture(path, epochs, talker="GN"):
+    sentences = synthetic_corpus(epochs * 7, talker)
+    chunks = []
+    for epoch in range(epochs):
+        data = "".join(s + "\r\n" for s in sentences[epoch * 7:(epoch + 1) * 7]).encode("ascii")
+        for i in range(0, len(data), 64):
+            # 9600 baud is about 960 bytes per second
+            chunks.append((epoch + i / 960, data[i:i + 64]))
+    write_capture(path, chunks)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file", help="capture file (gps_*.nmeacap)")
+    parser.add_argument("--speed", type=float, default=0.0, help="times real time, 0 = as fast as possible")
+    parser.add_argument("--epochs", type=int, default=3600, help="length of the synthetic route in seconds")
+    args = parser.parse_args()
+
+    path = args.file
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(), "synthetic.nmeacap")
+        synthetic_capture(path, args.epochs)
+
+    gps = VK162GPS(replay_file=path, replay_speed=args.speed)
+
+    # Remember when each chunk was handed to the parser
+    feed = gps.feed
+    last_feed = [0.0]
+
+    def timed_feed(chunk):
+        last_feed[0] = time.monotonic()
+        feed(chunk)
+
+    gps.feed = timed_feed
+
+    latencies = []
+    gps.start_reader(on_fix=lambda fix: latencies.append(fix['fix_time'] - last_feed[0]))
+
+    start = time.perf_counter()
+    while not gps.replay_done:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    gps.close()
+
+    sentences = gps.parser.sentences
+    print(f"capture            {path}")
+    print(f"sentences          {sentences} ({gps.parser.checksum_errors} checksum errors)")
+    print(f"fixes              {len(latencies)}")
+    print(f"wall time          {elapsed:.3f} s")
+    print(f"throughput         {sentences / elapsed:,.0f} sentences/s, {len(latencies) / elapsed:,.0f} fixes/s")
+    for p in (50, 90, 99):
+        print(f"fix latency p{p:<3}   {percentile(latencies, p) * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark: NMEAParser vs. the previous VK162GPS.parse_nmea_sentence().
+
+Parses a synthetic multi-constellation corpus (or a capture file with one
+sentence per line) and reports sentences/second for both implementations.
+
+Run from the project root:
+    python -m benchmarks.nmeaParserBenchmark [--sentences 200000] [--file capture.nmea]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from src.sensors.NMEAParser import NMEAParser, nmea_checksum
+
+
+def legacy_parse_nmea_sentence(sentence):
+    """Verbatim copy of the old parser (GP talker only, no checksum check)."""
+    data = {}
+
+    if '*' in sentence:
+        sentence = sentence.split('*')[0]
+
+    parts = sentence.split(',')
+
+    try:
+        if parts[0] == "$GPGGA":
+            fix = int(parts[6]) if parts[6].isdigit() else 0
+            data['fix_status'] = fix
+
+            fix_map = {
+                0: "No Fix",
+                1: "GPS Fix",
+                2: "DGPS Fix"
+            }
+            data['fix_quality'] = fix_map.get(fix, "Unknown")
+
+            data['satellites'] = int(parts[7]) if parts[7].isdigit() else 0
+            data['hdop'] = float(parts[8]) if parts[8] else None
+
+        elif parts[0] == "$GPGSV":
+            if parts[3].isdigit():
+                data['satellites_visible'] = int(parts[3])
+
+        elif parts[0] == "$GPRMC" and parts[2] == 'A':
+            utc_time = parts[1]
+            utc_date = parts[9]
+
+            if len(utc_time) >= 6 and len(utc_date) == 6:
+                dt = datetime(
+                    2000 + int(utc_date[4:6]),
+                    int(utc_date[2:4]),
+                    int(utc_date[0:2]),
+                    int(utc_time[0:2]),
+                    int(utc_time[2:4]),
+                    int(utc_time[4:6]),
+                    tzinfo=timezone.utc
+                )
+                data['timestamp'] = dt.astimezone(
+                    ZoneInfo("Europe/Amsterdam")
+                ).strftime("%H:%M")
+
+            if parts[7]:
+                data['speed'] = float(parts[7]) * 1.852
+
+            lat_raw = float(parts[3])
+            lon_raw = float(parts[5])
+
+            lat = int(lat_raw / 100) + (lat_raw % 100) / 60.0
+            lon = int(lon_raw / 100) + (lon_raw % 100) / 60.0
+
+            if parts[4] == 'S':
+                lat = -lat
+            if parts[6] == 'W':
+                lon = -lon
+
+            data['latitude'] = lat
+            data['longitude'] = lon
+
+    except Exception:
+        pass
+
+    return data
+
+
+def _sentence(body):
+    return f"${body}*{nmea_checksum(body):02X}"
+
+
+def synthetic_corpus(count, talker="GP", seed=0):
+    """One receiver epoch per second: GGA, GSA, 3x GSV, RMC, VTG."""
+    rng = random.Random(seed)
+    lat, lon = 5206.420, 507.284
+    sentences = []
+    second = 0
+    while len(sentences) < count:
+        hh, mm, ss = (second // 3600) % 24, (second // 60) % 60, second % 60
+        utc = f"{hh:02d}{mm:02d}{ss:02d}.00"
+        lat += rng.uniform(-0.01, 0.01)
+        lon += rng.uniform(-0.01, 0.01)
+        speed = rng.uniform(0, 70)
+        course = rng.uniform(0, 360)
+        sentences += [
+            _sentence(f"{talker}GGA,{utc},{lat:09.4f},N,{lon:010.4f},E,1,08,0.9,12.3,M,46.9,M,,"),
+            _sentence(f"{talker}GSA,A,3,04,05,,09,12,,,24,,,,,2.5,1.3,2.1"),
+            _sentence(f"{talker}GSV,3,1,11,03,03,111,00,04,15,270,00,06,01,010,00,13,06,292,00"),
+            _sentence(f"{talker}GSV,3,2,11,14,25,170,00,16,57,208,39,18,67,296,40,19,40,246,00"),
+            _sentence(f"{talker}GSV,3,3,11,22,42,067,42,24,14,311,43,27,05,244,00,,,,"),
+            _sentence(f"{talker}RMC,{utc},A,{lat:09.4f},N,{lon:010.4f},E,{speed:05.1f},{course:05.1f},170526,003.1,W"),
+            _sentence(f"{talker}VTG,{course:05.1f},T,,M,{speed:05.1f},N,{speed * 1.852:05.1f},K,A"),
+        ]
+        second += 1
+    return sentences[:count]
+
+
+def measure(parse, sentences, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sentence in sentences:
+            parse(sentence)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=200000)
+    parser.add_argument("--file", help="NMEA capture, one sentence per line")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="ascii", errors="ignore") as f:
+            corpus = {"capture": [line.strip() for line in f if line.startswith("$")]}
+    else:
+        corpus = {
+            "GP": synthetic_corpus(args.sentences, "GP"),
+            "GN": synthetic_corpus(args.sentences, "GN"),
+        }
+
+    # useful = sentences that produced data, new-nock = new parser without checksum validation
+    print(f"{'corpus':<10}{'parser':<10}{'sentences/s':>14}{'useful':>9}")
+    for name, sentences in corpus.items():
+        results = {
+            "legacy": legacy_parse_nmea_sentence,
+            "new": NMEAParser().parse,
+            "new-nock": NMEAParser(verify_checksum=False).parse,
+        }
+        for parser_name, parse in results.items():
+            useful = sum(1 for s in sentences if parse(s))
+            seconds = measure(parse, sentences)
+            print(f"{name:<10}{parser_name:<10}{len(sentences) / seconds:>14,.0f}{useful:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: RPMEstimator vs. the previous 1 s pulse counting in RPMreader.
+
+Generates synthetic ignition pulse trains (timing jitter, missed pulses and
+noise spikes) for steady engine speeds from idle to redline and for a
+full-throttle sweep, reads both estimators at --rate Hz and reports the
+error, the time to follow a step and the CPU cost per edge and per read.
+
+Run from the project root:
+    python -m benchmarks.rpmEstimatorBenchmark [--rate 25] [--ppr 1] [--seconds 5]
+"""
+import argparse
+import random
+import time
+
+from src.sensors.RPMreader import RPMEstimator
+
+
+class LegacyCounter:
+    """The old RPMreader: count edges, recompute once per second."""
+
+    def __init__(self, pulses_per_revolution=1, update_interval=1.0):
+        self.pulses_per_revolution = pulses_per_revolution
+        self.update_interval_ns = int(update_interval * 1e9)
+        self._pulse_count = 0
+        self._rpm = 0
+        self._last_update = 0
+
+    def record_edge(self, t_ns):
+        self._pulse_count += 1
+
+    def read(self, now_ns):
+        if now_ns - self._last_update >= self.update_interval_ns:
+            pulses = self._pulse_count
+            self._pulse_count = 0
+            self._last_update = now_ns
+            self._rpm = int((pulses / self.pulses_per_revolution) * 60)
+        return self._rpm
+
+
+def pulse_train(rpm_at, seconds, ppr, rng, jitter=0.01, missed=0.002, noise=0.002):
+    """Edge timestamps (ns) for an engine speed profile rpm_at(t)."""
+    edges = []
+    t = 0.5  # start with the engine already running
+    while t < seconds:
+        period = 60.0 / (rpm_at(t) * ppr)
+        t += period * (1 + rng.gauss(0, jitter))
+        if rng.random() < missed:
+            continue
+        edges.append(int(t * 1e9))
+        if rng.random() < noise:
+            edges.append(int((t + rng.uniform(0.05, 0.5) * period) * 1e9))
+    return sorted(edges)
+
+
+def run(estimator, edges, rpm_at, seconds, rate):
+    """Feed the edges in time order and read at rate Hz, returns [(t, true rpm, estimate)]."""
+    readings = []
+    step = int(1e9 / rate)
+    i = 0
+    for now in range(step, int(seconds * 1e9), step):
+        while i < len(edges) and edges[i] <= now:
+            estimator.record_edge(edges[i])
+            i += 1
+        readings.append((now / 1e9, rpm_at(now / 1e9), estimator.read(now)))
+    return readings
+
+
+def error(readings, settle=2.5):
+    errors = [abs(est - true) / true for t, true, est in readings if t >= settle]
+    return 100 * sum(errors) / len(errors)
+
+
+def step_response(make_estimator, ppr, rate, rng, low=1000, high=5000, at=2.0, seconds=5.0):
+    """Seconds from a step in engine speed until the estimate is within 5% of the new speed."""
+    rpm_at = lambda t: low if t < at else high
+    readings = run(make_estimator(), pulse_train(rpm_at, seconds, ppr, rng), rpm_at, seconds, rate)
+    for t, true, est in readings:
+        if t >= at and abs(est - high) <= 0.05 * high:
+            return t - at
+    return float("inf")
+
+
+def cpu_cost(ppr, rate, rng, seconds=20.0):
+    rpm_at = lambda t: 1000 + 6000 * (t % 4) / 4
+    edges = pulse_train(rpm_at, seconds, ppr, rng)
+    estimator = RPMEstimator(ppr)
+
+    start = time.perf_counter()
+    for edge in edges:
+        estimator.record_edge(edge)
+    per_edge = (time.perf_counter() - start) / len(edges)
+
+    reads = int(seconds * rate)
+    now = edges[-1]
+    start = time.perf_counter()
+    for i in range(reads):
+        estimator.read(now + i * 1000)
+    per_read = (time.perf_counter() - start) / reads
+
+    # CPU share at redline: edges per second plus reads per second
+    redline = 7000 / 60 * ppr * per_edge + rate * per_read
+    return per_edge, per_read, redline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, default=25, help="reads per second")
+    parser.add_argument("--ppr", type=int, default=1, help="pulses per revolution")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    estimators = {
+        "legacy": lambda: LegacyCounter(args.ppr),
+        "period": lambda: RPMEstimator(args.ppr),
+    }
+
+    print(f"{'profile':<14}" + "".join(f"{name + ' err %':>16}" for name in estimators))
+    profiles = {f"{rpm} rpm": (lambda t, rpm=rpm: rpm) for rpm in (800, 1500, 3000, 5000, 7000)}
+    profiles["sweep"] = lambda t: 800 + 6200 * min(t / args.seconds, 1.0)
+    for name, rpm_at in profiles.items():
+        edges = pulse_train(rpm_at, args.seconds, args.ppr, rng)
+        row = f"{name:<14}"
+        for make in estimators.values():
+            row += f"{error(run(make(), edges, rpm_at, args.seconds, args.rate)):>16.2f}"
+        print(row)
+
+    print()
+    for name, make in estimators.items():
+        print(f"step 1000->5000 rpm, {name:<7} {step_response(make, args.ppr, args.rate, rng) * 1000:8.0f} ms to within 5%")
+
+    per_edge, per_read, redline = cpu_cost(args.ppr, args.rate, rng)
+    print()
+    print(f"record_edge        {per_edge * 1e6:.2f} us")
+    print(f"read               {per_read * 1e6:.2f} us")
+    print(f"CPU at redline     {redline * 100:.3f} % of one core ({args.rate:g} reads/s)")
+
+
+if __name__ == "__main__":
+    main()
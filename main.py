@@ -1,74 +1,132 @@
+import time
+
+# Created first, the imports below are part of the startup timeline
+from src.startupTimeline import StartupTimeline
+timeline = StartupTimeline()
+
 import sys
 import os
 import random
-from gpiozero import CPUTemperature
-from PySide6.QtCore import QObject, Signal, Property, QTimer
-from PySide6.QtWidgets import QApplication
-from PySide6.QtQml import QQmlApplicationEngine
-import PyQt6.QtCore
-
-from src.sensors.DHT11 import DHT11
-from src.sensors.LDRLM393 import LDRLM393
-from src.sensors.VK162GPS import VK162GPS
-from src.sensors.MPU6050 import MPU6050
-from src.sensors.RPMreader import RPMreader
-from src.sensors.ButtonHandler import ButtonHandler
-from src.DebuggingView import DebuggerWindow
-from src.gitUpdater import GitUpdater
+import argparse
+import signal
+from types import SimpleNamespace
+
+with timeline.span("import PySide6"):
+    from PySide6.QtCore import Signal, Property, Slot, QTimer, Qt
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtQml import QQmlApplicationEngine
+    # PySide6 on Windows needs the Qt .dll files that PyQt6 brings along
+    if sys.platform == "win32":
+        import PyQt6.QtCore
+
+# The sensor drivers (src/sensors) are imported by their init functions in
+# build_dashboard, on the bring-up threads
+with timeline.span("import modules"):
+    from src.gitUpdater import GitUpdater
+    from src.sensorWorkers import AcquisitionScheduler, CalibrationJob, SensorBringup
+    from src.accelerationFilter import AccelerationFilterBank
+    from src.mapTileProvider import MapTileProvider
+    from src.motionModel import DeadReckoning, G
+    from src.buttonGestures import ButtonGestureEngine
+    from src.telemetryState import Channel, telemetry_class
+    from src.telemetryLogger import TelemetryLogger
+    from src.tripComputer import TripComputer, TripCheckpoint
+    from src.frameProfiler import FrameProfiler
+    from src.viewCache import ViewCache
 
 APP_VERSION = "1.1.1"
 
+# Windowed with the debugger instead of full screen
+debugOn = False
+
+# Order of the views for the next button
+VIEWS = ["gps", "clock", "data", "accel", "techno"]
+
+# Views are created on demand: the last VIEW_CACHE_SIZE views shown stay
+# loaded and the next view of the cycle is preloaded, see src/viewCache.py
+VIEW_CACHE_SIZE = 2
+VIEW_PRELOAD_NEXT = True
+
+# The sensors are brought up once the first frame is shown, or after this
+# long if the window does not render
+FIRST_FRAME_TIMEOUT_MS = 2000
+
+# Filter stages for the accelerometer: moving_average, low_pass, median, peak_hold
+ACCEL_FILTER_CONFIG = {
+    "stages": ["median", "low_pass"],
+    "median": {"window_size": 5},
+    "low_pass": {"cutoff_hz": 3.0, "sample_rate": 200},
+}
+
+# The map position is predicted between GPS fixes at display rate (60 Hz)
+MOTION_INTERVAL_MS = 16
+
+# Sensor values shown by the views: QML property name -> type, default and
+# the smallest change worth redrawing for. Written values are published
+# together once per frame (TELEMETRY_FLUSH_MS), see src/telemetryState.py.
+TELEMETRY_FLUSH_MS = 16
+TELEMETRY_CHANNELS = {
+    "velocity":             Channel(float, 0.0, deadband=0.5),
+    "gpsTime":              Channel(str, "00:00"),
+    "centerLat":            Channel(float, 52.1070, deadband=1e-7, log=False),
+    "centerLon":            Channel(float, 5.1214, deadband=1e-7, log=False),
+    "mapZoom":              Channel(int, 14, log=False),
+    "heading":              Channel(float, 0.0, deadband=0.2, log=False),
+    "tempInside":           Channel(float, 0.0, deadband=0.1),
+    "tempOutside":          Channel(float, 0.0, deadband=0.1),
+    "humidityInside":       Channel(float, 0.0, deadband=0.5),
+    "humidityOutside":      Channel(float, 0.0, deadband=0.5),
+    "piTemperature":        Channel(float, 0.0, deadband=0.5),
+    "ax":                   Channel(float, 0.0, deadband=0.005),
+    "ay":                   Channel(float, 0.0, deadband=0.005),
+    "isDaytime":            Channel(bool, True),
+    "rpm":                  Channel(float, 0.0, deadband=10),
+    "gpsFixStatus":         Channel(str, "No Fix"),
+    "gpsSatellites":        Channel(int, 0),
+    "gpsSatellitesVisible": Channel(int, 0),
+    # Trip computer (src/tripComputer.py), derived so not logged
+    "tripDistance":         Channel(float, 0.0, deadband=0.01, log=False),
+    "tripMovingTime":       Channel(int, 0, log=False),
+    "tripAverageSpeed":     Channel(float, 0.0, deadband=0.1, log=False),
+    "tripMaxSpeed":         Channel(float, 0.0, deadband=0.1, log=False),
+    "tripPeakAccel":        Channel(float, 0.0, deadband=0.01, log=False),
+    "tripPeakBrake":        Channel(float, 0.0, deadband=0.01, log=False),
+    "tripPeakLateral":      Channel(float, 0.0, deadband=0.01, log=False),
+    "tripRpmBands":         Channel(list, [], log=False),
+}
+
+# Logged next to the channels: the GPS fixes themselves, not the predicted map position
+LOG_EXTRA_CHANNELS = ["latitude", "longitude", "course"]
+
+# Trip statistics are shown once per second and checkpointed every few seconds
+TRIP_PUBLISH_MS = 1000
+TRIP_CHECKPOINT_S = 5.0
+TRIP_CHECKPOINT_FILE = "trip.json"
+
 # ============================================================
 #                     DASHBOARD BACKEND
 # ============================================================
 
-class DashboardBackend(QObject):
-    velocityChanged = Signal()
-    gpsTimeChanged = Signal()
-    centerLatChanged = Signal()
-    centerLonChanged = Signal()
-    tempInsideChanged = Signal()
-    tempOutsideChanged = Signal()
-    humidityInsideChanged = Signal()
-    humidityOutsideChanged = Signal()
-    piTemperatureChanged = Signal()
-    axChanged = Signal()
-    ayChanged = Signal()
-    isDaytimeChanged = Signal()
-    rpmChanged = Signal()
-    gpsConnectedChanged = Signal()
+class DashboardBackend(telemetry_class("Telemetry", TELEMETRY_CHANNELS)):
     currentViewChanged = Signal()
     showOverlaysChanged = Signal()
     sensorStatusMessageChanged = Signal()
     systemActionStateChanged = Signal()
-    gpsFixStatusChanged = Signal()
-    gpsSatellitesChanged = Signal()
-    gpsSatellitesVisibleChanged = Signal()
+    calibrationProgressChanged = Signal()
+    calibrationVarianceChanged = Signal()
 
     def __init__(self):
-        super().__init__()
-
-        self._velocity = 0.0
-        self._gpsTime = "00:00"
-        self._centerLat = 52.1070
-        self._centerLon = 5.1214
-        self._tempInside = 0.0
-        self._tempOutside = 0.0
-        self._humidityInside = 0.0
-        self._humidityOutside = 0.0
-        self._piTemperature = 0.0
-        self._ax = 0.0
-        self._ay = 0.0
-        self._rpm = 0.0
-        self._isDaytime = True
-        self._gpsFixStatus = "No Fix"
-        self._gpsSatellites = 0
-        self._gpsSatellitesVisible = 0
+        super().__init__(TELEMETRY_FLUSH_MS)
 
         self._currentView = "gps"
         self._showOverlays = True
         self._sensorStatusMessage = "Initializing sensors..."
         self._systemActionState = "idle"
+        self._calibrationProgress = 0.0
+        self._calibrationVariance = 0.0
+        self.git_updater = None
+        self.latency_stats = None
+        self.frame_profiler = None
 
         self.load_settings()
 
@@ -78,11 +136,22 @@ class DashboardBackend(QObject):
 
     def show_debugger(self):
         if not hasattr(self, "_debugger") or self._debugger is None:
-            self._debugger = DebuggerWindow(self, git_updater)
+            from src.DebuggingView import DebuggerWindow
+            self._debugger = DebuggerWindow(self, self.git_updater)
         self._debugger.show()
         self._debugger.raise_()
         self._debugger.activateWindow()
 
+    # --------------------------------------------------------
+    # Sensor samples
+    # --------------------------------------------------------
+
+    @Slot(str, object)
+    def applySample(self, name, sample):
+        """Apply a {property: value} sample published by a sensor worker."""
+        for key, value in sample.items():
+            setattr(self, key, value)
+
     # --------------------------------------------------------
     # Settings
     # --------------------------------------------------------
@@ -106,38 +175,6 @@ class DashboardBackend(QObject):
     # Properties
     # --------------------------------------------------------
     
-    @Property(str, notify=gpsFixStatusChanged)
-    def gpsFixStatus(self):
-        return self._gpsFixStatus
-
-    @gpsFixStatus.setter
-    def gpsFixStatus(self, val):
-        if self._gpsFixStatus != val:
-            self._gpsFixStatus = val
-            self.gpsFixStatusChanged.emit()
-
-
-    @Property(int, notify=gpsSatellitesChanged)
-    def gpsSatellites(self):
-        return self._gpsSatellites
-
-    @gpsSatellites.setter
-    def gpsSatellites(self, val):
-        if self._gpsSatellites != val:
-            self._gpsSatellites = val
-            self.gpsSatellitesChanged.emit()
-
-
-    @Property(int, notify=gpsSatellitesVisibleChanged)
-    def gpsSatellitesVisible(self):
-        return self._gpsSatellitesVisible
-
-    @gpsSatellitesVisible.setter
-    def gpsSatellitesVisible(self, val):
-        if self._gpsSatellitesVisible != val:
-            self._gpsSatellitesVisible = val
-            self.gpsSatellitesVisibleChanged.emit()
-
     @Property(str, notify=sensorStatusMessageChanged)
     def sensorStatusMessage(self): return self._sensorStatusMessage
     @sensorStatusMessage.setter
@@ -154,6 +191,22 @@ class DashboardBackend(QObject):
             self._systemActionState = val
             self.systemActionStateChanged.emit()
 
+    @Property(float, notify=calibrationProgressChanged)
+    def calibrationProgress(self): return self._calibrationProgress
+    @calibrationProgress.setter
+    def calibrationProgress(self, val):
+        if self._calibrationProgress != val:
+            self._calibrationProgress = val
+            self.calibrationProgressChanged.emit()
+
+    @Property(float, notify=calibrationVarianceChanged)
+    def calibrationVariance(self): return self._calibrationVariance
+    @calibrationVariance.setter
+    def calibrationVariance(self, val):
+        if self._calibrationVariance != val:
+            self._calibrationVariance = val
+            self.calibrationVarianceChanged.emit()
+
     @Property(str, notify=currentViewChanged)
     def currentView(self): return self._currentView
     @currentView.setter
@@ -171,123 +224,54 @@ class DashboardBackend(QObject):
             self._showOverlays = val
             self.showOverlaysChanged.emit()
 
-    @Property(float, notify=velocityChanged)
-    def velocity(self): return self._velocity
-    @velocity.setter
-    def velocity(self, val):
-        if self._velocity != val:
-            self._velocity = val
-            self.velocityChanged.emit()
-
-    @Property(str, notify=gpsTimeChanged)
-    def gpsTime(self): return self._gpsTime
-    @gpsTime.setter
-    def gpsTime(self, val):
-        if self._gpsTime != val:
-            self._gpsTime = val
-            self.gpsTimeChanged.emit()
-
-    @Property(float, notify=centerLatChanged)
-    def centerLat(self): return self._centerLat
-    @centerLat.setter
-    def centerLat(self, val):
-        if self._centerLat != val:
-            self._centerLat = val
-            self.centerLatChanged.emit()
-
-    @Property(float, notify=centerLonChanged)
-    def centerLon(self): return self._centerLon
-    @centerLon.setter
-    def centerLon(self, val):
-        if self._centerLon != val:
-            self._centerLon = val
-            self.centerLonChanged.emit()
-
-    @Property(float, notify=tempInsideChanged)
-    def tempInside(self): return self._tempInside
-    @tempInside.setter
-    def tempInside(self, val):
-        if self._tempInside != val:
-            self._tempInside = val
-            self.tempInsideChanged.emit()
-
-    @Property(float, notify=tempOutsideChanged)
-    def tempOutside(self): return self._tempOutside
-    @tempOutside.setter
-    def tempOutside(self, val):
-        if self._tempOutside != val:
-            self._tempOutside = val
-            self.tempOutsideChanged.emit()
-
-    @Property(float, notify=humidityInsideChanged)
-    def humidityInside(self): return self._humidityInside
-    @humidityInside.setter
-    def humidityInside(self, val):
-        if self._humidityInside != val:
-            self._humidityInside = val
-            self.humidityInsideChanged.emit()
-
-    @Property(float, notify=humidityOutsideChanged)
-    def humidityOutside(self): return self._humidityOutside
-    @humidityOutside.setter
-    def humidityOutside(self, val):
-        if self._humidityOutside != val:
-            self._humidityOutside = val
-            self.humidityOutsideChanged.emit()
-
-    @Property(float, notify=piTemperatureChanged)
-    def piTemperature(self): return self._piTemperature
-    @piTemperature.setter
-    def piTemperature(self, val):
-        if self._piTemperature != val:
-            self._piTemperature = val
-            self.piTemperatureChanged.emit()
-
-    @Property(float, notify=axChanged)
-    def ax(self): return self._ax
-    @ax.setter
-    def ax(self, val):
-        if self._ax != val:
-            self._ax = val
-            self.axChanged.emit()
-
-    @Property(float, notify=ayChanged)
-    def ay(self): return self._ay
-    @ay.setter
-    def ay(self, val):
-        if self._ay != val:
-            self._ay = val
-            self.ayChanged.emit()
-
-    @Property(bool, notify=isDaytimeChanged)
-    def isDaytime(self): return self._isDaytime
-    @isDaytime.setter
-    def isDaytime(self, val):
-        if self._isDaytime != val:
-            self._isDaytime = val
-            self.isDaytimeChanged.emit()
-            
-    @Property(float, notify=rpmChanged)
-    def rpm(self):
-        return self._rpm
-    @rpm.setter
-    def rpm(self, val):
-        if self._rpm != val:
-            self._rpm = val
-            self.rpmChanged.emit()
-
             
 # ============================================================
 #                       MAIN APPLICATION
 # ============================================================
 
-if __name__ == "__main__":
-    debugOn = False
-
-    app = QApplication(sys.argv)
+def parse_args(argv=None):
+    """Returns the dashboard options and the remaining (Qt) arguments."""
+    parser = argparse.ArgumentParser(description="Peugeot 106 dashboard")
+    parser.add_argument("--gps-capture", metavar="DIR",
+                        help="record the raw GPS serial stream into DIR")
+    parser.add_argument("--gps-replay", metavar="FILE",
+                        help="use a GPS capture file instead of the receiver")
+    parser.add_argument("--gps-replay-speed", type=float, default=1.0, metavar="N",
+                        help="replay at N times real time, 0 = as fast as possible")
+    parser.add_argument("--log-dir", default="logs", metavar="DIR",
+                        help="directory for the telemetry logs, latency stats and frame exports (default: logs)")
+    parser.add_argument("--sequential-init", action="store_true",
+                        help="initialise the sensors one after another before the interface shows")
+    parser.add_argument("--startup-report", metavar="FILE",
+                        help="also write the startup timeline as JSON to this file")
+    parser.add_argument("--no-log", action="store_true",
+                        help="do not record telemetry")
+    return parser.parse_known_args(argv)
+
+
+def build_dashboard(app, args, simulate=False, gpio=None):
+    """
+    Load the QML interface and wire everything to the backend. The sensors
+    are initialised in parallel in the background once the first frame is
+    shown and each one joins the acquisition when it is ready (with
+    args.sequential_init: one after another, before returning). The
+    acquisition is not started yet (scheduler.start()).
+
+    simulate forces the DHT11, MPU6050 and GPS into simulation mode and gpio
+    replaces the shared GPIOService (e.g. one on a MockChip), so benchmarks
+    run the same code on any machine. Returns None if the QML fails to load.
+    """
+    timeline.mark("build dashboard")
     engine = QQmlApplicationEngine()
     backend = DashboardBackend()
     engine.rootContext().setContextProperty("backend", backend)
+
+    # Every sensor value written to the backend is recorded for later analysis
+    telemetry_logger = None
+    if not args.no_log:
+        logged = [name for name, channel in backend.CHANNELS.items() if channel.log]
+        telemetry_logger = TelemetryLogger(args.log_dir, channels=logged + LOG_EXTRA_CHANNELS)
+        backend.logger = telemetry_logger
     
     # -------------------------------
     # Git updater
@@ -301,182 +285,421 @@ if __name__ == "__main__":
         version_getter=get_app_version,
         status_callback=lambda msg: setattr(backend, 'sensorStatusMessage', msg)
     )
+    backend.git_updater = git_updater
 
     engine.rootContext().setContextProperty("debugOn", debugOn)
 
+    view_cache = ViewCache(backend, VIEWS, keep=VIEW_CACHE_SIZE, preload_next=VIEW_PRELOAD_NEXT)
+    engine.rootContext().setContextProperty("viewCache", view_cache)
+
+    # Frame timing overlay, switched on from the debugger
+    frame_profiler = FrameProfiler(lambda: backend.currentView, directory=args.log_dir)
+    engine.rootContext().setContextProperty("frameProfiler", frame_profiler)
+    backend.frame_profiler = frame_profiler
+
+    # Decoded map tiles for CircleWindow (image://tiles/...)
+    tile_provider = MapTileProvider(
+        os.path.join(os.path.dirname(__file__), "src/dashboardGUI/lib")
+    )
+    engine.addImageProvider("tiles", tile_provider)
+    backend.mapZoom = tile_provider.zoom
+
     qml_file = os.path.join(os.path.dirname(__file__), "src/dashboardGUI/main.qml")
-    engine.load(qml_file)
+    with timeline.span("load QML"):
+        engine.load(qml_file)
     if not engine.rootObjects():
-        sys.exit(-1)
+        return None
+    window = engine.rootObjects()[0]
+    frame_profiler.attach(window)
 
-    # --- Initialize sensors ---
-    init_errors = []
+    # Drivers of the sensors that are up, see the bring-up below
+    sensors = SimpleNamespace(dht=None, light=None, rpm=None, gps=None, mpu=None, buttons=None)
     init_status = []
 
-    # --- DHT11 ---
-    dht = DHT11(car_pin=4, vent_pin=27)
-    if dht.test_mode:
-        init_status.append("DHT11: simulated")
-    else:
-        init_status.append("DHT11: real")
-
-
-    # --- LDR Light Sensor ---
-
-    light_sensor = LDRLM393(pin1=22, pin2=10)
-    if light_sensor.test_mode:
-        init_status.append("LDR: simulated")
-    else:
-        init_status.append("LDR: real")
-
-        
-    # --- RPM ---
-    rpm_reader = RPMreader(pin=17, pulses_per_revolution=1)
-    if rpm_reader.test_mode:
-        init_status.append("RPM: simulated")
-    else:
-        init_status.append("RPM: real")
-
-    # --- GPS ---
-    gps_reader = VK162GPS()
-    if gps_reader.test_mode:
-        init_status.append("GPS: simulated")
-    else:
-        init_status.append("GPS: real")
-
-    # --- MPU6050 (Accelerometer) ---
-    mpu = MPU6050()
-    if mpu.test_mode:
-        init_status.append("MPU6050: simulated")
-    else:
-        init_status.append("MPU6050: real")
-
-    # --- Buttons ---
-
-    buttons = ButtonHandler(pin_next=5, pin_extra=6)
-    if buttons.test_mode:
-        init_status.append("Buttons: simulated")
-    else:
-        init_status.append("Buttons: real")
-    
     # --- Optional: open debugger window on startup ---
     if debugOn:
         backend.show_debugger()
 
-    # --- Main periodic update ---
-    def update_values():
-        # --- Light Sensor ---
-        try:
-            light1 = light_sensor.read_light_intensity(light_sensor.pin1)
-            light2 = light_sensor.read_light_intensity(light_sensor.pin2)
-            backend.isDaytime = light1 > 0 or light2 > 0
-        except Exception as e:
-            backend.sensorStatusMessage = f"LDR read error: {e}"
-
-        # --- GPS ---
+    # --- Sensor read functions (run on the worker threads) ---
+    def read_light():
+        light_sensor = sensors.light
+        light1 = light_sensor.read_light_intensity(light_sensor.pin1)
+        light2 = light_sensor.read_light_intensity(light_sensor.pin2)
+        return {"isDaytime": bool(light1 > 0 or light2 > 0)}
+
+    def read_gps():
+        gps_data = sensors.gps.get_data()
+        if not gps_data:
+            return None
+        return gps_sample(gps_data)
+
+    def gps_sample(gps_data):
+        sample = {}
+
+        # Position, applied through the motion model (handle_gps)
+        if gps_data["latitude"] and gps_data["longitude"]:
+            sample["latitude"] = gps_data["latitude"]
+            sample["longitude"] = gps_data["longitude"]
+            sample["course"] = gps_data.get("course")
+            sample["fix_time"] = gps_data.get("fix_time") or time.monotonic()
+
+        # Speed
+        speed = gps_data.get("speed", 0.0)
+        sample["velocity"] = speed if speed >= 3.0 else 0
+
+        # Time
+        sample["gpsTime"] = gps_data.get("timestamp") or "00:00"
+
+        # GPS status info
+        sample["gpsFixStatus"] = gps_data.get("fix_quality", "No Fix")
+        sample["gpsSatellites"] = gps_data.get("satellites", 0)
+        sample["gpsSatellitesVisible"] = gps_data.get("satellites_visible", 0)
+        return sample
+
+    def read_acceleration():
+        ax, ay, _ = sensors.mpu.get_calibrated_acceleration()
+        return {"ax": ax, "ay": ay}
+
+    def read_rpm():
+        return {"rpm": sensors.rpm.read_rpm()}
+
+    def read_pi_temperature():
         try:
-            gps_data = gps_reader.get_data()
-            if gps_data:
-                # Position
-                if gps_data["latitude"] and gps_data["longitude"]:
-                    backend.centerLat = gps_data["latitude"]
-                    backend.centerLon = gps_data["longitude"]
-
-                # Speed
-                speed = gps_data.get("speed", 0.0)
-                backend.velocity = speed if speed >= 3.0 else 0
-
-                # Time
-                backend.gpsTime = gps_data.get("timestamp", "00:00")
-
-                # ✅ NEW: GPS status info
-                backend.gpsFixStatus = gps_data.get("fix_quality", "No Fix")
-                backend.gpsSatellites = gps_data.get("satellites", 0)
-                backend.gpsSatellitesVisible = gps_data.get("satellites_visible", 0)
-
-        except Exception as e:
-            backend.sensorStatusMessage = f"GPS read error: {e}"
-
-        # --- Acceleration ---
-        if backend.currentView == "accel":
-            try:
-                ax, ay, _ = mpu.get_calibrated_acceleration()
-                backend.ax = ax
-                backend.ay = ay
-            except Exception as e:
-                backend.sensorStatusMessage = f"MPU6050 read error: {e}"
-
-        # --- RPM ---
-        if backend.currentView == "techno":
-            try:
-                rpm = rpm_reader.read_rpm()
-                backend.rpm = rpm
-            except Exception as e:
-                backend.sensorStatusMessage = f"RPM read error: {e}"
-
-        # --- Pi Temp and DHT11 ---
+            from gpiozero import CPUTemperature
+            cpu_temp = CPUTemperature().temperature
+        except Exception:
+            cpu_temp = None
+        return {"piTemperature": cpu_temp if cpu_temp else random.uniform(35, 55)}
+
+    def read_dht():
+        car_temp, car_hum = sensors.dht.read_sensor_data("car")
+        vent_temp, vent_hum = sensors.dht.read_sensor_data("vent")
+        sample = {}
+        if car_temp is not None: sample["tempInside"] = car_temp
+        if car_hum is not None: sample["humidityInside"] = car_hum
+        if vent_temp is not None: sample["tempOutside"] = vent_temp
+        if vent_hum is not None: sample["humidityOutside"] = vent_hum
+        return sample
+
+    def read_buttons():
+        return {
+            "next": sensors.buttons.is_pressed("next"),
+            "extra": sensors.buttons.is_pressed("extra"),
+        }
+
+    # --- GPS fixes, map position and tile prefetching (run on the GUI thread) ---
+    GPS_FIX_KEYS = ("latitude", "longitude", "course", "fix_time")
+    motion = DeadReckoning()
+
+    def handle_gps(name, sample):
+        if name != "GPS":
+            return
+
+        backend.applySample(name, {k: v for k, v in sample.items() if k not in GPS_FIX_KEYS})
+        if "latitude" not in sample:
+            return
+
+        if telemetry_logger:
+            # One timestamp per fix, the exporter pairs the channels by it
+            t = time.monotonic()
+            for key in LOG_EXTRA_CHANNELS:
+                telemetry_logger.log(key, sample[key], t)
+
+        motion.update_fix(
+            sample["latitude"], sample["longitude"],
+            sample.get("velocity", 0.0), sample["course"], sample["fix_time"]
+        )
+        backend.mapZoom = tile_provider.update_position(
+            sample["latitude"], sample["longitude"], sample.get("velocity", 0.0)
+        )
+        update_map_position()
+
+    def update_map_position():
+        if not motion.has_fix:
+            return
+        now = time.monotonic()
+        # The simulated MPU is noise, only let a real one change the predicted speed
+        motion.acceleration = 0.0 if sensors.mpu is None or sensors.mpu.test_mode else backend.ay * G
+        backend.centerLat, backend.centerLon = motion.position(now)
+        backend.heading = motion.update_heading(now)
+
+    # Only move the map at display rate while it is visible
+    motion_timer = QTimer()
+    motion_timer.setTimerType(Qt.PreciseTimer)
+    motion_timer.setInterval(MOTION_INTERVAL_MS)
+    motion_timer.timeout.connect(update_map_position)
+
+    def update_motion_timer():
+        if backend.currentView == "gps":
+            motion_timer.start()
+        else:
+            motion_timer.stop()
+
+    backend.currentViewChanged.connect(update_motion_timer)
+    update_motion_timer()
+
+    # --- Button gestures (run on the GUI thread) ---
+    def step_view(step):
+        current_index = VIEWS.index(backend.currentView)
+        backend.currentView = VIEWS[(current_index + step) % len(VIEWS)]
+
+    def extra_action():
         if backend.currentView == "data":
-            try:
-                cpu_temp = CPUTemperature().temperature
-                backend.piTemperature = cpu_temp if cpu_temp else random.uniform(35, 55)
-            except Exception:
-                backend.piTemperature = random.uniform(35, 55)
-            try:
-                car_temp, car_hum = dht.read_sensor_data("car")
-                vent_temp, vent_hum = dht.read_sensor_data("vent")
-                if car_temp is not None: backend.tempInside = car_temp
-                if car_hum is not None: backend.humidityInside = car_hum
-                if vent_temp is not None: backend.tempOutside = vent_temp
-                if vent_hum is not None: backend.humidityOutside = vent_hum
-            except Exception as e:
-                backend.sensorStatusMessage = f"DHT11 read error: {e}"
-
-        # --- Buttons ---
-        if buttons.is_pressed("next"):
-            views = ["gps", "clock", "data", "accel", "techno"]
-            current_index = views.index(backend.currentView)
-            next_index = (current_index + 1) % len(views)
-            backend.currentView = views[next_index]
-
-        if buttons.is_pressed("extra"):
-            if backend.currentView == "data":
-                if backend.systemActionState != "idle":
-                    return
-
-                backend.sensorStatusMessage = "Checking for updates..."
-                backend.systemActionState = "git_checking"
-                git_updater.handle_update_request()
-
-            # --- MPU calibration ---
-            elif backend.currentView == "accel":
-                if backend.systemActionState == "calibrating_mpu":
-                    return
-                backend.systemActionState = "calibrating_mpu"
-
-                try:
-                    mpu.calibrate_accelerometer()
-                    backend.systemActionState = "mpu_done"
-                except Exception as e:
-                    backend.systemActionState = "mpu_failed"
-                    print("[ERROR]", e)
-
-                QTimer.singleShot(
-                    2000,
-                    lambda: setattr(backend, "systemActionState", "idle")
-                )
-            # --- GPS overlay or technometer chagne ---
-            elif backend.currentView == "gps" or backend.currentView == "techno":
-                backend.showOverlays = not backend.showOverlays
-
-            # --- Shutdown of system ---
-            elif backend.currentView == "clock":
-                os.system("sudo shutdown -h now")
-            else:
+            if backend.systemActionState != "idle":
                 return
-        
-    timer = QTimer()
-    if not debugOn:
-        timer.timeout.connect(update_values)
-    timer.start(2000)
 
+            backend.sensorStatusMessage = "Checking for updates..."
+            backend.systemActionState = "git_checking"
+            git_updater.handle_update_request()
+
+        # --- MPU calibration ---
+        elif backend.currentView == "accel":
+            if calibration_job.mpu is not None:
+                calibration_job.start()
+        # --- GPS overlay or technometer chagne ---
+        elif backend.currentView == "gps" or backend.currentView == "techno":
+            backend.showOverlays = not backend.showOverlays
+
+        # --- Shutdown of system ---
+        elif backend.currentView == "clock":
+            os.system("sudo shutdown -h now")
+
+    def on_tap(name):
+        if name == "next":
+            step_view(1)
+        elif name == "extra":
+            extra_action()
+
+    def on_long_press(name):
+        if name == "next":
+            step_view(-1)
+        # --- Start a new trip ---
+        elif name == "extra" and backend.currentView == "data":
+            trip.reset()
+            publish_trip()
+            backend.sensorStatusMessage = "Trip reset"
+
+    def on_chord_held(names):
+        # Both buttons held for 3 seconds
+        if names == "extra+next":
+            os.system("sudo shutdown -h now")
+
+    gestures = ButtonGestureEngine(long_press_ms=600, chord_hold_ms=3000)
+    gestures.tapped.connect(on_tap)
+    gestures.longPressed.connect(on_long_press)
+    gestures.chordHeld.connect(on_chord_held)
+
+    # Simulated buttons are polled, a press becomes a press + release edge
+    def handle_buttons(name, pressed):
+        if name != "Buttons":
+            return
+        down = [button for button in ("next", "extra") if pressed[button]]
+        for button in down:
+            gestures.edge(button, True)
+        for button in down:
+            gestures.edge(button, False)
+
+    # The MPU6050 is handed over when it is up
+    calibration_job = CalibrationJob(backend, None)
+
+    # --- Trip computer (run on the GUI thread) ---
+    trip = TripComputer()
+    if trip.load(TRIP_CHECKPOINT_FILE):
+        print(f"[INFO] Continuing trip of {trip.distance / 1000:.1f} km")
+
+    def handle_trip(name, sample):
+        now = time.monotonic()
+        if name == "GPS":
+            if "velocity" in sample:
+                trip.update_speed(sample["velocity"], now)
+            if "latitude" in sample:
+                trip.update_position(sample["latitude"], sample["longitude"], now)
+        elif name == "RPM":
+            trip.update_rpm(sample["rpm"], now)
+        elif name == "MPU6050":
+            trip.update_acceleration(sample["ax"], sample["ay"])
+
+    trip_checkpoint = TripCheckpoint(TRIP_CHECKPOINT_FILE, TRIP_CHECKPOINT_S)
+
+    def publish_trip():
+        backend.applySample("Trip", {
+            "tripDistance": trip.distance / 1000,
+            "tripMovingTime": int(trip.moving_time),
+            "tripAverageSpeed": trip.average_speed,
+            "tripMaxSpeed": trip.max_speed,
+            "tripPeakAccel": trip.peak_accel,
+            "tripPeakBrake": trip.peak_brake,
+            "tripPeakLateral": trip.peak_lateral,
+            "tripRpmBands": [round(seconds) for seconds in trip.rpm_bands],
+        })
+        trip_checkpoint.update(trip)
+
+    trip_timer = QTimer()
+    trip_timer.timeout.connect(publish_trip)
+    trip_timer.start(TRIP_PUBLISH_MS)
+    publish_trip()
+
+    # --- Acquisition workers, one thread and rate per sensor ---
+    scheduler = AcquisitionScheduler(backend)
+    scheduler.stats.attach(window, backend)
+    scheduler.stats.directory = args.log_dir
+    backend.latency_stats = scheduler.stats
+
+    # kill -USR1 <pid> writes the sensor latency histograms next to the telemetry logs
+    def dump_latency_stats(*_):
+        print(f"[INFO] Sensor latency stats written to {scheduler.stats.dump()}")
+
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, dump_latency_stats)
+
+    scheduler.add("Pi", read_pi_temperature, 5000)
+
+    # --- Sensor bring-up: every driver is imported and initialised on its own
+    # thread, the ready callbacks (GUI thread) add it to the acquisition ---
+    def report_ready(name, driver, mode=None):
+        init_status.append(f"{name}: {mode or ('simulated' if driver.test_mode else 'real')}")
+
+    def init_dht():
+        from src.sensors.DHT11 import DHT11
+        return DHT11(car_pin=4, vent_pin=27, test_mode=simulate)
+
+    def dht_ready(dht):
+        sensors.dht = dht
+        report_ready("DHT11", dht)
+        scheduler.add("DHT11", read_dht, 2000)
+
+    def init_light():
+        from src.sensors.LDRLM393 import LDRLM393
+        return LDRLM393(pin1=22, pin2=10, gpio=gpio)
+
+    def light_ready(light_sensor):
+        sensors.light = light_sensor
+        report_ready("LDR", light_sensor)
+        # Real light sensors push GPIO edge events, the simulation is polled
+        if light_sensor.test_mode:
+            scheduler.add("LDR", read_light, 1000)
+        else:
+            publish_light = scheduler.add_event_source("LDR")
+            light_sensor.subscribe(lambda: publish_light(read_light()))
+            publish_light(read_light())
+
+    def init_rpm():
+        from src.sensors.RPMreader import RPMreader
+        return RPMreader(pin=17, pulses_per_revolution=1, gpio=gpio)
+
+    def rpm_ready(rpm_reader):
+        sensors.rpm = rpm_reader
+        report_ready("RPM", rpm_reader)
+        scheduler.add("RPM", read_rpm, 40)  # 25 Hz for the shift lights
+
+    def init_gps():
+        from src.sensors.VK162GPS import VK162GPS
+        return VK162GPS(
+            test_mode=simulate,
+            capture_dir=args.gps_capture,
+            replay_file=args.gps_replay,
+            replay_speed=args.gps_replay_speed
+        )
+
+    def gps_ready(gps_reader):
+        sensors.gps = gps_reader
+        report_ready("GPS", gps_reader, "replay" if gps_reader.replay_file else None)
+        # The GPS reader thread pushes every completed fix, simulation is polled
+        publish_gps = scheduler.add_event_source("GPS", apply_to_backend=False)
+        if not gps_reader.start_reader(on_fix=lambda fix: publish_gps(gps_sample(fix))):
+            scheduler.add("GPS", read_gps, 1000, apply_to_backend=False)
+
+    def init_mpu():
+        from src.sensors.MPU6050 import MPU6050
+        mpu = MPU6050(test_mode=simulate)
+        mpu.set_filter(AccelerationFilterBank.from_config(ACCEL_FILTER_CONFIG))
+        mpu.start_sampling(rate_hz=200)
+        return mpu
+
+    def mpu_ready(mpu):
+        sensors.mpu = mpu
+        calibration_job.mpu = mpu
+        report_ready("MPU6050", mpu)
+        scheduler.add("MPU6050", read_acceleration, 100)
+
+    def init_buttons():
+        from src.sensors.ButtonHandler import ButtonHandler
+        return ButtonHandler(pin_next=5, pin_extra=6, gpio=gpio)
+
+    def buttons_ready(buttons):
+        sensors.buttons = buttons
+        report_ready("Buttons", buttons)
+        if buttons.test_mode:
+            # Simulated buttons fire randomly, so keep them at the old 2 s pace
+            scheduler.add("Buttons", read_buttons, 2000, apply_to_backend=False)
+        else:
+            # Edges go straight from the GPIO thread to the gesture engine,
+            # like the polled sensors only while the scheduler runs
+            def on_edge(name, pressed, timestamp_ns):
+                if scheduler.running:
+                    gestures.edge(name, pressed, timestamp_ns)
+            buttons.on_edge(on_edge)
+
+    bringup = SensorBringup(
+        timeline,
+        on_failed=lambda name, message: setattr(backend, "sensorStatusMessage", f"{name} init failed: {message}"),
+    )
+    bringup.add("DHT11", init_dht, dht_ready)
+    bringup.add("LDR", init_light, light_ready)
+    bringup.add("RPM", init_rpm, rpm_ready)
+    bringup.add("GPS", init_gps, gps_ready)
+    bringup.add("MPU6050", init_mpu, mpu_ready)
+    bringup.add("Buttons", init_buttons, buttons_ready)
+
+    def report_startup():
+        timeline.mark("sensors up")
+        print(f"[INFO] Startup timeline (s):\n{timeline.format_report()}")
+        print(f"[INFO] Sensors: {', '.join(init_status)}")
+        if args.startup_report:
+            timeline.dump(args.startup_report)
+
+    bringup.finished.connect(report_startup)
+    if args.sequential_init:
+        bringup.run_inline()
+    bringup.start_after_first_frame(window, FIRST_FRAME_TIMEOUT_MS)
+
+    def close_sensors():
+        if sensors.mpu:
+            sensors.mpu.stop_sampling()
+        if sensors.gps:
+            sensors.gps.close()
+        for driver in (sensors.rpm, sensors.buttons, sensors.light):
+            if driver:
+                driver.cleanup()
+
+    scheduler.sampleReady.connect(handle_buttons)
+    scheduler.sampleReady.connect(handle_gps)
+    scheduler.sampleReady.connect(handle_trip)
+
+    app.aboutToQuit.connect(motion_timer.stop)
+    app.aboutToQuit.connect(trip_timer.stop)
+    app.aboutToQuit.connect(lambda: trip_checkpoint.save(trip))
+    app.aboutToQuit.connect(scheduler.stop)
+    app.aboutToQuit.connect(close_sensors)
+    if telemetry_logger:
+        app.aboutToQuit.connect(telemetry_logger.close)
+    app.aboutToQuit.connect(lambda: print(f"[INFO] Map tile cache: {tile_provider.stats()}"))
+
+    return SimpleNamespace(
+        engine=engine, window=window, backend=backend,
+        scheduler=scheduler, gestures=gestures, trip=trip, tile_provider=tile_provider,
+        telemetry_logger=telemetry_logger, frame_profiler=frame_profiler, view_cache=view_cache,
+        bringup=bringup, timeline=timeline, init_status=init_status, sensors=sensors,
+    )
+
+
+if __name__ == "__main__":
+    args, qt_args = parse_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    dashboard = build_dashboard(app, args)
+    if dashboard is None:
+        sys.exit(-1)
+
+    if not debugOn:
+        dashboard.scheduler.start()
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,9 +1,11 @@
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QFontDatabase
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QDoubleSpinBox,
     QPushButton, QHBoxLayout, QCheckBox, QLineEdit
 )
-from PySide6.QtCore import QTimer
 from src.sensors.MPU6050 import MPU6050
+from src.sensorWorkers import CalibrationJob
 
 
 class DebuggerWindow(QWidget):
@@ -125,7 +127,50 @@ class DebuggerWindow(QWidget):
 
         # ===== MPU =====
         mpu = MPU6050()
+        self.calibration_job = CalibrationJob(backend, mpu)
         
+        # ===== Sensor latency (src/latencyStats.py) =====
+        latency_label = QLabel()
+        latency_label.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        btn_dump = QPushButton("Dump latency stats")
+        layout.addWidget(QLabel("Sensor latency (ms):"))
+        layout.addWidget(latency_label)
+        layout.addWidget(btn_dump)
+
+        def update_latency():
+            stats = backend.latency_stats
+            latency_label.setText(stats.format_table() if stats else "No acquisition running")
+
+        def dump_latency():
+            if backend.latency_stats:
+                path = backend.latency_stats.dump()
+                backend.sensorStatusMessage = f"Latency stats written to {path}"
+
+        self.latency_timer = QTimer(self)
+        self.latency_timer.timeout.connect(update_latency)
+        self.latency_timer.start(1000)
+        update_latency()
+        btn_dump.clicked.connect(dump_latency)
+
+        # ===== Frame profiler (src/frameProfiler.py) =====
+        profiler = backend.frame_profiler
+        if profiler is not None:
+            add_check("Frame profiler overlay",
+                      lambda: profiler.enabled,
+                      lambda v: setattr(profiler, "enabled", v))
+
+            btn_frames = QPushButton("Export frames")
+            layout.addWidget(btn_frames)
+
+            def export_frames():
+                path = profiler.export()
+                for view, (frames, p50, p99, missed) in sorted(profiler.summary_by_view().items()):
+                    print(f"[INFO] {view:<7} {frames:>5} frames  p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  "
+                          f"missed {missed}")
+                backend.sensorStatusMessage = f"Frames written to {path}"
+
+            btn_frames.clicked.connect(export_frames)
+
         # ===== Buttons =====
         btn_view = QPushButton("Bottom button")
         btn_action = QPushButton("Top button")
@@ -176,21 +221,7 @@ class DebuggerWindow(QWidget):
 
             # --- MPU calibration ---
             elif backend.currentView == "accel":
-                if backend.systemActionState == "calibrating_mpu":
-                    return
-                backend.systemActionState = "calibrating_mpu"
-
-                try:
-                    mpu.calibrate_accelerometer()
-                    backend.systemActionState = "mpu_done"
-                except Exception as e:
-                    backend.systemActionState = "mpu_failed"
-                    print("[ERROR]", e)
-
-                QTimer.singleShot(
-                    2000,
-                    lambda: setattr(backend, "systemActionState", "idle")
-                )
+                self.calibration_job.start()
 
             # --- GPS overlay or technometer chagne ---
             elif backend.currentView == "gps" or backend.currentView == "techno":
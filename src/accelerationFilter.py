@@ -0,0 +1,191 @@
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# =====================================================
+# ================= FILTER STAGES =====================
+# =====================================================
+# Every stage takes an (n, 3) block of raw samples and returns an (n, 3)
+# block. State is carried between blocks, so feeding one block of 100
+# samples gives the same output as feeding 100 blocks of one sample.
+
+class MovingAverageStage:
+    """Boxcar average over the last window_size samples (cumulative sum per block)."""
+
+    def __init__(self, window_size=20):
+        self.window_size = max(1, int(window_size))
+        self.reset()
+
+    def reset(self):
+        self._tail = np.empty((0, 3))
+
+    def process(self, block):
+        data = np.concatenate((self._tail, block))
+        csum = np.cumsum(data, axis=0)
+        csum = np.concatenate((np.zeros((1, 3)), csum))
+
+        # Window ending at every position of the block, shorter at start-up
+        ends = np.arange(len(self._tail) + 1, len(data) + 1)
+        starts = np.maximum(ends - self.window_size, 0)
+        out = (csum[ends] - csum[starts]) / (ends - starts)[:, None]
+
+        self._tail = data[-(self.window_size - 1):] if self.window_size > 1 else data[:0]
+        return out
+
+
+class LowPassStage:
+    """First order IIR low-pass y[n] = y[n-1] + alpha * (x[n] - y[n-1])."""
+
+    def __init__(self, alpha=None, cutoff_hz=5.0, sample_rate=200):
+        if alpha is None:
+            rc = 1.0 / (2 * math.pi * cutoff_hz)
+            dt = 1.0 / sample_rate
+            alpha = dt / (rc + dt)
+        self.alpha = min(max(float(alpha), 1e-6), 1.0)
+
+        # Longest chunk for which (1 - alpha) ** -n stays well inside float64 range
+        decay = 1.0 - self.alpha
+        self._chunk = 4096 if decay <= 0 else max(1, min(4096, int(100 * math.log(10) / -math.log(decay))))
+        self.reset()
+
+    def reset(self):
+        self._state = None
+
+    def process(self, block):
+        if len(block) == 0:
+            return np.empty((0, 3))
+        if self._state is None:
+            self._state = block[0].astype(float)
+
+        out = np.empty((len(block), 3))
+        decay = 1.0 - self.alpha
+        for start in range(0, len(block), self._chunk):
+            x = block[start:start + self._chunk]
+            n = np.arange(1, len(x) + 1)[:, None]
+            if decay == 0.0:
+                y = x.astype(float)
+            else:
+                # Closed form of the recursion: weighted prefix sum of the inputs
+                scale = decay ** n
+                y = scale * (self._state + self.alpha * np.cumsum(x / scale, axis=0))
+            out[start:start + len(x)] = y
+            self._state = y[-1]
+        return out
+
+
+class MedianStage:
+    """Sliding median over window_size samples, rejects single-sample spikes."""
+
+    def __init__(self, window_size=5):
+        self.window_size = max(1, int(window_size))
+        self.reset()
+
+    def reset(self):
+        self._tail = None
+
+    def process(self, block):
+        if len(block) == 0:
+            return np.empty((0, 3))
+        if self._tail is None:
+            # Pad with the first sample so the start-up windows are full
+            self._tail = np.repeat(block[:1], self.window_size - 1, axis=0)
+
+        data = np.concatenate((self._tail, block))
+        windows = sliding_window_view(data, self.window_size, axis=0)
+        out = np.median(windows, axis=-1)
+
+        self._tail = data[len(data) - (self.window_size - 1):]
+        return out
+
+
+def _running_max(data, window_size):
+    """
+    Maximum of every full window of window_size rows (van Herk / Gil-Werman):
+    per-segment prefix and suffix maxima, so the cost does not grow with the window.
+    """
+    n = len(data)
+    segments = -(-n // window_size)
+    padded = np.full((segments * window_size, data.shape[1]), -np.inf)
+    padded[:n] = data
+    padded = padded.reshape(segments, window_size, -1)
+
+    prefix = np.maximum.accumulate(padded, axis=1).reshape(-1, data.shape[1])
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, data.shape[1])
+
+    count = n - window_size + 1
+    return np.maximum(suffix[:count], prefix[window_size - 1:window_size - 1 + count])
+
+
+class PeakHoldStage:
+    """Per axis the sample with the largest magnitude of the last hold_samples (sign kept)."""
+
+    def __init__(self, hold_samples=200):
+        self.hold_samples = max(1, int(hold_samples))
+        self.reset()
+
+    def reset(self):
+        self._tail = np.zeros((self.hold_samples - 1, 3))
+
+    def process(self, block):
+        if len(block) == 0:
+            return np.empty((0, 3))
+
+        data = np.concatenate((self._tail, block))
+        peak_max = _running_max(data, self.hold_samples)
+        peak_min = -_running_max(-data, self.hold_samples)
+        out = np.where(peak_max >= -peak_min, peak_max, peak_min)
+
+        self._tail = data[len(data) - (self.hold_samples - 1):]
+        return out
+
+
+STAGES = {
+    "moving_average": MovingAverageStage,
+    "low_pass": LowPassStage,
+    "median": MedianStage,
+    "peak_hold": PeakHoldStage,
+}
+
+
+# =====================================================
+# ================= FILTER BANK =======================
+# =====================================================
+class AccelerationFilterBank:
+    """
+    Chain of filter stages for raw MPU6050 samples, configured with a dict:
+
+        {"stages": ["median", "low_pass"],
+         "median": {"window_size": 5},
+         "low_pass": {"cutoff_hz": 3.0, "sample_rate": 200}}
+
+    process() filters a whole (n, 3) block at once; value holds the last output.
+    """
+
+    def __init__(self, stages=("moving_average",), **stage_options):
+        self.stages = []
+        for name in stages:
+            if name not in STAGES:
+                raise ValueError(f"Invalid filter stage: {name}. Must be one of {', '.join(STAGES)}.")
+            self.stages.append(STAGES[name](**stage_options.get(name, {})))
+        self.value = np.zeros(3)
+
+    @classmethod
+    def from_config(cls, config):
+        config = dict(config)
+        stages = config.pop("stages", ("moving_average",))
+        return cls(stages, **config)
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+        self.value = np.zeros(3)
+
+    def process(self, block):
+        block = np.asarray(block, dtype=float).reshape(-1, 3)
+        for stage in self.stages:
+            block = stage.process(block)
+        if len(block):
+            self.value = block[-1]
+        return block
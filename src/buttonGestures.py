@@ -0,0 +1,171 @@
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+
+
+class _ButtonState:
+    def __init__(self, parent):
+        self.down = False
+        self.press_ns = 0
+        self.long_fired = False
+        self.in_chord = False
+        self.last_tap_ns = 0
+        self.second_press = False  # pressed while its last tap was still pending
+
+        self.long_timer = QTimer(parent)
+        self.long_timer.setSingleShot(True)
+        self.long_timer.setTimerType(Qt.PreciseTimer)
+        self.tap_timer = QTimer(parent)
+        self.tap_timer.setSingleShot(True)
+        self.tap_timer.setTimerType(Qt.PreciseTimer)
+
+
+class ButtonGestureEngine(QObject):
+    """
+    Turns button press/release edges into gestures, emitted on the GUI thread:
+    - tapped(name): pressed and released within long_press_ms
+    - doubleTapped(name): a tap and a press within double_tap_ms that is
+      released as a tap, only for the buttons in double_tap_buttons (their
+      single taps wait double_tap_ms, the others are emitted on release);
+      held instead, it gives tapped and then longPressed
+    - longPressed(name): held for long_press_ms, emitted while still held
+    - chordPressed(names) / chordHeld(names): buttons held down together,
+      however far apart they were pressed, names joined with "+" in sorted
+      order; chordHeld after chord_hold_ms. A button that joins a chord
+      stops its long press, buttons of a chord give no further single-button
+      gestures.
+
+    edge() may be called from any thread (the GPIO thread) with the kernel
+    timestamp of the edge; timings are measured from those timestamps.
+    """
+
+    tapped = Signal(str)
+    doubleTapped = Signal(str)
+    longPressed = Signal(str)
+    chordPressed = Signal(str)
+    chordHeld = Signal(str)
+    _edge = Signal(str, bool, object)
+
+    def __init__(self, long_press_ms=600, double_tap_ms=300,
+                 chord_hold_ms=3000, double_tap_buttons=()):
+        super().__init__()
+        self.long_press_ms = long_press_ms
+        self.double_tap_ms = double_tap_ms
+        self.chord_hold_ms = chord_hold_ms
+        self.double_tap_buttons = set(double_tap_buttons)
+
+        # Time from the edge to the gesture signal, for the debugger
+        self.last_latency_ms = 0.0
+        self._buttons = {}
+        self._chord = None
+        self._chord_timer = QTimer(self)
+        self._chord_timer.setSingleShot(True)
+        self._chord_timer.setTimerType(Qt.PreciseTimer)
+        self._chord_timer.timeout.connect(self._on_chord_held)
+
+        self._edge.connect(self._on_edge)
+
+    def edge(self, name, pressed, timestamp_ns=None):
+        """Feed one edge, thread-safe. pressed is True when the button goes down."""
+        self._edge.emit(name, pressed, timestamp_ns or time.monotonic_ns())
+
+    # -----------------------------
+    # Recogniser (GUI thread)
+    # -----------------------------
+    @Slot(str, bool, object)
+    def _on_edge(self, name, pressed, timestamp_ns):
+        state = self._state(name)
+        if pressed and not state.down:
+            self._on_press(name, state, timestamp_ns)
+        elif not pressed and state.down:
+            self._on_release(name, state, timestamp_ns)
+
+    def _on_press(self, name, state, t):
+        state.down = True
+        state.press_ns = t
+        state.long_fired = False
+        # The pending tap is decided by this press: on its release (double
+        # tap) or when it turns into a long press (tap + long press)
+        state.second_press = state.tap_timer.isActive()
+        state.tap_timer.stop()
+
+        # Pressed by hand, the second button can come a good while after the
+        # first one; any button still held makes this press a chord
+        partners = [
+            other for other, s in self._buttons.items()
+            if other != name and s.down and not s.in_chord
+        ]
+        if partners:
+            names = sorted(partners + [name])
+            for other in names:
+                s = self._buttons[other]
+                s.in_chord = True
+                s.long_timer.stop()
+                s.tap_timer.stop()
+            self._chord = "+".join(names)
+            self._chord_timer.start(self._remaining_ms(t, self.chord_hold_ms))
+            self._emit(self.chordPressed, self._chord, t)
+            return
+
+        state.long_timer.start(self._remaining_ms(t, self.long_press_ms))
+
+    def _on_release(self, name, state, t):
+        state.down = False
+        state.long_timer.stop()
+
+        if state.in_chord:
+            self._chord_timer.stop()
+            if not any(s.down for s in self._buttons.values() if s.in_chord):
+                for s in self._buttons.values():
+                    s.in_chord = False
+                self._chord = None
+            return
+
+        if state.long_fired:
+            return
+
+        if name not in self.double_tap_buttons:
+            self._emit(self.tapped, name, t)
+        elif state.second_press:
+            self._emit(self.doubleTapped, name, t)
+        else:
+            state.last_tap_ns = t
+            state.tap_timer.start(self.double_tap_ms)
+
+    def _on_long_press(self, name):
+        state = self._buttons[name]
+        if state.down and not state.in_chord:
+            state.long_fired = True
+            if state.second_press:
+                self._emit(self.tapped, name, None)
+            self._emit(self.longPressed, name, state.press_ns + self.long_press_ms * 1_000_000)
+
+    def _on_single_tap(self, name):
+        self._emit(self.tapped, name, self._buttons[name].last_tap_ns + self.double_tap_ms * 1_000_000)
+
+    def _on_chord_held(self):
+        if self._chord:
+            self._emit(self.chordHeld, self._chord, None)
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+    def _state(self, name):
+        state = self._buttons.get(name)
+        if state is None:
+            state = _ButtonState(self)
+            state.long_timer.timeout.connect(lambda: self._on_long_press(name))
+            state.tap_timer.timeout.connect(lambda: self._on_single_tap(name))
+            self._buttons[name] = state
+        return state
+
+    @staticmethod
+    def _remaining_ms(t, duration_ms):
+        """Timer interval so the timeout lands duration_ms after the edge timestamp t."""
+        elapsed_ms = (time.monotonic_ns() - t) / 1_000_000
+        return max(0, int(duration_ms - elapsed_ms))
+
+    def _emit(self, signal, name, due_ns):
+        if due_ns is not None:
+            self.last_latency_ms = max(0.0, (time.monotonic_ns() - due_ns) / 1_000_000)
+        signal.emit(name)
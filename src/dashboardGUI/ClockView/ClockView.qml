@@ -118,6 +118,7 @@ Item {
         interval: 1000
         repeat: true
         running: true
+        triggeredOnStart: true  // repaint at once when shown again
         onTriggered: clockCanvas.requestPaint()
     }
 }
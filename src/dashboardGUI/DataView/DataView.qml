@@ -15,6 +15,22 @@ Item {
     property real piTemperature: 48.3
     property color textColor: "white"
 
+    // --- Trip computer ---
+    property real tripDistance: 0       // km
+    property int tripMovingTime: 0      // s
+    property real tripAverageSpeed: 0   // km/h
+    property real tripMaxSpeed: 0       // km/h
+    property real tripPeakAccel: 0      // g
+    property real tripPeakBrake: 0      // g
+    property real tripPeakLateral: 0    // g
+    property var tripRpmBands: []       // seconds per band of 1000 rpm, last band 5000+
+
+    function formatDuration(seconds) {
+        var h = Math.floor(seconds / 3600)
+        var m = Math.floor(seconds / 60) % 60
+        return h + ":" + (m < 10 ? "0" : "") + m
+    }
+
     // Black background
     Rectangle {
         anchors.fill: parent
@@ -91,29 +107,97 @@ Item {
                 }
             }
 
-            // Bottom: Raspberry Pi temperature + icon, centered
-            Column {
-                spacing: 0
+            // Bottom: trip computer left and right of the Raspberry Pi temperature
+            Row {
+                spacing: 10
                 anchors.horizontalCenter: parent.horizontalCenter
 
-                TemperatureAndHumidityGauge {
-                    width: 240
-                    height: 240
-                    temperature: piTemperature
-                    minTemperature: 20
-                    maxTemperature: 80
-                    showHumidity: false
-                    dialColor: textColor
-                    needleColor: textColor
+                // Trip: distance and speeds
+                Column {
+                    width: 150
+                    topPadding: 50
+                    spacing: 4
+
+                    Repeater {
+                        model: [
+                            { label: "TRIP", value: tripDistance.toFixed(1) + " km" },
+                            { label: "TIME", value: formatDuration(tripMovingTime) },
+                            { label: "AVG", value: tripAverageSpeed.toFixed(0) + " km/h" },
+                            { label: "MAX", value: tripMaxSpeed.toFixed(0) + " km/h" }
+                        ]
+                        delegate: Text {
+                            anchors.right: parent.right
+                            text: "<span style='font-size:11px;'>" + modelData.label + "</span>  " + modelData.value
+                            textFormat: Text.StyledText
+                            color: textColor
+                            font.pixelSize: 18
+                        }
+                    }
+                }
+
+                // Raspberry Pi temperature + icon
+                Column {
+                    spacing: 0
+
+                    TemperatureAndHumidityGauge {
+                        width: 240
+                        height: 240
+                        temperature: piTemperature
+                        minTemperature: 20
+                        maxTemperature: 80
+                        showHumidity: false
+                        dialColor: textColor
+                        needleColor: textColor
+                    }
+
+                    Image {
+                        width: 30
+                        height: 30
+                        source: "../lib/icons/raspberryPIIcon.png"
+                        anchors.horizontalCenter: parent.horizontalCenter
+                        fillMode: Image.PreserveAspectFit
+
+                    }
                 }
 
-                Image {
-                    width: 30
-                    height: 30
-                    source: "../lib/icons/raspberryPIIcon.png"
-                    anchors.horizontalCenter: parent.horizontalCenter
-                    fillMode: Image.PreserveAspectFit
+                // Trip: peak g forces and time per RPM band
+                Column {
+                    width: 150
+                    topPadding: 50
+                    spacing: 4
+
+                    Repeater {
+                        model: [
+                            { label: "ACC", value: tripPeakAccel.toFixed(2) + " g" },
+                            { label: "BRK", value: tripPeakBrake.toFixed(2) + " g" },
+                            { label: "LAT", value: tripPeakLateral.toFixed(2) + " g" }
+                        ]
+                        delegate: Text {
+                            text: modelData.value + "  <span style='font-size:11px;'>" + modelData.label + "</span>"
+                            textFormat: Text.StyledText
+                            color: textColor
+                            font.pixelSize: 18
+                        }
+                    }
 
+                    // Share of the engine time per 1000 rpm band
+                    Row {
+                        id: rpmBands
+                        property real total: tripRpmBands.reduce(function(sum, s) { return sum + s }, 0)
+                        height: 34
+                        spacing: 2
+
+                        Repeater {
+                            model: tripRpmBands
+                            delegate: Rectangle {
+                                width: 16
+                                height: 4 + 26 * (rpmBands.total > 0 ? modelData / rpmBands.total : 0)
+                                y: rpmBands.height - height
+                                color: textColor
+                                opacity: 0.4 + 0.12 * index
+                            }
+                        }
+                    }
                 }
             }
         }
@@ -9,137 +9,132 @@ Item {
     property int zoom: 14
     property bool darkMode
     anchors.fill: parent
+    clip: true
 
-    // Store local points for computing car heading
-    property var localPoints: []
+    property int tileSize: 500
 
-    Rectangle {
-        id: background
-        anchors.fill: parent
-        color: "black"
+    // ====== MAP PROJECTION (global pixel coordinates, Web Mercator) ======
+    readonly property real mapSize: Math.pow(2, zoom) * tileSize
+    readonly property real globalX: (centerLon + 180) / 360 * mapSize
+    readonly property real globalY: (1 - Math.asinh(Math.tan(centerLat * Math.PI / 180)) / Math.PI) / 2 * mapSize
 
-        Canvas {
-            id: canvas
-            anchors.fill: parent
+    // Top-left corner of the view in global pixels
+    readonly property real minX: globalX - width / 2
+    readonly property real minY: globalY - height / 2
 
-            Image {
-                id: carImg
-                source: "../lib/icons/TopDownRedCar.png"
-            }
+    // Tile grid: one spare row/column so the view is always covered while panning
+    readonly property int columns: Math.ceil(width / tileSize) + 1
+    readonly property int rows: Math.ceil(height / tileSize) + 1
+    readonly property int firstTileX: Math.floor(minX / tileSize)
+    readonly property int firstTileY: Math.floor(minY / tileSize)
 
-            // Trigger repaint when canvas size changes
-            onWidthChanged: requestPaint()
-            onHeightChanged: requestPaint()
+    // Only the day tiles are stored, the night map is styled by a shader (see MAP LAYER)
+    readonly property string mapFolder: "mapNL"
+    property color nightTint: "#ffd577"
+    property real nightBrightness: 0.85
+    property real nightGamma: 0.6
 
-            Connections {
-                target: root
-                function onCenterLatChanged() { canvas.requestPaint() }
-                function onCenterLonChanged() { canvas.requestPaint() }
-                function onZoomChanged() { canvas.requestPaint() }
-                function onDarkModeChanged() { canvas.requestPaint() }
-            }
+    // ====== CAR HEADING ======
+    // Course over ground in degrees (0 = north, clockwise), smoothed by the backend
+    property real heading: 0
 
-            onPaint: {
-                var ctx = getContext("2d")
-                ctx.reset()
-                ctx.clearRect(0, 0, width, height)
-
-                carImg.visible = false
-
-                var tileSize = 500
-                var diameter = Math.min(width, height)
-                var radius = diameter / 2
-                var centerX = width / 2
-                var centerY = height / 2
-
-                // --- Clip to circular view ---
-                ctx.save()
-                ctx.beginPath()
-                ctx.arc(centerX, centerY, radius, 0, 2 * Math.PI)
-                ctx.clip()
-
-                // --- Compute map projection ---
-                var latRad = root.centerLat * Math.PI / 180
-                var n = Math.pow(2, root.zoom)
-                var globalX = (root.centerLon + 180) / 360 * n * tileSize
-                var globalY = ((1 - (Math.asinh(Math.tan(latRad)) / Math.PI)) / 2) * n * tileSize
-
-
-
-                var viewWidth = width
-                var viewHeight = height
-                var minX = globalX - viewWidth / 2
-                var minY = globalY - viewHeight / 2
-                var maxX = globalX + viewWidth / 2
-                var maxY = globalY + viewHeight / 2
-
-                //addPoint(globalX, globalY)
-
-                var tileXStart = Math.floor(minX / tileSize)
-                var tileXEnd = Math.floor(maxX / tileSize)
-                var tileYStart = Math.floor(minY / tileSize)
-                var tileYEnd = Math.floor(maxY / tileSize)
-
-                // --- Draw map tiles ---
-                for (var tx = tileXStart; tx <= tileXEnd; tx++) {
-                    for (var ty = tileYStart; ty <= tileYEnd; ty++) {
-                        var px = tx * tileSize - minX
-                        var py = ty * tileSize - minY
-
-                        if (darkMode) {
-                            var filePath = "../lib/mapNL/" +
-                                        root.zoom + "/" + tx + "/" + ty + ".png"}
-                        else {
-                            var filePath = "../lib/mapNLDarkmode/" +
-                                        root.zoom + "/" + tx + "/" + ty + ".png"
-                        }
-
-                        var img = Qt.createQmlObject('import QtQuick 2.15; Image {}', canvas)
-                        img.source = filePath
-                        img.width = tileSize
-                        img.height = tileSize
-                        img.visible = false
-
-                        ctx.drawImage(img, px, py, tileSize, tileSize)
-                        img.destroy() // cleanup temporary object
-                    }
-                }
-
-                ctx.restore() // restore from circular clipping
-                // Convert lon/lat to global pixel coordinates (Mercator)
-                function latLonToPixels(lat, lon) {
-                    var tileSize = 500
-                    var n = Math.pow(2, root.zoom)
-                    var x = (lon + 180) / 360 * n * tileSize
-                    var latRad = lat * Math.PI / 180
-                    var y = (1 - Math.asinh(Math.tan(latRad)) / Math.PI) / 2 * n * tileSize
-                    return { x: x, y: y }
-                }
+    Rectangle {
+        id: background
+        anchors.fill: parent
+        color: "black"
+    }
 
-                // Add current center as a point
-                var pt = latLonToPixels(root.centerLat, root.centerLon)
-                localPoints.push(pt)
-                if (localPoints.length > 10) localPoints.shift()
+    // ====== MAP LAYER ======
+    // At night the tile layer is rendered through a shader that inverts the
+    // luminance and tints the day tiles, so toggling day/night loads no tiles.
+    Item {
+        id: mapLayer
+        anchors.fill: parent
+        layer.enabled: !root.darkMode
+        layer.effect: ShaderEffect {
+            property color tint: root.nightTint
+            property real brightness: root.nightBrightness
+            property real gamma: root.nightGamma
+            fragmentShader: "shaders/nightMap.frag.qsb"
+        }
 
-                // Compute angle
-                var angle = 0
-                if (localPoints.length > 1) {
-                    var prev = localPoints[localPoints.length - 2]
-                    var curr = localPoints[localPoints.length - 1]
+        // ====== TILE LAYER ======
+        // Tiles are persistent Image items positioned relative to the first visible
+        // tile; panning only moves this layer. Each item owns the tiles whose
+        // column/row index modulo the grid size matches its slot, so a tile keeps
+        // its item (and texture) until it scrolls off and the item is recycled.
+        Item {
+            id: tileLayer
+            x: root.firstTileX * root.tileSize - root.minX
+            y: root.firstTileY * root.tileSize - root.minY
+
+            Repeater {
+                model: root.columns * root.rows
+
+                Item {
+                    readonly property int slotX: index % root.columns
+                    readonly property int slotY: Math.floor(index / root.columns)
+                    readonly property int tileX: root.firstTileX + (((slotX - root.firstTileX) % root.columns) + root.columns) % root.columns
+                    readonly property int tileY: root.firstTileY + (((slotY - root.firstTileY) % root.rows) + root.rows) % root.rows
+
+                    x: (tileX - root.firstTileX) * root.tileSize
+                    y: (tileY - root.firstTileY) * root.tileSize
+                    width: root.tileSize
+                    height: root.tileSize
+                    clip: !tile.ready
+
+                    // While the tile loads, show its quarter of the tile one zoom level up
+                    Image {
+                        visible: !tile.ready
+                        x: -(parent.tileX & 1) * root.tileSize
+                        y: -(parent.tileY & 1) * root.tileSize
+                        width: 2 * root.tileSize
+                        height: 2 * root.tileSize
+                        asynchronous: true
+                        cache: false
+                        smooth: false
+                        source: tile.ready ? "" : "image://tiles/" + root.mapFolder + "/" + (root.zoom - 1) + "/" + (parent.tileX >> 1) + "/" + (parent.tileY >> 1)
+                    }
 
-                    var dx = curr.x - prev.x
-                    var dy = curr.y - prev.y
-                    angle = Math.atan2(dy, dx)
-                }
+                    Image {
+                        id: tile
+                        readonly property bool ready: status === Image.Ready
+                        anchors.fill: parent
 
-                if (carImg.status === Image.Ready) {
-                    ctx.save()
-                    ctx.translate(centerX, centerY)
-                    ctx.rotate(angle+ Math.PI)
-                    ctx.drawImage(carImg, -10, -10, 20, 20) // centered 20x20
-                    ctx.restore()
+                        // Decoded tiles are cached by the MapTileProvider, not per item
+                        asynchronous: true
+                        cache: false
+                        smooth: false
+                        source: "image://tiles/" + root.mapFolder + "/" + root.zoom + "/" + parent.tileX + "/" + parent.tileY
+                    }
                 }
             }
         }
     }
+
+    // ====== CAR ======
+    Image {
+        id: carImg
+        source: "../lib/icons/TopDownRedCar.png"
+        anchors.centerIn: parent
+        width: 20
+        height: 20
+        // The icon points west at rotation 0
+        rotation: root.heading + 90
+    }
+
+    // ====== CIRCULAR MASK ======
+    // A black ring around the circular view, static so it never re-rasterises
+    Rectangle {
+        readonly property real diameter: Math.min(root.width, root.height)
+        readonly property real ring: Math.max(root.width, root.height)
+
+        anchors.centerIn: parent
+        width: diameter + 2 * ring
+        height: width
+        radius: width / 2
+        color: "transparent"
+        border.color: "black"
+        border.width: ring
+    }
 }
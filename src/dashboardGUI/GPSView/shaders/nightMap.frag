@@ -0,0 +1,39 @@
+#version 440
+
+// Night styling of the day map tiles: the luminance is inverted while the
+// chroma is kept (water stays blue, parks stay green), then tinted to match
+// the night colour of the dashboard. A gamma below 1 lifts the dark end,
+// otherwise the (white) roads and (light) land both end up nearly black.
+//
+// Compile after changing (the .qsb file is what QML loads):
+//   pyside6-qsb --glsl "100 es,120,150" --hlsl 50 --msl 12 -o nightMap.frag.qsb nightMap.frag
+
+layout(location = 0) in vec2 qt_TexCoord0;
+layout(location = 0) out vec4 fragColor;
+
+layout(std140, binding = 0) uniform buf {
+    mat4 qt_Matrix;
+    float qt_Opacity;
+    vec4 tint;
+    float brightness;
+    float gamma;
+};
+
+layout(binding = 1) uniform sampler2D source;
+
+void main()
+{
+    vec4 c = texture(source, qt_TexCoord0);
+
+    // RGB -> YIQ, invert Y only
+    float y = dot(c.rgb, vec3(0.299, 0.587, 0.114));
+    float i = dot(c.rgb, vec3(0.596, -0.274, -0.322));
+    float q = dot(c.rgb, vec3(0.211, -0.523, 0.312));
+    y = pow(max(c.a - y, 0.0), gamma) * brightness;
+
+    vec3 rgb = vec3(y + 0.956 * i + 0.621 * q,
+                    y - 0.272 * i - 0.647 * q,
+                    y - 1.106 * i + 1.703 * q);
+
+    fragColor = vec4(clamp(rgb, 0.0, 1.0) * tint.rgb, c.a) * qt_Opacity;
+}
@@ -15,6 +15,9 @@ Item {
     readonly property real rpmNorm: Math.min(rpm / maxRpm, 1)
     readonly property bool inRedZone: rpmNorm >= 0.8
 
+    // Stops the shift light blinking while the view is hidden
+    property bool running: true
+
     // ===== COLORS =====
     property color bgColor: "black"
     property color inactiveColor: "#222"
@@ -34,7 +37,7 @@ Item {
     property real blinkPhase: 1.0
 
     SequentialAnimation on blinkPhase {
-        running: inRedZone
+        running: inRedZone && root.running
         loops: Animation.Infinite
         NumberAnimation { to: 0.2; duration: 500 }  // off
         NumberAnimation { to: 1.0; duration: 500 }  // on
@@ -44,75 +44,121 @@ ApplicationWindow {
         }
 
         // ====== VIEWS ======
+        // Every view is created on demand by a Loader; viewCache (src/viewCache.py)
+        // keeps the recently shown views and the next one of the button cycle.
+        // A view that is not shown holds its last values: every backend value
+        // goes through a Binding that is only in effect while the view is shown
+        // (RestoreNone keeps the last value), its timers and animations are stopped.
 
         // --- GPS Map View ---
-        CircleWindow {
+        Loader {
             id: gpsView
+            readonly property bool shown: backend.currentView === "gps"
             anchors.fill: parent
-            visible: backend.currentView === "gps"
-            zoom: 14
-            centerLat: backend.centerLat
-            centerLon: backend.centerLon
-            darkMode:  backend.isDaytime
-
-            Behavior on centerLat { NumberAnimation { duration: 500; easing.type: Easing.InOutQuad } }
-            Behavior on centerLon { NumberAnimation { duration: 500; easing.type: Easing.InOutQuad } }
+            active: shown || viewCache.warmViews.indexOf("gps") >= 0
+            asynchronous: !shown
+            visible: shown
+
+            sourceComponent: CircleWindow {
+                Binding on zoom { value: backend.mapZoom; when: gpsView.shown; restoreMode: Binding.RestoreNone }
+                // Predicted between GPS fixes by the backend, no animation needed
+                Binding on centerLat { value: backend.centerLat; when: gpsView.shown; restoreMode: Binding.RestoreNone }
+                Binding on centerLon { value: backend.centerLon; when: gpsView.shown; restoreMode: Binding.RestoreNone }
+                Binding on heading { value: backend.heading; when: gpsView.shown; restoreMode: Binding.RestoreNone }
+                Binding on darkMode { value: backend.isDaytime; when: gpsView.shown; restoreMode: Binding.RestoreNone }
+            }
         }
 
         // --- Technometer View (Classic) ---
-        TechnometerViewClassic {
+        Loader {
             id: technoClassic
+            readonly property bool shown: backend.currentView === "techno" && backend.showOverlays
             anchors.fill: parent
-            visible: backend.currentView === "techno" && backend.showOverlays
+            active: shown || viewCache.warmViews.indexOf("technoClassic") >= 0
+            asynchronous: !shown
+            visible: shown
 
-            rpm: backend.rpm
-            textColor: root.dayColor
+            sourceComponent: TechnometerViewClassic {
+                Binding on rpm { value: backend.rpm; when: technoClassic.shown; restoreMode: Binding.RestoreNone }
+                Binding on textColor { value: root.dayColor; when: technoClassic.shown; restoreMode: Binding.RestoreNone }
+            }
         }
 
         // --- Technometer View (Modern) ---
-        TechnometerViewModern {
+        Loader {
             id: technoModern
-            anchors.centerIn: parent
-            visible: backend.currentView === "techno" && !backend.showOverlays
-
-            rpm: backend.rpm
-            textColor: root.dayColor
+            readonly property bool shown: backend.currentView === "techno" && !backend.showOverlays
+            anchors.fill: parent
+            active: shown || viewCache.warmViews.indexOf("technoModern") >= 0
+            asynchronous: !shown
+            visible: shown
+
+            sourceComponent: TechnometerViewModern {
+                running: technoModern.shown
+                Binding on rpm { value: backend.rpm; when: technoModern.shown; restoreMode: Binding.RestoreNone }
+                Binding on textColor { value: root.dayColor; when: technoModern.shown; restoreMode: Binding.RestoreNone }
+            }
         }
 
         // --- Data Panel ---
-        DataView {
+        Loader {
             id: statusPanel
-            anchors.centerIn: parent
-            visible: backend.currentView === "data"
-
-            velocity: backend.velocity
-            tempInside: backend.tempInside
-            tempOutside: backend.tempOutside
-            humidityInside: backend.humidityInside
-            humidityOutside: backend.humidityOutside
-            piTemperature: backend.piTemperature
-            textColor: root.dayColor
+            readonly property bool shown: backend.currentView === "data"
+            anchors.fill: parent
+            active: shown || viewCache.warmViews.indexOf("data") >= 0
+            asynchronous: !shown
+            visible: shown
+
+            sourceComponent: DataView {
+                Binding on velocity { value: backend.velocity; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tempInside { value: backend.tempInside; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tempOutside { value: backend.tempOutside; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on humidityInside { value: backend.humidityInside; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on humidityOutside { value: backend.humidityOutside; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on piTemperature { value: backend.piTemperature; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on textColor { value: root.dayColor; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+
+                Binding on tripDistance { value: backend.tripDistance; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripMovingTime { value: backend.tripMovingTime; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripAverageSpeed { value: backend.tripAverageSpeed; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripMaxSpeed { value: backend.tripMaxSpeed; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripPeakAccel { value: backend.tripPeakAccel; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripPeakBrake { value: backend.tripPeakBrake; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripPeakLateral { value: backend.tripPeakLateral; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+                Binding on tripRpmBands { value: backend.tripRpmBands; when: statusPanel.shown; restoreMode: Binding.RestoreNone }
+            }
         }
 
         // --- Clock View ---
-        ClockView {
+        Loader {
             id: dashboardClock
+            readonly property bool shown: backend.currentView === "clock"
             anchors.fill: parent
-            visible: backend.currentView === "clock"
-
-            clockColor: root.dayColor
-            gpsTime: backend.gpsTime
+            active: shown || viewCache.warmViews.indexOf("clock") >= 0
+            asynchronous: !shown
+            visible: shown
+
+            sourceComponent: ClockView {
+                running: dashboardClock.shown
+                Binding on clockColor { value: root.dayColor; when: dashboardClock.shown; restoreMode: Binding.RestoreNone }
+                Binding on gpsTime { value: backend.gpsTime; when: dashboardClock.shown; restoreMode: Binding.RestoreNone }
+            }
         }
 
         // --- Acceleration View ---
-        AccelerationView {
+        Loader {
             id: accelView
+            readonly property bool shown: backend.currentView === "accel"
             anchors.fill: parent
-            visible: backend.currentView === "accel"
-
-            ax: backend.ax
-            ay: backend.ay
-            textColor: root.dayColor
+            active: shown || viewCache.warmViews.indexOf("accel") >= 0
+            asynchronous: !shown
+            visible: shown
+
+            sourceComponent: AccelerationView {
+                Binding on ax { value: backend.ax; when: accelView.shown; restoreMode: Binding.RestoreNone }
+                Binding on ay { value: backend.ay; when: accelView.shown; restoreMode: Binding.RestoreNone }
+                Binding on textColor { value: root.dayColor; when: accelView.shown; restoreMode: Binding.RestoreNone }
+            }
         }
 
         // ====== UI OVERLAYS ======
@@ -138,6 +184,38 @@ ApplicationWindow {
                 || ((backend.currentView === "gps" || backend.currentView === "techno") && !backend.showOverlays)
         }
 
+        // ====== FRAME PROFILER OVERLAY (debug only, src/frameProfiler.py) ======
+        Rectangle {
+            id: profilerOverlay
+            visible: debugOn && frameProfiler.enabled
+            anchors.centerIn: parent
+            anchors.verticalCenterOffset: -parent.height / 4
+            width: profilerText.implicitWidth + 24
+            height: profilerText.implicitHeight + 16
+            radius: 8
+            color: "#c0000000"
+            border.color: frameProfiler.missedFrames > 0 ? "red" : "lime"
+            border.width: 2
+
+            Text {
+                id: profilerText
+                anchors.centerIn: parent
+                font.family: "monospace"
+                font.pointSize: 11
+                color: "white"
+                text: "FPS " + frameProfiler.fps.toFixed(0)
+                      + "  missed " + frameProfiler.missedFrames
+                      + "  budget " + frameProfiler.budgetMs.toFixed(1) + " ms\n"
+                      + "frame min/avg/p99 " + frameProfiler.frameMin.toFixed(1)
+                      + " / " + frameProfiler.frameAvg.toFixed(1)
+                      + " / " + frameProfiler.frameP99.toFixed(1) + " ms\n"
+                      + "sync " + frameProfiler.syncMs.toFixed(2)
+                      + " ms  render " + frameProfiler.renderMs.toFixed(2) + " ms\n"
+                      + "animations " + frameProfiler.animations
+                      + "  view " + backend.currentView
+            }
+        }
+
         // ====== SYSTEM / ACTION / SHUTDOWN OVERLAY ======
         Rectangle {
             id: systemMessageBox
@@ -200,7 +278,8 @@ ApplicationWindow {
                     visible: backend.systemActionState !== "idle"
                     text: {
                         switch(backend.systemActionState) {
-                            case "calibrating_mpu": return "Calibrating MPU6050...";
+                            case "calibrating_mpu": return "Calibrating MPU6050... "
+                                                           + Math.round(backend.calibrationProgress * 100) + "%";
                             case "mpu_done": return "MPU6050 calibration complete";
                             case "mpu_failed": return "MPU6050 calibration failed";
                             case "git_checking": return "Checking for software updates...";
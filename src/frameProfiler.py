@@ -0,0 +1,238 @@
+import csv
+import os
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, Signal, Property, QTimer, Qt, Slot
+
+# Frames kept for the export, about a minute at 60 fps
+FRAME_HISTORY = 3600
+# The overlay summarises the frames of the last second, twice per second
+SUMMARY_WINDOW_S = 1.0
+SUMMARY_INTERVAL_MS = 500
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class FrameProfiler(QObject):
+    """
+    Frame timing of a QQuickWindow for the debug overlay. Per frame, from the
+    window signals (render thread or GUI thread, depending on the render loop):
+    - sync: beforeSynchronizing to afterSynchronizing (QML items to scene graph,
+      the GUI thread is blocked meanwhile)
+    - render: beforeRendering to afterRendering (scene graph to GPU commands)
+    - frame: beforeSynchronizing to frameSwapped (includes waiting for vsync)
+    - interval: time between two swaps (long when nothing changed, the scene
+      graph only renders on demand)
+    A frame whose sync + render takes longer than the refresh period misses
+    the vsync budget.
+    The last FRAME_HISTORY frames are kept with the view that was shown and
+    export() writes them as CSV. The overlay properties are updated twice per
+    second on the GUI thread, the frame signals are only connected while
+    enabled.
+    """
+
+    summaryChanged = Signal()
+    enabledChanged = Signal()
+
+    def __init__(self, view_getter=lambda: "", directory="."):
+        super().__init__()
+        self.view_getter = view_getter
+        self.directory = directory
+        self.frames = deque(maxlen=FRAME_HISTORY)  # (swap_ns, view, sync_ms, render_ms, frame_ms, interval_ms)
+        self._window = None
+        self._budget_ms = 1000 / 60
+        self._enabled = False
+        self._sync_ns = self._synced_ns = self._render_ns = self._rendered_ns = None
+        self._swap_ns = None
+
+        self._fps = 0.0
+        self._frame_min = self._frame_avg = self._frame_p99 = 0.0
+        self._sync_ms = self._render_ms = 0.0
+        self._animations = 0
+        self._animation_objects = None  # found once, None = search the window again
+        self._missed_recent = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(SUMMARY_INTERVAL_MS)
+        self._timer.timeout.connect(self._update_summary)
+
+    # -----------------------------
+    # Window
+    # -----------------------------
+    def attach(self, window):
+        self._window = window
+        screen = window.screen()
+        if screen and screen.refreshRate() > 0:
+            self._budget_ms = 1000 / screen.refreshRate()
+        # The animations only change when a Loader creates or destroys a view
+        for child in window.findChildren(QObject):
+            if child.inherits("QQuickLoader"):
+                child.itemChanged.connect(self._forget_animations)
+        self._animation_objects = None
+        if self._enabled:
+            self._connect()
+
+    def _connect(self):
+        window = self._window
+        window.beforeSynchronizing.connect(self._on_before_sync, Qt.DirectConnection)
+        window.afterSynchronizing.connect(self._on_after_sync, Qt.DirectConnection)
+        window.beforeRendering.connect(self._on_before_render, Qt.DirectConnection)
+        window.afterRendering.connect(self._on_after_render, Qt.DirectConnection)
+        window.frameSwapped.connect(self._on_swap, Qt.DirectConnection)
+        self._timer.start()
+
+    def _disconnect(self):
+        window = self._window
+        window.beforeSynchronizing.disconnect(self._on_before_sync)
+        window.afterSynchronizing.disconnect(self._on_after_sync)
+        window.beforeRendering.disconnect(self._on_before_render)
+        window.afterRendering.disconnect(self._on_after_render)
+        window.frameSwapped.disconnect(self._on_swap)
+        self._timer.stop()
+        self._swap_ns = None
+
+    @Property(bool, notify=enabledChanged)
+    def enabled(self): return self._enabled
+    @enabled.setter
+    def enabled(self, val):
+        if self._enabled != val:
+            self._enabled = val
+            if self._window is not None:
+                self._connect() if val else self._disconnect()
+            self.enabledChanged.emit()
+
+    # -----------------------------
+    # Frame signals
+    # -----------------------------
+    def _on_before_sync(self):
+        self._sync_ns = time.perf_counter_ns()
+        self._render_ns = self._rendered_ns = None
+
+    def _on_after_sync(self):
+        self._synced_ns = time.perf_counter_ns()
+
+    def _on_before_render(self):
+        self._render_ns = time.perf_counter_ns()
+
+    def _on_after_render(self):
+        self._rendered_ns = time.perf_counter_ns()
+
+    def _on_swap(self):
+        now = time.perf_counter_ns()
+        if self._sync_ns is not None and self._synced_ns is not None:
+            render_ms = (self._rendered_ns - self._render_ns) / 1e6 if self._rendered_ns and self._render_ns else 0.0
+            sync_ms = (self._synced_ns - self._sync_ns) / 1e6
+            interval_ms = (now - self._swap_ns) / 1e6 if self._swap_ns is not None else 0.0
+            self.frames.append((now, self.view_getter(), sync_ms, render_ms, (now - self._sync_ns) / 1e6, interval_ms))
+        self._swap_ns = now
+        self._sync_ns = self._synced_ns = None
+
+    # -----------------------------
+    # Overlay (GUI thread)
+    # -----------------------------
+    def _update_summary(self):
+        since = time.perf_counter_ns() - int(SUMMARY_WINDOW_S * 1e9)
+        recent = [frame for frame in list(self.frames) if frame[0] >= since]
+        frame_ms = [frame[4] for frame in recent]
+        self._fps = len(recent) / SUMMARY_WINDOW_S
+        self._frame_min = min(frame_ms, default=0.0)
+        self._frame_avg = sum(frame_ms) / len(frame_ms) if frame_ms else 0.0
+        self._frame_p99 = percentile(frame_ms, 99)
+        self._sync_ms = sum(frame[2] for frame in recent) / len(recent) if recent else 0.0
+        self._render_ms = sum(frame[3] for frame in recent) / len(recent) if recent else 0.0
+        self._missed_recent = sum(1 for frame in recent if self.missed_budget(frame))
+        self._animations = self.count_animations()
+        self.summaryChanged.emit()
+
+    def missed_budget(self, frame):
+        return frame[2] + frame[3] > self._budget_ms
+
+    def count_animations(self):
+        """Running QML animations and animators (Behaviors included) in the window."""
+        if self._window is None:
+            return 0
+        if self._animation_objects is None:
+            self._animation_objects = [
+                child for child in self._window.findChildren(QObject)
+                if child.inherits("QQuickAbstractAnimation")
+            ]
+        try:
+            return sum(1 for animation in self._animation_objects if animation.property("running"))
+        except RuntimeError:
+            # Deleted with a view that was unloaded after the search
+            self._animation_objects = None
+            return 0
+
+    @Slot()
+    def _forget_animations(self):
+        self._animation_objects = None
+
+    @Property(float, notify=summaryChanged)
+    def fps(self): return self._fps
+
+    @Property(float, notify=summaryChanged)
+    def frameMin(self): return self._frame_min
+
+    @Property(float, notify=summaryChanged)
+    def frameAvg(self): return self._frame_avg
+
+    @Property(float, notify=summaryChanged)
+    def frameP99(self): return self._frame_p99
+
+    @Property(float, notify=summaryChanged)
+    def syncMs(self): return self._sync_ms
+
+    @Property(float, notify=summaryChanged)
+    def renderMs(self): return self._render_ms
+
+    @Property(float, notify=summaryChanged)
+    def budgetMs(self): return self._budget_ms
+
+    @Property(int, notify=summaryChanged)
+    def missedFrames(self): return self._missed_recent
+
+    @Property(int, notify=summaryChanged)
+    def animations(self): return self._animations
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+    def summary_by_view(self):
+        """{view: (frames, frame p50, frame p99, missed vsyncs)} of the kept frames."""
+        per_view = {}
+        for frame in list(self.frames):
+            per_view.setdefault(frame[1], []).append(frame)
+        return {
+            view: (
+                len(frames),
+                percentile([frame[4] for frame in frames], 50),
+                percentile([frame[4] for frame in frames], 99),
+                sum(1 for frame in frames if self.missed_budget(frame)),
+            )
+            for view, frames in per_view.items()
+        }
+
+    def export(self, path=None):
+        """Write the kept frames as CSV (default: a timestamped file in directory), returns the path."""
+        if path is None:
+            path = os.path.join(self.directory, time.strftime("frames_%Y%m%d_%H%M%S.csv"))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        frames = list(self.frames)
+        start = frames[0][0] if frames else 0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time_s", "view", "sync_ms", "render_ms", "frame_ms", "interval_ms"])
+            for swap_ns, view, sync_ms, render_ms, frame_ms, interval_ms in frames:
+                writer.writerow([
+                    f"{(swap_ns - start) / 1e9:.4f}", view,
+                    f"{sync_ms:.3f}", f"{render_ms:.3f}", f"{frame_ms:.3f}", f"{interval_ms:.3f}",
+                ])
+        return path
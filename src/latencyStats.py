@@ -0,0 +1,189 @@
+import json
+import os
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from PySide6.QtCore import Qt
+
+# Bucket upper edges in ms: 0.05 ms to about 1.6 s, four buckets per doubling
+BUCKET_EDGES_MS = tuple(0.05 * 2 ** (i / 4) for i in range(61))
+STAGES = ("read", "apply", "frame")
+# Samples waiting for a frame, bounded for when nothing is being rendered
+MAX_PENDING = 256
+
+
+class LatencyHistogram:
+    """Latencies in fixed, logarithmic buckets; the last bucket counts everything above the edges."""
+
+    def __init__(self, edges=BUCKET_EDGES_MS):
+        self.edges = edges
+        self.counts = array("Q", bytes(8 * (len(edges) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms):
+        self.counts[bisect_left(self.edges, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self.edges[i], self.max) if i < len(self.edges) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 3),
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max, 3),
+            "buckets": {f"{edge:.3f}": n for edge, n in zip(self.edges, self.counts) if n},
+            "overflow": self.counts[-1],
+        }
+
+
+class SensorLatency:
+    """
+    Counters of one sensor. Stages, per sample, from the monotonic times the
+    acquisition carries:
+    - read: the driver read (read start to read end)
+    - apply: read end to the values written and handled on the GUI thread
+    - frame: read start to the swap of the first frame rendered after the
+      telemetry flush that published one of its values; samples whose values
+      were all dropped by a deadband or overwritten before the flush get none
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.samples = 0
+        self.errors = 0
+        self.gaps = 0  # sequence numbers that never arrived
+        self.last_seq = 0
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+
+    def snapshot(self):
+        return {
+            "samples": self.samples,
+            "errors": self.errors,
+            "gaps": self.gaps,
+            "last_seq": self.last_seq,
+            **{stage: histogram.snapshot() for stage, histogram in self.stages.items()},
+        }
+
+
+class LatencyStats:
+    """
+    Latency histograms and error counters per sensor, fed by the
+    AcquisitionScheduler. attach(window, telemetry) follows the samples
+    through the flush of a TelemetryState (src/telemetryState.py) to the next
+    rendered frame of a QQuickWindow. dump() writes into directory.
+    """
+
+    def __init__(self, directory="."):
+        self.directory = directory
+        self.sensors = {}
+        self.frames = 0
+        self.started = time.time()
+        self._unflushed = {}  # channel -> (sensor, read_ns) of its last write, until the flush
+        self._pending = deque(maxlen=MAX_PENDING)  # (sensor, read_ns) published since the last sync
+        self._in_frame = []  # synchronized into the frame being rendered
+
+    def sensor(self, name):
+        sensor = self.sensors.get(name)
+        if sensor is None:
+            sensor = self.sensors[name] = SensorLatency(name)
+        return sensor
+
+    def record_sample(self, name, seq, read_ns, read_done_ns, handled_ns, channels=()):
+        sensor = self.sensor(name)
+        sensor.samples += 1
+        if seq > sensor.last_seq + 1 and sensor.last_seq:
+            sensor.gaps += seq - sensor.last_seq - 1
+        sensor.last_seq = seq
+        sensor.stages["read"].record((read_done_ns - read_ns) / 1e6)
+        sensor.stages["apply"].record((handled_ns - read_done_ns) / 1e6)
+        entry = (sensor, read_ns)
+        for channel in channels:
+            self._unflushed[channel] = entry
+
+    def record_error(self, name):
+        self.sensor(name).errors += 1
+
+    # -----------------------------
+    # Frames (render thread or GUI thread, depending on the render loop)
+    # -----------------------------
+    def attach(self, window, telemetry):
+        telemetry.telemetryChanged.connect(self._on_published)
+        window.beforeSynchronizing.connect(self._on_sync, Qt.DirectConnection)
+        window.frameSwapped.connect(self._on_swap, Qt.DirectConnection)
+
+    def _on_published(self, names):
+        # GUI thread. Every write up to now went into this flush, only the
+        # samples with a channel that actually changed wait for a frame
+        unflushed, self._unflushed = self._unflushed, {}
+        published = {unflushed[name] for name in names if name in unflushed}
+        self._pending.extend(published)
+
+    def _on_sync(self):
+        # The GUI thread is blocked during the sync, nothing is written meanwhile
+        pending, self._pending = self._pending, deque(maxlen=MAX_PENDING)
+        self._in_frame += pending
+
+    def _on_swap(self):
+        now = time.monotonic_ns()
+        in_frame, self._in_frame = self._in_frame, []
+        self.frames += 1
+        for sensor, read_ns in in_frame:
+            sensor.stages["frame"].record((now - read_ns) / 1e6)
+
+    # -----------------------------
+    # Reports
+    # -----------------------------
+    def snapshot(self):
+        return {
+            "since": self.started,
+            "frames": self.frames,
+            "sensors": {name: sensor.snapshot() for name, sensor in sorted(self.sensors.items())},
+        }
+
+    def format_table(self):
+        """One line per sensor: counters and p50/p99 of every stage, in ms."""
+        lines = [f"{'sensor':<9}{'samples':>8}{'err':>5}{'gap':>5}" + "".join(
+            f"{stage + ' p50/p99':>18}" for stage in STAGES
+        )]
+        for name, sensor in sorted(self.sensors.items()):
+            line = f"{name:<9}{sensor.samples:>8}{sensor.errors:>5}{sensor.gaps:>5}"
+            for stage in STAGES:
+                histogram = sensor.stages[stage]
+                line += f"{histogram.percentile(50):>9.2f}/{histogram.percentile(99):<8.2f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """Write the snapshot as JSON (default: a timestamped file in directory), returns the path."""
+        if path is None:
+            path = os.path.join(self.directory, time.strftime("latency_%Y%m%d_%H%M%S.json"))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
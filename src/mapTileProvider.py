@@ -0,0 +1,290 @@
+import math
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from PySide6.QtGui import QImage, QColor
+from PySide6.QtQml import QQmlImageProviderBase
+from PySide6.QtQuick import QQuickImageProvider
+
+from src.tileArchive import TileArchive, ARCHIVE_EXTENSION
+
+
+class TileCache:
+    """Thread-safe LRU cache of decoded tiles, bounded by the total image size in bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            image = self._tiles.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._tiles
+
+    def put(self, key, image):
+        size = image.sizeInBytes()
+        with self._lock:
+            old = self._tiles.pop(key, None)
+            if old is not None:
+                self.bytes -= old.sizeInBytes()
+            self._tiles[key] = image
+            self.bytes += size
+
+            while self.bytes > self.max_bytes and len(self._tiles) > 1:
+                _, evicted = self._tiles.popitem(last=False)
+                self.bytes -= evicted.sizeInBytes()
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._tiles)
+
+
+class MapTileProvider(QQuickImageProvider):
+    """
+    Serves map tiles to QML as image://tiles/<map folder>/<zoom>/<x>/<y>.
+    Decoded tiles are kept in a byte-bounded LRU cache and the tiles around
+    (and ahead of) the car are decoded on a prefetch thread, so repaints of
+    the map normally do not touch the SD card.
+
+    Tiles are read from a packed <map folder>.tiles archive when one exists
+    (see src/tileArchive.py), otherwise from the <map folder>/<z>/<x>/<y>.png tree.
+
+    The map zoom follows the speed (ZOOM_BY_SPEED, limited to the zoom levels
+    the map has), and prefetching covers the road ahead for the next
+    lookahead_seconds at the target zoom, plus the tiles one level up that
+    CircleWindow shows while a tile loads.
+    """
+
+    # Night mode is a shader on the day tiles (CircleWindow.qml), so there is one tile set
+    MAP_FOLDERS = ("mapNL",)
+
+    # (up to km/h, zoom): detail in town, overview on the motorway
+    ZOOM_BY_SPEED = ((30, 16), (60, 15), (90, 14), (float("inf"), 13))
+    ZOOM_HYSTERESIS = 5  # km/h below a threshold before zooming back in
+    DEFAULT_ZOOM = 14
+
+    def __init__(self, tile_root, cache_bytes=64 * 1024 * 1024, prefetch_radius=1,
+                 lookahead_seconds=30, prefetch_budget=20):
+        super().__init__(QQmlImageProviderBase.ImageType.Image)
+        self.tile_root = tile_root
+        self.cache = TileCache(cache_bytes)
+        self.prefetch_radius = prefetch_radius
+        self.lookahead_seconds = lookahead_seconds
+        self.prefetch_budget = prefetch_budget  # tiles decoded per second by the prefetch thread
+        self.prefetched = 0
+        self.dropped = 0
+
+        # Missing tiles are cached as a 1x1 transparent image, showing the map background
+        self._missing = QImage(1, 1, QImage.Format_ARGB32_Premultiplied)
+        self._missing.fill(QColor("transparent"))
+
+        self.archives = {}
+        for folder in self.MAP_FOLDERS:
+            path = os.path.join(tile_root, folder + ARCHIVE_EXTENSION)
+            if os.path.exists(path):
+                try:
+                    self.archives[folder] = TileArchive(path)
+                    print(f"[INFO] Using tile archive {path}")
+                except (OSError, ValueError) as e:
+                    print(f"[WARN] Cannot open tile archive {path}: {e}")
+
+        self.zoom_levels = self._find_zoom_levels()
+        self.zoom = self._nearest_zoom(self.DEFAULT_ZOOM)
+
+        # Folder the map is currently drawing, learnt from the requests
+        self._folder = self.MAP_FOLDERS[0]
+        self._last_position = None
+        self._heading = None
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._prefetch_loop, daemon=True)
+        self._thread.start()
+
+    # -----------------------------
+    # QQuickImageProvider
+    # -----------------------------
+    def requestImage(self, id, size, requestedSize):
+        key = self._parse_id(id)
+        if key is None:
+            return self._missing
+
+        self._folder = key[0]
+
+        image = self.cache.get(key)
+        if image is None:
+            image = self._load(key)
+            self.cache.put(key, image)
+
+        size.setWidth(image.width())
+        size.setHeight(image.height())
+        return image
+
+    # -----------------------------
+    # Prefetching
+    # -----------------------------
+    def zoom_for_speed(self, speed):
+        """Zoom level for a speed in km/h, with hysteresis so it does not flip at a threshold."""
+        target = self.ZOOM_BY_SPEED[-1][1]
+        for limit, zoom in self.ZOOM_BY_SPEED:
+            # Zooming in (more detail) needs to be clearly below the limit
+            if zoom > self.zoom:
+                limit -= self.ZOOM_HYSTERESIS
+            if speed < limit:
+                target = zoom
+                break
+        return self._nearest_zoom(target)
+
+    def update_position(self, lat, lon, speed=0.0):
+        """
+        Choose the zoom for the speed and queue the tiles around the car and
+        along the road ahead. Returns the zoom level the map should use.
+        """
+        if lat is None or lon is None:
+            return self.zoom
+
+        zoom = self.zoom_for_speed(speed or 0.0)
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self._last_position = None
+
+        n = 2 ** zoom
+        x = (lon + 180.0) / 360.0 * n
+        y = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+
+        if self._last_position:
+            dx = x - self._last_position[0]
+            dy = y - self._last_position[1]
+            distance = math.hypot(dx, dy)
+            # Ignore GPS jitter, about 2.5 m (1e-4 tiles at zoom 14)
+            if distance > 1e-4 * 2 ** (zoom - 14):
+                self._heading = (dx / distance, dy / distance)
+        self._last_position = (x, y)
+
+        cx, cy = int(x), int(y)
+        tiles = [(cx, cy)]
+        for tx in range(cx - self.prefetch_radius, cx + self.prefetch_radius + 1):
+            for ty in range(cy - self.prefetch_radius, cy + self.prefetch_radius + 1):
+                if (tx, ty) != (cx, cy):
+                    tiles.append((tx, ty))
+
+        if self._heading and speed:
+            # Road ahead for the next lookahead_seconds, in half tile steps
+            tile_metres = 40075016.686 * math.cos(math.radians(lat)) / n
+            ahead = speed / 3.6 * self.lookahead_seconds / tile_metres
+            steps = int(ahead * 2)
+            for step in range(1, steps + 1):
+                ax = x + self._heading[0] * step / 2
+                ay = y + self._heading[1] * step / 2
+                tiles.append((int(ax), int(ay)))
+
+        for tx, ty in tiles:
+            self._enqueue((self._folder, zoom, tx, ty))
+        # Placeholders for tiles that are still loading
+        if zoom - 1 in self.zoom_levels:
+            for tx, ty in tiles[:(2 * self.prefetch_radius + 1) ** 2]:
+                self._enqueue((self._folder, zoom - 1, tx // 2, ty // 2))
+
+        return zoom
+
+    def stats(self):
+        return {
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "prefetched": self.prefetched,
+            "dropped": self.dropped,
+            "evictions": self.cache.evictions,
+            "tiles": len(self.cache),
+            "bytes": self.cache.bytes,
+        }
+
+    def _enqueue(self, key):
+        if key in self.cache:
+            return
+        with self._pending_lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._queue.put(key)
+
+    def _prefetch_loop(self):
+        interval = 1.0 / self.prefetch_budget
+        next_load = time.monotonic()
+        while True:
+            key = self._queue.get()
+            try:
+                if key in self.cache:
+                    continue
+                # Tiles queued for a zoom the map has left are not worth decoding
+                if key[1] not in (self.zoom, self.zoom - 1):
+                    self.dropped += 1
+                    continue
+
+                # Stay within the decode budget, the map's own requests come first
+                now = time.monotonic()
+                if next_load > now:
+                    time.sleep(next_load - now)
+                next_load = max(now, next_load) + interval
+
+                self.cache.put(key, self._load(key))
+                self.prefetched += 1
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(key)
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+    def _find_zoom_levels(self):
+        levels = set()
+        for folder in self.MAP_FOLDERS:
+            archive = self.archives.get(folder)
+            if archive is not None:
+                levels.update(archive.zooms)
+                continue
+            path = os.path.join(self.tile_root, folder)
+            if os.path.isdir(path):
+                levels.update(int(name) for name in os.listdir(path) if name.isdigit())
+        return sorted(levels) or [self.DEFAULT_ZOOM]
+
+    def _nearest_zoom(self, zoom):
+        return min(self.zoom_levels, key=lambda level: (abs(level - zoom), -level))
+
+    def _parse_id(self, id):
+        parts = id.split("?")[0].split("/")
+        if len(parts) != 4 or parts[0] not in self.MAP_FOLDERS:
+            return None
+        try:
+            return parts[0], int(parts[1]), int(parts[2]), int(parts[3])
+        except ValueError:
+            return None
+
+    def _load(self, key):
+        folder, zoom, x, y = key
+        archive = self.archives.get(folder)
+        if archive is not None:
+            data = archive.get(zoom, x, y)
+            image = QImage.fromData(data) if data else QImage()
+            return self._missing if image.isNull() else image
+
+        path = os.path.join(self.tile_root, folder, str(zoom), str(x), f"{y}.png")
+        image = QImage(path)
+        return self._missing if image.isNull() else image
@@ -0,0 +1,109 @@
+import math
+
+EARTH_RADIUS = 6371008.8  # metres
+G = 9.81
+
+
+class DeadReckoning:
+    """
+    Predicts the car position between GPS fixes from the last fix, the speed
+    and the course over ground (and the longitudinal acceleration of the MPU
+    when available), so the map can be moved at display rate.
+
+    A new fix does not make the position jump: the difference between the
+    prediction and the fix is kept as an offset that decays over
+    correction_time seconds. The heading follows the GPS course, smoothed,
+    and is held while the car stands still.
+    """
+
+    def __init__(self, correction_time=0.8, heading_time=0.3, min_speed=3.0,
+                 snap_distance=500.0, max_extrapolation=5.0):
+        self.correction_time = correction_time
+        self.heading_time = heading_time
+        self.min_speed = min_speed  # km/h, below this the car is standing still
+        self.snap_distance = snap_distance  # metres, larger errors jump (first fix, replay)
+        self.max_extrapolation = max_extrapolation  # seconds, stop predicting without fixes
+
+        # Longitudinal acceleration in m/s^2, set by the caller from the MPU
+        self.acceleration = 0.0
+        self.heading = 0.0
+
+        self._lat = None
+        self._lon = None
+        self._time = None
+        self._speed = 0.0  # m/s
+        self._course = None
+        self._offset = (0.0, 0.0)  # east, north in metres, at the last fix
+        self._heading_time = None
+
+    @property
+    def has_fix(self):
+        return self._time is not None
+
+    def update_fix(self, lat, lon, speed, course, t):
+        """Take a GPS fix: position in degrees, speed in km/h, course in degrees (None if unknown)."""
+        offset = (0.0, 0.0)
+        if self._time is not None:
+            lat_p, lon_p = self.position(t)
+            offset = self._metres(lat, lon, lat_p, lon_p)
+            if math.hypot(*offset) > self.snap_distance:
+                offset = (0.0, 0.0)
+
+        moving = speed is not None and speed >= self.min_speed
+        self._lat = lat
+        self._lon = lon
+        self._time = t
+        self._offset = offset
+        self._speed = speed / 3.6 if moving else 0.0
+        if moving and course is not None:
+            self._course = course % 360.0
+
+    def position(self, t):
+        """Predicted (lat, lon) at monotonic time t."""
+        if self._time is None:
+            return None, None
+
+        dt = min(max(t - self._time, 0.0), self.max_extrapolation)
+        east = north = 0.0
+
+        if self._speed > 0 and self._course is not None:
+            a = self.acceleration
+            if a < 0 and self._speed + a * dt < 0:
+                # Braking to a stop before t
+                distance = self._speed ** 2 / (-2 * a)
+            else:
+                distance = self._speed * dt + 0.5 * a * dt * dt
+            course = math.radians(self._course)
+            east = distance * math.sin(course)
+            north = distance * math.cos(course)
+
+        decay = math.exp(-dt / self.correction_time)
+        east += self._offset[0] * decay
+        north += self._offset[1] * decay
+
+        lat = self._lat + math.degrees(north / EARTH_RADIUS)
+        lon = self._lon + math.degrees(east / (EARTH_RADIUS * math.cos(math.radians(self._lat))))
+        return lat, lon
+
+    def update_heading(self, t):
+        """Move the smoothed heading towards the course over ground, returns it in degrees."""
+        if self._heading_time is None or self._course is None:
+            self._heading_time = t
+            if self._course is not None:
+                self.heading = self._course
+            return self.heading
+
+        dt = max(t - self._heading_time, 0.0)
+        self._heading_time = t
+        if self._speed > 0:
+            # Shortest way round, 350 -> 10 turns 20 degrees, not 340
+            diff = (self._course - self.heading + 180.0) % 360.0 - 180.0
+            self.heading = (self.heading + diff * (1.0 - math.exp(-dt / self.heading_time))) % 360.0
+        return self.heading
+
+    @staticmethod
+    def _metres(lat_from, lon_from, lat_to, lon_to):
+        """(east, north) in metres from one position to another, fine for short distances."""
+        north = math.radians(lat_to - lat_from) * EARTH_RADIUS
+        east = math.radians(lon_to - lon_from) * EARTH_RADIUS * math.cos(math.radians(lat_from))
+        return east, north
@@ -0,0 +1,354 @@
+import itertools
+import threading
+import time
+
+from PySide6.QtCore import QObject, QThread, QTimer, Qt, Signal, Slot
+
+from src.latencyStats import LatencyStats
+
+
+class SensorWorker(QObject):
+    """
+    Polls a single sensor read function on its own QThread at its own rate.
+    Every successful read is published with sampleReady, together with its
+    trace (sequence number, monotonic ns at the start and end of the read);
+    exceptions are published with readFailed. Both signals cross into the
+    GUI thread as queued connections, so receivers only have to apply values.
+    """
+
+    sampleReady = Signal(str, object, object)
+    readFailed = Signal(str, str)
+
+    def __init__(self, name, read_fn, interval_ms):
+        super().__init__()
+        self.name = name
+        self.read_fn = read_fn
+        self.interval_ms = interval_ms
+        self.seq = 0
+        self._timer = None
+
+    @Slot()
+    def start(self):
+        """Runs inside the worker thread once it has started."""
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self._timer.start(self.interval_ms)
+        self._tick()
+
+    @Slot()
+    def stop(self):
+        if self._timer:
+            self._timer.stop()
+
+    def _tick(self):
+        started_ns = time.monotonic_ns()
+        try:
+            sample = self.read_fn()
+        except Exception as e:
+            self.readFailed.emit(self.name, str(e))
+            return
+
+        if sample is not None:
+            self.seq += 1
+            self.sampleReady.emit(self.name, sample, (self.seq, started_ns, time.monotonic_ns()))
+
+
+class AcquisitionScheduler(QObject):
+    """
+    Owns one SensorWorker + QThread per sensor.
+    Sample dicts are applied to the backend via backend.applySample and
+    read errors end up in backend.sensorStatusMessage. Every sample is
+    re-emitted on the GUI thread with sampleReady for app-level handlers.
+    The trace of every sample and the read errors are counted in stats
+    (src/latencyStats.py).
+
+    on_tick, if set, is called as on_tick(name, read_ns, handled_ns) once a
+    sample has been applied and handled, with the monotonic ns times of the
+    read and of the end of the handling (for benchmarks).
+    """
+
+    sampleReady = Signal(str, object)
+    _published = Signal(str, object, object)
+
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+        self.on_tick = None
+        self.stats = LatencyStats()
+        self.workers = {}
+        self._threads = {}
+        self._apply_to_backend = set()
+        self._started = False
+        self._published.connect(self._on_sample, Qt.QueuedConnection)
+
+    def add(self, name, read_fn, interval_ms, apply_to_backend=True):
+        """
+        Register a sensor, it starts at once if the scheduler is running.
+        Returns the worker so callers can connect extra slots.
+        """
+        worker = SensorWorker(name, read_fn, interval_ms)
+        thread = QThread()
+        thread.setObjectName(f"{name}-worker")
+        worker.moveToThread(thread)
+        thread.started.connect(worker.start)
+        # finished is emitted from the worker thread, so the timer stops there
+        thread.finished.connect(worker.stop, Qt.DirectConnection)
+
+        if apply_to_backend:
+            self._apply_to_backend.add(name)
+        worker.sampleReady.connect(self._on_sample, Qt.QueuedConnection)
+        worker.readFailed.connect(self._on_read_failed, Qt.QueuedConnection)
+
+        self.workers[name] = worker
+        self._threads[name] = thread
+        if self._started:
+            thread.start()
+        return worker
+
+    def add_event_source(self, name, apply_to_backend=True):
+        """
+        Register a sensor that runs its own thread and pushes samples itself.
+        Returns publish(sample), which may be called from any thread. Like the
+        polled sensors, its samples are dropped while the scheduler is stopped.
+        """
+        if apply_to_backend:
+            self._apply_to_backend.add(name)
+        seq = itertools.count(1)
+
+        def publish(sample):
+            if not self._started:
+                return
+            now = time.monotonic_ns()
+            self._published.emit(name, sample, (next(seq), now, now))
+        return publish
+
+    @property
+    def running(self):
+        return self._started
+
+    def start(self):
+        self._started = True
+        for name, thread in self._threads.items():
+            if not thread.isRunning():
+                thread.start()
+
+    def stop(self):
+        self._started = False
+        for name, thread in self._threads.items():
+            thread.quit()
+        for name, thread in self._threads.items():
+            thread.wait(2000)
+
+    @Slot(str, object, object)
+    def _on_sample(self, name, sample, trace):
+        seq, read_ns, read_done_ns = trace
+        if name in self._apply_to_backend:
+            self.backend.applySample(name, sample)
+        self.sampleReady.emit(name, sample)
+
+        handled_ns = time.monotonic_ns()
+        self.stats.record_sample(name, seq, read_ns, read_done_ns, handled_ns, sample)
+        if self.on_tick:
+            self.on_tick(name, read_ns, handled_ns)
+
+    @Slot(str, str)
+    def _on_read_failed(self, name, message):
+        self.stats.record_error(name)
+        self.backend.sensorStatusMessage = f"{name} read error: {message}"
+
+
+class SensorBringup(QObject):
+    """
+    Initialises the sensor drivers in parallel, each init function (driver
+    import included) on its own background thread. The driver it returns is
+    handed to its on_ready callback on the GUI thread as soon as it is there,
+    so every sensor goes live on its own; a slow one (the GPS waits up to 2 s
+    for data) does not hold back the others. An exception is reported with
+    on_failed(name, message).
+
+    start_after_first_frame(window) starts the bring-up once the window has
+    shown its first frame, so the interface is on screen before any driver
+    is touched. run_inline() instead initialises one sensor after another on
+    the calling thread, the blocking startup of old. finished is emitted once
+    every sensor is done and the first frame is shown, or the timeout started
+    the bring-up without one.
+    """
+
+    finished = Signal()
+    _ready = Signal(str, object)
+    _failed = Signal(str, str)
+
+    def __init__(self, timeline=None, on_failed=None):
+        super().__init__()
+        self.timeline = timeline
+        self.on_failed = on_failed
+        self.sensors = {}  # name -> (init_fn, on_ready)
+        self.pending = set()
+        self.first_frame = False
+        self.started_by_timeout = False
+        self._window = None
+        self._started = False
+        self._finished = False
+        self._ready.connect(self._on_ready, Qt.QueuedConnection)
+        self._failed.connect(self._on_failed, Qt.QueuedConnection)
+
+    def add(self, name, init_fn, on_ready):
+        self.sensors[name] = (init_fn, on_ready)
+
+    def start_after_first_frame(self, window, timeout_ms=2000):
+        """Start on the first frame swap, or after timeout_ms if nothing is rendered."""
+        self._window = window
+        window.frameSwapped.connect(self._on_first_frame, Qt.QueuedConnection)
+        QTimer.singleShot(timeout_ms, self._on_timeout)
+
+    @Slot()
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self.pending = set(self.sensors)
+        for name, (init_fn, _) in self.sensors.items():
+            threading.Thread(
+                target=self._run, args=(name, init_fn), name=f"{name}-init", daemon=True
+            ).start()
+        self._check_finished()
+
+    def run_inline(self):
+        self._started = True
+        self.pending = set(self.sensors)
+        for name, (init_fn, _) in self.sensors.items():
+            try:
+                driver = self._init(name, init_fn)
+            except Exception as e:
+                self._on_failed(name, str(e))
+                continue
+            self._on_ready(name, driver)
+
+    @Slot()
+    def _on_timeout(self):
+        if self._started:
+            return
+        print("[WARN] No frame shown yet, starting the sensors anyway")
+        self.started_by_timeout = True
+        if self.timeline is not None:
+            self.timeline.mark("first frame timeout")
+        self.start()
+
+    @Slot()
+    def _on_first_frame(self):
+        # Frames queued before the disconnect still arrive
+        if self.first_frame:
+            return
+        self._window.frameSwapped.disconnect(self._on_first_frame)
+        self.first_frame = True
+        if self.timeline is not None:
+            self.timeline.mark("first frame")
+        self.start()
+        self._check_finished()
+
+    def _init(self, name, init_fn):
+        if self.timeline is None:
+            return init_fn()
+        with self.timeline.span(f"init {name}"):
+            return init_fn()
+
+    def _run(self, name, init_fn):
+        try:
+            driver = self._init(name, init_fn)
+        except Exception as e:
+            self._failed.emit(name, str(e))
+            return
+        self._ready.emit(name, driver)
+
+    @Slot(str, object)
+    def _on_ready(self, name, driver):
+        try:
+            self.sensors[name][1](driver)
+        except Exception as e:
+            self._on_failed(name, str(e))
+            return
+        if self.timeline is not None:
+            self.timeline.mark(f"{name} live")
+        self.pending.discard(name)
+        self._check_finished()
+
+    @Slot(str, str)
+    def _on_failed(self, name, message):
+        print(f"[ERROR] {name} init failed: {message}")
+        if self.on_failed:
+            self.on_failed(name, message)
+        self.pending.discard(name)
+        self._check_finished()
+
+    def _check_finished(self):
+        shown = self.first_frame or self.started_by_timeout
+        if self._started and shown and not self.pending and not self._finished:
+            self._finished = True
+            self.finished.emit()
+
+
+class CalibrationJob(QObject):
+    """
+    Runs MPU6050.calibrate_accelerometer() on a background thread and
+    streams its progress into backend.calibrationProgress / calibrationVariance.
+    The final result ends up in backend.systemActionState.
+    """
+
+    progress = Signal(int, int, float)
+    finished = Signal(bool, str)
+
+    def __init__(self, backend, mpu):
+        super().__init__()
+        self.backend = backend
+        self.mpu = mpu
+        self._thread = None
+
+        self.progress.connect(self._on_progress)
+        self.finished.connect(self._on_finished)
+
+    def start(self):
+        if self.backend.systemActionState == "calibrating_mpu":
+            return
+
+        if self.backend.velocity > 0:
+            self.backend.sensorStatusMessage = "Car is moving, calibration rejected"
+            self._set_result("mpu_failed")
+            return
+
+        self.backend.calibrationProgress = 0.0
+        self.backend.calibrationVariance = 0.0
+        self.backend.systemActionState = "calibrating_mpu"
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self.mpu.calibrate_accelerometer(
+                progress_callback=lambda n, total, var: self.progress.emit(n, total, var)
+            )
+            self.finished.emit(True, "")
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+    @Slot(int, int, float)
+    def _on_progress(self, collected, total, variance):
+        self.backend.calibrationProgress = collected / total
+        self.backend.calibrationVariance = variance
+
+    @Slot(bool, str)
+    def _on_finished(self, ok, message):
+        if ok:
+            self._set_result("mpu_done")
+        else:
+            print("[ERROR]", message)
+            self.backend.sensorStatusMessage = message
+            self._set_result("mpu_failed")
+
+    def _set_result(self, state):
+        self.backend.systemActionState = state
+        QTimer.singleShot(
+            2000,
+            lambda: setattr(self.backend, "systemActionState", "idle")
+        )
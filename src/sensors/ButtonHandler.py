@@ -1,41 +1,42 @@
 import time
 import random
-import os
+
+from src.sensors.GPIOService import GPIOService
 
 class ButtonHandler:
     """
-    Handles two physical buttons (GPIO) or simulates them if RPi.GPIO isn't available.
+    Handles two physical buttons (GPIO) or simulates them if the GPIO character device isn't available.
     - 'next' button: switches dashboard view
     - 'extra' button: reserved for future use
-    - Shutdown is triggered if **both buttons are held for 3 seconds simultaneously**.
+    Taps, long presses and chords (e.g. both buttons held for shutdown) are
+    recognised by src/buttonGestures.py from the on_edge() events.
     """
 
-    def __init__(self, pin_next=18, pin_extra=23):
+    def __init__(self, pin_next=18, pin_extra=23, gpio=None):
         self.pins = {"next": pin_next, "extra": pin_extra}
         self.GPIO_AVAILABLE = False
         self.simulated_state = {"next": False, "extra": False}
         self.test_mode: bool = False
+        self.lines = {}
 
         try:
-            import RPi.GPIO as GPIO
-            self.GPIO = GPIO
-            self.GPIO.setmode(GPIO.BCM)
+            gpio = gpio or GPIOService.shared()
 
-            # Set up buttons with pull-ups (active LOW)
+            # Buttons with pull-ups (active LOW), contact bounce filtered by the kernel
             for name, pin in self.pins.items():
-                self.GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+                self.lines[name] = gpio.open_line(pin, bias="pull_up", debounce_ms=10)
 
             self.GPIO_AVAILABLE = True
             print(f"[INFO] Buttons initialized on GPIO {pin_next} (next), {pin_extra} (extra)")
-        except (ImportError, RuntimeError):
+        except (RuntimeError, ValueError, OSError) as e:
+            self.cleanup()
             self.test_mode = True
-            print("[INFO] RPi.GPIO not found. Running in simulation mode.")
+            print(f"[INFO] GPIO not available ({e}). Running in simulation mode.")
 
         # Debounce and long-press tracking
         self.last_press_time = {"next": 0, "extra": 0}
         self.press_start_time = {"next": 0, "extra": 0}  # Track press start times
         self.debounce_delay = 0.3  # seconds
-        self.shutdown_threshold = 3  # seconds to hold both buttons
 
     def is_pressed(self, name):
         """Check if the given button ('next' or 'extra') is pressed."""
@@ -48,7 +49,7 @@ class ButtonHandler:
 
         pressed = False
         if self.GPIO_AVAILABLE:
-            if self.GPIO.input(self.pins[name]) == self.GPIO.LOW:
+            if self.lines[name].value == 0:
                 pressed = True
         else:
             # Simulation mode: randomly trigger buttons
@@ -64,29 +65,18 @@ class ButtonHandler:
 
         return pressed
 
-    def check_for_shutdown(self):
+    def on_edge(self, callback):
         """
-        Trigger shutdown if **both buttons are pressed simultaneously** for at least shutdown_threshold seconds.
+        Call callback(name, pressed, timestamp_ns) from the GPIO thread on every
+        press and release, with the kernel timestamp of the edge. No polling needed.
         """
-        now = time.time()
-        next_pressed = self.is_pressed("next")
-        extra_pressed = self.is_pressed("extra")
-
-        # Both buttons pressed → track earliest press start
-        if next_pressed and extra_pressed:
-            start_times = [t for t in self.press_start_time.values() if t != 0]
-            if start_times and now - min(start_times) >= self.shutdown_threshold:
-                self.cleanup()
-                os.system("sudo shutdown now")
-                return True
-        else:
-            # Reset if any button released
-            for name in self.press_start_time:
-                if not self.is_pressed(name):
-                    self.press_start_time[name] = 0
-
-        return False
+        for name, line in self.lines.items():
+            # Active LOW: the falling edge is the press
+            line.subscribe(lambda pin, rising, timestamp_ns, name=name: callback(name, not rising, timestamp_ns))
 
     def cleanup(self):
-        if self.GPIO_AVAILABLE:
-            self.GPIO.cleanup()
+        # Only this driver's pins, other drivers keep theirs
+        for line in self.lines.values():
+            line.close()
+        self.lines.clear()
+        self.GPIO_AVAILABLE = False
@@ -9,13 +9,13 @@ import random
 
 class DHT11:
 
-    def __init__(self, car_pin=None, vent_pin=None):
+    def __init__(self, car_pin=None, vent_pin=None, test_mode=False):
         self.car_pin = car_pin
         self.vent_pin = vent_pin
         self.sensors = {}
-        self.test_mode = False
+        self.test_mode = test_mode
 
-        if ADAFRUIT_AVAILABLE:
+        if ADAFRUIT_AVAILABLE and not test_mode:
             
             if car_pin:
                 self._release_gpio(car_pin)
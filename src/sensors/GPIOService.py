@@ -0,0 +1,312 @@
+import os
+import select
+import threading
+import time
+
+BIAS_VALUES = (None, "pull_up", "pull_down")
+
+
+class GPIOLine:
+    """
+    One opened pin. value reads the current level, subscribe(callback) calls
+    callback(pin, rising, timestamp_ns) from the GPIO thread on every edge.
+    Closing the last GPIOLine of a pin releases the pin.
+    """
+
+    def __init__(self, service, pin):
+        self.service = service
+        self.pin = pin
+        self._callbacks = []
+        self._closed = False
+
+    @property
+    def value(self):
+        return self.service.get_value(self.pin)
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+        self.service._add_subscriber(self.pin, callback)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for callback in self._callbacks:
+            self.service._remove_subscriber(self.pin, callback)
+        self._callbacks.clear()
+        self.service._release(self.pin)
+
+
+class GPIOService:
+    """
+    Owns the GPIO pins of all drivers. Pins are requested from the GPIO
+    character device (libgpiod 2.x python bindings) with both edges enabled,
+    and one thread waits on the line file descriptors and dispatches the edge
+    events, with their kernel timestamps, to the subscribers. Nothing runs
+    while no line changes.
+
+    Pins are reference counted: the first open_line() requests a pin, the
+    close() of the last line releases it, other drivers' pins are untouched.
+    A MockChip can be passed as chip for tests and benchmarks.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """The service on the default chip, shared by all drivers."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self, chip="/dev/gpiochip0", consumer="dashboard"):
+        self.available = False
+        self.events = 0
+        self._lock = threading.Lock()
+        self._pins = {}  # pin -> {"refs", "bias", "debounce_ms", "request", "subscribers"}
+        self._thread = None
+        self._running = False
+        self._wake_r, self._wake_w = os.pipe()
+
+        if isinstance(chip, MockChip):
+            self.backend = chip
+            self.available = True
+            return
+
+        try:
+            self.backend = GpiodChip(chip, consumer)
+            self.available = True
+            print(f"[INFO] GPIO service on {chip}")
+        except Exception as e:
+            self.backend = None
+            print(f"[WARN] GPIO character device unavailable ({chip}): {e}")
+
+    # -----------------------------
+    # Pins
+    # -----------------------------
+    def open_line(self, pin, bias=None, debounce_ms=0):
+        """Open a pin as input with both edges. Raises ValueError on a bias/debounce conflict."""
+        if not self.available:
+            raise RuntimeError("GPIO service unavailable")
+        if bias not in BIAS_VALUES:
+            raise ValueError(f"Invalid bias {bias!r}, use one of {BIAS_VALUES}")
+
+        with self._lock:
+            state = self._pins.get(pin)
+            if state is None:
+                request = self.backend.request(pin, bias, debounce_ms)
+                self._pins[pin] = {
+                    "refs": 1, "bias": bias, "debounce_ms": debounce_ms,
+                    "request": request, "subscribers": [],
+                }
+            else:
+                if (state["bias"], state["debounce_ms"]) != (bias, debounce_ms):
+                    raise ValueError(
+                        f"GPIO {pin} is already open with bias={state['bias']}, "
+                        f"debounce={state['debounce_ms']} ms"
+                    )
+                state["refs"] += 1
+
+        self._ensure_thread()
+        self._wake()
+        return GPIOLine(self, pin)
+
+    def get_value(self, pin):
+        with self._lock:
+            state = self._pins.get(pin)
+            if state is None:
+                raise ValueError(f"GPIO {pin} is not open")
+            request = state["request"]
+        return self.backend.get_value(request, pin)
+
+    def open_pins(self):
+        with self._lock:
+            return {pin: state["refs"] for pin, state in self._pins.items()}
+
+    def close(self):
+        """Release every pin and stop the event thread."""
+        with self._lock:
+            for pin, state in self._pins.items():
+                self.backend.release(state["request"])
+            self._pins.clear()
+        self._running = False
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _add_subscriber(self, pin, callback):
+        with self._lock:
+            self._pins[pin]["subscribers"].append(callback)
+
+    def _remove_subscriber(self, pin, callback):
+        with self._lock:
+            state = self._pins.get(pin)
+            if state and callback in state["subscribers"]:
+                state["subscribers"].remove(callback)
+
+    def _release(self, pin):
+        with self._lock:
+            state = self._pins.get(pin)
+            if state is None:
+                return
+            state["refs"] -= 1
+            if state["refs"] > 0:
+                return
+            del self._pins[pin]
+            self.backend.release(state["request"])
+        self._wake()
+
+    # -----------------------------
+    # Event thread
+    # -----------------------------
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._event_loop, daemon=True)
+            self._thread.start()
+
+    def _wake(self):
+        os.write(self._wake_w, b"x")
+
+    def _event_loop(self):
+        while self._running:
+            with self._lock:
+                requests = {}
+                for state in self._pins.values():
+                    requests[self.backend.fileno(state["request"])] = state["request"]
+
+            # Blocks until an edge or a change of the open pins, no polling
+            try:
+                ready, _, _ = select.select([self._wake_r] + list(requests), [], [])
+            except (OSError, ValueError):
+                # A pin was released while waiting, its descriptor is gone
+                continue
+
+            for fd in ready:
+                if fd == self._wake_r:
+                    os.read(self._wake_r, 4096)
+                    continue
+                try:
+                    events = self.backend.read_events(requests[fd])
+                except (OSError, KeyError):
+                    continue
+                for pin, rising, timestamp_ns in events:
+                    self._dispatch(pin, rising, timestamp_ns)
+
+    def _dispatch(self, pin, rising, timestamp_ns):
+        self.events += 1
+        with self._lock:
+            state = self._pins.get(pin)
+            subscribers = list(state["subscribers"]) if state else []
+        for callback in subscribers:
+            try:
+                callback(pin, rising, timestamp_ns)
+            except Exception as e:
+                print(f"[ERROR] GPIO {pin} subscriber failed: {e}")
+
+
+class GpiodChip:
+    """libgpiod 2.x backend, one line request per pin."""
+
+    def __init__(self, path, consumer):
+        import gpiod
+        self.gpiod = gpiod
+        self.path = path
+        self.consumer = consumer
+        if not gpiod.is_gpiochip_device(path):
+            raise RuntimeError(f"{path} is not a GPIO chip")
+
+    def request(self, pin, bias, debounce_ms):
+        gpiod = self.gpiod
+        from datetime import timedelta
+        settings = gpiod.LineSettings(
+            direction=gpiod.line.Direction.INPUT,
+            edge_detection=gpiod.line.Edge.BOTH,
+            bias={
+                None: gpiod.line.Bias.AS_IS,
+                "pull_up": gpiod.line.Bias.PULL_UP,
+                "pull_down": gpiod.line.Bias.PULL_DOWN,
+            }[bias],
+            debounce_period=timedelta(milliseconds=debounce_ms),
+            event_clock=gpiod.line.Clock.MONOTONIC,
+        )
+        return gpiod.request_lines(self.path, consumer=self.consumer, config={pin: settings})
+
+    def release(self, request):
+        request.release()
+
+    def fileno(self, request):
+        return request.fd
+
+    def get_value(self, request, pin):
+        return 1 if request.get_value(pin) == self.gpiod.line.Value.ACTIVE else 0
+
+    def read_events(self, request):
+        rising = self.gpiod.EdgeEvent.Type.RISING_EDGE
+        return [
+            (event.line_offset, event.event_type == rising, event.timestamp_ns)
+            for event in request.read_edge_events()
+        ]
+
+
+class MockChip:
+    """
+    In-memory GPIO chip for tests and benchmarks. set_value() and pulse()
+    generate edge events exactly like the character device would.
+    """
+
+    def __init__(self, levels=None):
+        self.levels = dict(levels or {})
+        self._requests = {}  # pin -> (read fd, write fd, pending events)
+        self._lock = threading.Lock()
+
+    def request(self, pin, bias, debounce_ms):
+        if pin not in self.levels:
+            self.levels[pin] = 1 if bias == "pull_up" else 0
+        r, w = os.pipe()
+        with self._lock:
+            self._requests[pin] = (r, w, [])
+        return pin
+
+    def release(self, request):
+        with self._lock:
+            r, w, _ = self._requests.pop(request)
+        os.close(r)
+        os.close(w)
+
+    def fileno(self, request):
+        return self._requests[request][0]
+
+    def get_value(self, request, pin):
+        return self.levels[pin]
+
+    def read_events(self, request):
+        r, w, pending = self._requests[request]
+        os.read(r, 4096)
+        with self._lock:
+            events = list(pending)
+            pending.clear()
+        return events
+
+    def set_value(self, pin, value, timestamp_ns=None):
+        """Drive a pin, queueing an edge event if the level changes."""
+        value = 1 if value else 0
+        if self.levels.get(pin) == value:
+            return
+        self.levels[pin] = value
+        with self._lock:
+            if pin not in self._requests:
+                return
+            r, w, pending = self._requests[pin]
+            pending.append((pin, value == 1, timestamp_ns or time.monotonic_ns()))
+        os.write(w, b"x")
+
+    def pulse(self, pin, timestamp_ns=None, active_low=False):
+        """One press/pulse: two edges, returning the pin to its idle level."""
+        idle = 1 if active_low else 0
+        self.levels[pin] = idle
+        self.set_value(pin, 1 - idle, timestamp_ns)
+        self.set_value(pin, idle, timestamp_ns)
@@ -1,25 +1,26 @@
 import random
 
-try:
-    import RPi.GPIO as GPIO
-    RPI_AVAILABLE = True
-except ImportError:
-    RPI_AVAILABLE = False
+from src.sensors.GPIOService import GPIOService
+
 
 class LDRLM393:
-    def __init__(self, pin1=22, pin2=10):
+    def __init__(self, pin1=22, pin2=10, gpio=None):
         """
         Initializes the two light sensors.
         """
         self.pin1 = pin1
         self.pin2 = pin2
         self.test_mode = False
+        self._lines = {}
 
-        if RPI_AVAILABLE:
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setup(self.pin1, GPIO.IN)
-            GPIO.setup(self.pin2, GPIO.IN)
-        else:
+        try:
+            gpio = gpio or GPIOService.shared()
+            for pin in (self.pin1, self.pin2):
+                # The LM393 output chatters around its threshold
+                self._lines[pin] = gpio.open_line(pin, debounce_ms=50)
+        except Exception as e:
+            print(f"[LightSensor] GPIO unavailable, using simulation mode: {e}")
+            self.cleanup()
             self.test_mode = True
             
         """
@@ -36,8 +37,8 @@ class LDRLM393:
         """
         Reads light intensity (0 or 1) from a given pin.
         """
-        if RPI_AVAILABLE:
-            return GPIO.input(pin)
+        if not self.test_mode:
+            return self._lines[pin].value
         else:
             # Simulate smooth day/night transitions
             if pin == self.pin1:
@@ -47,6 +48,12 @@ class LDRLM393:
                 self._sim_light2 = 1 if random.random() > 0.4 else 0
                 return self._sim_light2
 
+    def subscribe(self, callback):
+        """Call callback() from the GPIO thread whenever one of the sensors changes."""
+        for line in self._lines.values():
+            line.subscribe(lambda pin, rising, timestamp_ns: callback())
+
     def cleanup(self):
-        if RPI_AVAILABLE:
-            GPIO.cleanup()
\ No newline at end of file
+        for line in self._lines.values():
+            line.close()
+        self._lines.clear()
@@ -1,34 +1,61 @@
 import time
 import random
 import os
+import struct
+import threading
+
+import numpy as np
 
 class MPU6050:
-    def __init__(self):
-        """Initialize the MPU6050 sensor or enable simulation mode if unavailable."""
+    def __init__(self, test_mode=False):
+        """Initialize the MPU6050 sensor or enable simulation mode if unavailable (or test_mode)."""
         self.SMBUS_AVAILABLE = False
         self.MPU_CONNECTED = False
         self.bus = None
-        self.test_mode = False
+        self.test_mode = test_mode
 
-        try:
-            import smbus2
-            self.bus = smbus2.SMBus(1)
-            self.SMBUS_AVAILABLE = True
-        except (ImportError, FileNotFoundError):
-            self.test_mode = True
-            print("[INFO] smbus not found. Running in simulation mode.")
+        if not test_mode:
+            try:
+                import smbus2
+                self.bus = smbus2.SMBus(1)
+                self.SMBUS_AVAILABLE = True
+            except (ImportError, FileNotFoundError):
+                self.test_mode = True
+                print("[INFO] smbus not found. Running in simulation mode.")
 
         # MPU6050 register addresses
         self.MPU6050_ADDRESS = 0x68
         self.PWR_MGMT_1 = 0x6B
         self.ACCEL_XOUT_H = 0x3B
         self.GYRO_XOUT_H = 0x43
+        self.SMPLRT_DIV = 0x19
+        self.CONFIG = 0x1A
+        self.FIFO_EN = 0x23
+        self.USER_CTRL = 0x6A
+        self.FIFO_COUNTH = 0x72
+        self.FIFO_R_W = 0x74
 
         self.ax_offset = 0.0
         self.ay_offset = 0.0
         self.az_offset = 0.0
         self.window_size = 10
-    
+
+        # Continuous sampling (see start_sampling)
+        self.sampling = False
+        self.sample_rate = 0
+        self.use_fifo = False
+        self.samples_total = 0
+        self.fifo_overflows = 0
+        self._ring = None
+        self._ring_index = 0
+        self._ring_count = 0
+        self._window_sum = np.zeros(3)
+        self._lock = threading.Lock()
+        self._sampling_thread = None
+        self._stop_event = threading.Event()
+        self._read_total = 0
+        self.filter_bank = None
+
         self.load_calibration()
         self.init_sensor()
 
@@ -48,9 +75,12 @@ class MPU6050:
     def read_accelerometer(self):
         """Read or simulate accelerometer data."""
         if self.SMBUS_AVAILABLE and self.MPU_CONNECTED:
-            ax = self.read_raw_data(self.ACCEL_XOUT_H + 2) / 16384.0
-            ay = self.read_raw_data(self.ACCEL_XOUT_H) / 16384.0
-            az = self.read_raw_data(self.ACCEL_XOUT_H + 4) / 16384.0
+            # One 6 byte block transaction instead of six single byte reads
+            block = self.bus.read_i2c_block_data(self.MPU6050_ADDRESS, self.ACCEL_XOUT_H, 6)
+            raw_x, raw_y, raw_z = struct.unpack(">hhh", bytes(block))
+            ax = raw_y / 16384.0
+            ay = raw_x / 16384.0
+            az = raw_z / 16384.0
         else:
             # Simulated data
             ax = random.uniform(-2, 2)
@@ -58,23 +88,64 @@ class MPU6050:
             az = random.uniform(-2, 2)
         return ax, ay, az
 
-    def calibrate_accelerometer(self, num_samples=100):
-        """Calibrate accelerometer by averaging multiple readings."""
-        ax_sum = ay_sum = az_sum = 0.0
-        for _ in range(num_samples):
-            ax, ay, az = self.read_accelerometer()
-            ax_sum += ax
-            ay_sum += ay
-            az_sum += az
+    def calibrate_accelerometer(self, num_samples=100, progress_callback=None, max_std=0.05):
+        """
+        Calibrate accelerometer by averaging multiple readings.
+        Blocks for about num_samples * 10 ms, so call it from a background thread.
+        progress_callback(collected, total, variance) is called every few samples.
+        Raises RuntimeError if the readings vary more than max_std (in g), which
+        means the car is moving.
+        """
+        mean = np.zeros(3)
+        m2 = np.zeros(3)
+        variance = 0.0
+        # Samples up to here are old; a cursor of its own so the filter bank keeps all of its samples
+        seen = self.samples_total
+        deadline = time.monotonic() + 1.0
+
+        n = 0
+        while n < num_samples:
+            if self.sampling:
+                # Take new samples from the ring buffer, the sampling thread owns the bus
+                with self._lock:
+                    block = self._copy_latest(self.samples_total - seen)
+                    seen = self.samples_total
+                if not len(block):
+                    # Not yet, wait for the sampling thread
+                    if time.monotonic() > deadline:
+                        raise RuntimeError("MPU6050 delivers no samples, calibration aborted")
+                    time.sleep(0.002)
+                    continue
+                sample = block[-1]
+            else:
+                sample = np.array(self.read_accelerometer())
+            n += 1
+            deadline = time.monotonic() + 1.0
+
+            # Welford's running mean / variance
+            delta = sample - mean
+            mean += delta / n
+            m2 += delta * (sample - mean)
+            if n > 1:
+                variance = float((m2 / (n - 1)).max())
+
+            if progress_callback and (n % 5 == 0 or n == num_samples):
+                progress_callback(n, num_samples, variance)
+
+            # Simulated samples are pure noise, only check real hardware for motion
+            if not self.test_mode and n >= 20 and variance > max_std ** 2:
+                raise RuntimeError("Car is moving, calibration rejected")
+
             time.sleep(0.01)
 
-        self.ax_offset = ax_sum / num_samples
-        self.ay_offset = ay_sum / num_samples
-        self.az_offset = az_sum / num_samples
-        self.save_calibration() 
+        self.ax_offset, self.ay_offset, self.az_offset = mean.tolist()
+        self.save_calibration()
 
     def get_calibrated_acceleration(self):
         """Return calibrated accelerometer readings with moving average filter."""
+        if self.sampling:
+            return self.get_filtered_acceleration()
+
         samples = []
         for _ in range(self.window_size):
             ax, ay, az = self.read_accelerometer()
@@ -88,6 +159,171 @@ class MPU6050:
         
         return ax_avg - self.ax_offset, ay_avg - self.ay_offset, az_avg - self.az_offset
 
+    # =====================================================
+    # ============ CONTINUOUS SAMPLING ====================
+    # =====================================================
+    def start_sampling(self, rate_hz=200, buffer_size=1024, window_size=None, use_fifo=False):
+        """
+        Sample continuously in a background thread into a preallocated ring buffer.
+        rate_hz is 100-1000 Hz. With use_fifo the chip paces the samples with its
+        sample rate divider and the thread drains the FIFO in blocks.
+        """
+        if self.sampling:
+            return
+
+        self.sample_rate = max(100, min(1000, int(rate_hz)))
+        self.window_size = window_size or max(1, int(self.sample_rate * 0.1))
+        buffer_size = max(buffer_size, self.window_size)
+
+        self._ring = np.zeros((buffer_size, 3))
+        self._ring_index = 0
+        self._ring_count = 0
+        self._window_sum[:] = 0.0
+        self.samples_total = 0
+        self._read_total = 0
+
+        hardware = self.SMBUS_AVAILABLE and self.MPU_CONNECTED
+        self.use_fifo = use_fifo and hardware
+        if hardware:
+            self._configure_sample_rate()
+
+        self._stop_event.clear()
+        self.sampling = True
+        self._sampling_thread = threading.Thread(target=self._sampling_loop, daemon=True)
+        self._sampling_thread.start()
+        print(f"[INFO] MPU6050 sampling at {self.sample_rate} Hz ({'FIFO' if self.use_fifo else 'polled'})")
+
+    def stop_sampling(self):
+        if not self.sampling:
+            return
+        self._stop_event.set()
+        if self._sampling_thread:
+            self._sampling_thread.join(timeout=1.0)
+        self._sampling_thread = None
+        self.sampling = False
+
+        if self.use_fifo:
+            try:
+                self.bus.write_byte_data(self.MPU6050_ADDRESS, self.FIFO_EN, 0x00)
+                self.bus.write_byte_data(self.MPU6050_ADDRESS, self.USER_CTRL, 0x00)
+            except Exception as e:
+                print(f"[WARN] MPU6050 FIFO disable failed: {e}")
+
+    def set_filter(self, filter_bank):
+        """Use an AccelerationFilterBank instead of the built-in moving average."""
+        self.filter_bank = filter_bank
+
+    def get_filtered_acceleration(self):
+        """
+        O(1) moving average over the last window_size samples, calibration applied.
+        With a filter bank set, the samples since the last call are filtered as one block.
+        """
+        if self.filter_bank is not None:
+            block = self.get_new_samples()
+            if len(block):
+                self.filter_bank.process(block)
+            ax, ay, az = self.filter_bank.value.tolist()
+            return ax - self.ax_offset, ay - self.ay_offset, az - self.az_offset
+
+        with self._lock:
+            count = min(self._ring_count, self.window_size)
+            if count == 0:
+                return 0.0, 0.0, 0.0
+            ax, ay, az = (self._window_sum / count).tolist()
+        return ax - self.ax_offset, ay - self.ay_offset, az - self.az_offset
+
+    def get_latest_samples(self, count):
+        """Copy of the newest `count` raw samples (oldest first) as an (n, 3) array."""
+        with self._lock:
+            return self._copy_latest(count)
+
+    def get_new_samples(self):
+        """Raw samples (oldest first) collected since the previous call, at most one ring buffer."""
+        with self._lock:
+            block = self._copy_latest(self.samples_total - self._read_total)
+            self._read_total = self.samples_total
+        return block
+
+    def _copy_latest(self, count):
+        # Caller holds _lock, so the window cannot move while it is copied
+        count = min(count, self._ring_count)
+        end = self._ring_index
+        indices = np.arange(end - count, end) % len(self._ring)
+        return self._ring[indices].copy()
+
+    def _configure_sample_rate(self):
+        """Set the DLPF (1 kHz gyro output rate), divider and, if requested, the FIFO."""
+        divider = max(0, min(255, round(1000 / self.sample_rate) - 1))
+        self.bus.write_byte_data(self.MPU6050_ADDRESS, self.CONFIG, 0x01)
+        self.bus.write_byte_data(self.MPU6050_ADDRESS, self.SMPLRT_DIV, divider)
+
+        if self.use_fifo:
+            self.bus.write_byte_data(self.MPU6050_ADDRESS, self.USER_CTRL, 0x04)  # FIFO reset
+            self.bus.write_byte_data(self.MPU6050_ADDRESS, self.USER_CTRL, 0x40)  # FIFO enable
+            self.bus.write_byte_data(self.MPU6050_ADDRESS, self.FIFO_EN, 0x08)    # accel only
+
+    def _push_sample(self, ax, ay, az):
+        """Write one sample into the ring buffer and keep the window sum up to date."""
+        with self._lock:
+            size = len(self._ring)
+            if self._ring_count >= self.window_size:
+                self._window_sum -= self._ring[(self._ring_index - self.window_size) % size]
+            row = self._ring[self._ring_index]
+            row[0] = ax
+            row[1] = ay
+            row[2] = az
+            self._window_sum += row
+
+            self._ring_index = (self._ring_index + 1) % size
+            self._ring_count = min(self._ring_count + 1, size)
+            self.samples_total += 1
+
+            # Rebuild the sum once per lap so floating point drift cannot build up
+            if self._ring_index == 0:
+                count = min(self._ring_count, self.window_size)
+                self._window_sum[:] = self._ring[size - count:].sum(axis=0)
+
+    def _sampling_loop(self):
+        period = 1.0 / self.sample_rate
+        next_time = time.perf_counter()
+
+        while not self._stop_event.is_set():
+            try:
+                if self.use_fifo:
+                    self._drain_fifo()
+                else:
+                    ax, ay, az = self.read_accelerometer()
+                    self._push_sample(ax, ay, az)
+            except Exception as e:
+                print(f"[WARN] MPU6050 sampling error: {e}")
+
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Running late: skip the missed slots instead of bursting to catch up
+                next_time = time.perf_counter()
+
+    def _drain_fifo(self):
+        """Read all complete samples from the FIFO, up to 5 per 30 byte block read."""
+        high, low = self.bus.read_i2c_block_data(self.MPU6050_ADDRESS, self.FIFO_COUNTH, 2)
+        available = (high << 8) | low
+
+        if available >= 1024:
+            # FIFO overflowed, its content is no longer aligned to samples
+            self.fifo_overflows += 1
+            self.bus.write_byte_data(self.MPU6050_ADDRESS, self.USER_CTRL, 0x44)
+            return
+
+        remaining = available - available % 6
+        while remaining > 0:
+            chunk = min(remaining, 30)
+            block = bytes(self.bus.read_i2c_block_data(self.MPU6050_ADDRESS, self.FIFO_R_W, chunk))
+            for raw_x, raw_y, raw_z in struct.iter_unpack(">hhh", block):
+                self._push_sample(raw_y / 16384.0, raw_x / 16384.0, raw_z / 16384.0)
+            remaining -= chunk
+
     def read_raw_data(self, addr):
         """Read two bytes of data from the given address."""
         high = self.bus.read_byte_data(self.MPU6050_ADDRESS, addr)
@@ -99,12 +335,16 @@ class MPU6050:
         return value
 
     def save_calibration(self):
-        """Save the calibration data to a file."""
+        """Save the calibration data to a file (atomically, a power cut keeps the old file)."""
         calibration_file = "mpu6050_calibration.txt"
-        with open(calibration_file, 'w') as f:
+        tmp_file = calibration_file + ".tmp"
+        with open(tmp_file, 'w') as f:
             f.write(f"{self.ax_offset}\n")
             f.write(f"{self.ay_offset}\n")
             f.write(f"{self.az_offset}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, calibration_file)
 
     def load_calibration(self):
         """Load calibration data from a file."""
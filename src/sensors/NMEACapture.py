@@ -0,0 +1,70 @@
+import os
+import struct
+import time
+from datetime import datetime
+
+# File layout: MAGIC, then records of (seconds since start: float64, length: uint16) + raw bytes
+MAGIC = b"NMEACAP1"
+RECORD = struct.Struct("<dH")
+
+
+class NMEACaptureWriter:
+    """
+    Tees the raw GPS serial byte stream into a timestamped capture file,
+    keeping the arrival time of every chunk so it can be replayed in real time.
+    """
+
+    def __init__(self, directory="captures", flush_interval=1.0):
+        os.makedirs(directory, exist_ok=True)
+        name = datetime.now().strftime("gps_%Y%m%d_%H%M%S.nmeacap")
+        self.path = os.path.join(directory, name)
+        self.flush_interval = flush_interval
+
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        print(f"[INFO] Capturing GPS data to {self.path}")
+
+    def write(self, chunk):
+        now = time.monotonic()
+        # uint16 length, split very large reads
+        for i in range(0, len(chunk), 0xFFFF):
+            part = chunk[i:i + 0xFFFF]
+            self._file.write(RECORD.pack(now - self._start, len(part)))
+            self._file.write(part)
+
+        if now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def read_capture(path):
+    """Yield (seconds since start, raw bytes) for every chunk in a capture file."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an NMEA capture file: {path}")
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            offset, length = RECORD.unpack(header)
+            chunk = f.read(length)
+            if len(chunk) < length:
+                # Truncated by a power cut, keep what is complete
+                return
+            yield offset, chunk
+
+
+def write_capture(path, chunks):
+    """Write a capture file from (seconds since start, raw bytes) pairs, e.g. a synthetic route."""
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for offset, chunk in chunks:
+            f.write(RECORD.pack(offset, len(chunk)))
+            f.write(chunk)
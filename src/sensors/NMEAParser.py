@@ -0,0 +1,164 @@
+from datetime import datetime, timezone
+from functools import reduce
+from operator import xor
+from zoneinfo import ZoneInfo
+
+FIX_QUALITY = {
+    0: "No Fix",
+    1: "GPS Fix",
+    2: "DGPS Fix",
+}
+
+
+def nmea_checksum(body):
+    """XOR of all characters between '$' and '*'."""
+    return reduce(xor, body.encode('ascii', errors='ignore'), 0)
+
+
+class NMEAParser:
+    """
+    Validating NMEA 0183 parser for GGA, RMC, GSV, GSA and VTG sentences.
+    Sentences from any talker ($GP, $GN, $GL, $GA, $GB, ...) are accepted.
+    parse() returns a dict with the same keys as VK162GPS._last_data.
+    """
+
+    def __init__(self, tz_name="Europe/Amsterdam", verify_checksum=True):
+        self.tz = ZoneInfo(tz_name)
+        self.verify_checksum = verify_checksum
+
+        self.sentences = 0
+        self.checksum_errors = 0
+        self.parse_errors = 0
+
+        self._handlers = {
+            "GGA": self._parse_gga,
+            "RMC": self._parse_rmc,
+            "GSV": self._parse_gsv,
+            "GSA": self._parse_gsa,
+            "VTG": self._parse_vtg,
+        }
+
+        # Satellites in view per talker, GPS + GLONASS + ... are summed
+        self._visible = {}
+        # Last sentence per type that passed the checksum
+        self._verified = {}
+        # "HH:MM" only changes once a minute, so keep the last conversion
+        self._time_key = None
+        self._time_text = None
+
+    def parse(self, sentence):
+        self.sentences += 1
+        if len(sentence) < 7 or sentence[0] != '$':
+            return {}
+
+        # Look up the handler first, unsupported sentences skip the checksum
+        kind = sentence[3:6]
+        handler = self._handlers.get(kind)
+        if handler is None:
+            return {}
+        # Only the first message of a GSV group is used, they all carry the same total
+        if kind == "GSV" and sentence.split(',', 3)[2:3] != ['1']:
+            return {}
+
+        star = sentence.find('*')
+        if star >= 0:
+            # GSA and GSV often repeat unchanged for minutes, a sentence that
+            # already passed does not need to be checked again
+            if self.verify_checksum and sentence != self._verified.get(kind):
+                try:
+                    expected = int(sentence[star + 1:star + 3], 16)
+                except ValueError:
+                    expected = -1
+                if nmea_checksum(sentence[1:star]) != expected:
+                    self.checksum_errors += 1
+                    return {}
+                self._verified[kind] = sentence
+            sentence = sentence[:star]
+        elif self.verify_checksum:
+            self.checksum_errors += 1
+            return {}
+
+        try:
+            return handler(sentence[1:3], sentence.split(','))
+        except (ValueError, IndexError):
+            self.parse_errors += 1
+            return {}
+
+    # =====================================================
+    # ================= SENTENCES =========================
+    # =====================================================
+    def _parse_gga(self, talker, parts):
+        fix = int(parts[6]) if parts[6].isdigit() else 0
+        return {
+            'fix_status': fix,
+            'fix_quality': FIX_QUALITY.get(fix, "Unknown"),
+            'satellites': int(parts[7]) if parts[7].isdigit() else 0,
+            'hdop': float(parts[8]) if parts[8] else None,
+            'altitude': float(parts[9]) if parts[9] else None,
+        }
+
+    def _parse_rmc(self, talker, parts):
+        if parts[2] != 'A':
+            # No fix, only the status is valid
+            return {'fix_status': 0, 'fix_quality': FIX_QUALITY[0], 'speed': 0.0}
+
+        data = {}
+        utc_time = parts[1]
+        utc_date = parts[9]
+        if len(utc_time) >= 6 and len(utc_date) == 6:
+            data['timestamp'] = self._local_time(utc_date, utc_time)
+
+        if parts[7]:
+            data['speed'] = float(parts[7]) * 1.852
+        if parts[8]:
+            data['course'] = float(parts[8])
+
+        data['latitude'] = self._coordinate(parts[3], parts[4] == 'S')
+        data['longitude'] = self._coordinate(parts[5], parts[6] == 'W')
+        return data
+
+    def _parse_gsv(self, talker, parts):
+        if not parts[3].isdigit():
+            return {}
+        self._visible[talker] = int(parts[3])
+        return {'satellites_visible': sum(self._visible.values())}
+
+    def _parse_gsa(self, talker, parts):
+        return {
+            'fix_type': int(parts[2]) if parts[2].isdigit() else 1,
+            'pdop': float(parts[15]) if parts[15] else None,
+            'vdop': float(parts[17]) if len(parts) > 17 and parts[17] else None,
+        }
+
+    def _parse_vtg(self, talker, parts):
+        data = {}
+        if parts[1]:
+            data['course'] = float(parts[1])
+        if len(parts) > 7 and parts[7]:
+            data['speed'] = float(parts[7])
+        return data
+
+    # =====================================================
+    # ================= HELPERS ===========================
+    # =====================================================
+    def _coordinate(self, raw, negative):
+        """ddmm.mmmm / dddmm.mmmm to decimal degrees."""
+        raw = float(raw)
+        degrees = int(raw / 100)
+        value = degrees + (raw - degrees * 100) / 60.0
+        return -value if negative else value
+
+    def _local_time(self, utc_date, utc_time):
+        key = (utc_date, utc_time[:4])
+        if key != self._time_key:
+            dt = datetime(
+                2000 + int(utc_date[4:6]),
+                int(utc_date[2:4]),
+                int(utc_date[0:2]),
+                int(utc_time[0:2]),
+                int(utc_time[2:4]),
+                tzinfo=timezone.utc
+            )
+            self._time_text = dt.astimezone(self.tz).strftime("%H:%M")
+            self._time_key = key
+        return self._time_text
@@ -1,55 +1,142 @@
+import math
 import time
 import random
 
+from src.sensors.GPIOService import GPIOService
+
+
+class RPMEstimator:
+    """
+    Estimates RPM from the periods between pulse edges.
+
+    Edge timestamps (ns) go into a fixed size ring buffer. The RPM is taken
+    from the periods of the last average_window seconds (at least one, at most
+    max_periods), after dropping periods far from their median (missed or
+    double pulses), and smoothed with a time constant of smoothing seconds.
+    """
+
+    def __init__(self, pulses_per_revolution=1, buffer_size=64, max_periods=8,
+                 average_window=0.1, outlier_tolerance=0.35, smoothing=0.05,
+                 max_rpm=9000, stall_timeout=1.0):
+        self.pulses_per_revolution = pulses_per_revolution
+        self.buffer_size = buffer_size
+        self.max_periods = max_periods
+        self.average_window_ns = int(average_window * 1e9)
+        self.outlier_tolerance = outlier_tolerance
+        self.smoothing = smoothing
+        self.stall_timeout_ns = int(stall_timeout * 1e9)
+        # Edges closer than half the redline period are contact bounce / ignition noise
+        self.min_period_ns = int(60e9 / (max_rpm * pulses_per_revolution) / 2)
+
+        self.rejected = 0
+        self._edges = [0] * buffer_size
+        self._head = 0  # total number of edges recorded
+        self._rpm = 0.0
+        self._last_read = None
+
+    def record_edge(self, t_ns):
+        """Store the timestamp of a rising edge. Called from the GPIO callback thread."""
+        head = self._head
+        if head and t_ns - self._edges[(head - 1) % self.buffer_size] < self.min_period_ns:
+            self.rejected += 1
+            return
+        # Write the slot before publishing it through _head
+        self._edges[head % self.buffer_size] = t_ns
+        self._head = head + 1
+
+    def read(self, now_ns=None):
+        """Return the current RPM estimate."""
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+
+        raw = self._raw_rpm(now_ns)
+
+        if self._last_read is None or self.smoothing <= 0:
+            self._rpm = raw
+        else:
+            dt = (now_ns - self._last_read) / 1e9
+            self._rpm += (raw - self._rpm) * (1.0 - math.exp(-dt / self.smoothing))
+        self._last_read = now_ns
+        return self._rpm
+
+    def _raw_rpm(self, now_ns):
+        head = self._head
+        count = min(head, self.buffer_size, self.max_periods + 1)
+        if count < 2:
+            return 0.0
+
+        size = self.buffer_size
+        newest = self._edges[(head - 1) % size]
+        since_edge = now_ns - newest
+        if since_edge > self.stall_timeout_ns:
+            return 0.0
+
+        # Newest periods first, at least one, stop at the averaging window
+        periods = []
+        span = 0
+        later = newest
+        for i in range(2, count + 1):
+            earlier = self._edges[(head - i) % size]
+            period = later - earlier
+            periods.append(period)
+            span += period
+            later = earlier
+            if span >= self.average_window_ns:
+                break
+
+        median = sorted(periods)[len(periods) // 2]
+        tolerance = median * self.outlier_tolerance
+        good = [p for p in periods if abs(p - median) <= tolerance] or [median]
+        period = sum(good) / len(good)
+
+        # Slowing down: no edge for longer than the period, so the period is at least that long
+        period = max(period, since_edge)
+        return 60e9 / (period * self.pulses_per_revolution)
+
+
 class RPMreader:
     """
-    Reads RPM from a GPIO pin by counting rising edges for 1 second.
+    Reads RPM from a GPIO pin by timestamping every rising edge and estimating
+    the RPM from the pulse periods (see RPMEstimator).
     Falls back to simulated RPM if GPIO is unavailable.
     """
 
-    def __init__(self, pin=17, pulses_per_revolution=1, update_interval=1.0):
+    def __init__(self, pin=17, pulses_per_revolution=1, update_interval=1.0, smoothing=0.05, gpio=None):
         self.pin = pin
         self.pulses_per_revolution = pulses_per_revolution
-        self.update_interval = update_interval
+        self.update_interval = update_interval  # simulation only
 
-        self._pulse_count = 0
+        self.estimator = RPMEstimator(pulses_per_revolution, smoothing=smoothing)
         self._rpm = 0
         self.test_mode = False
         self._last_update = time.time()
 
+        self.line = None
         try:
-            import RPi.GPIO as GPIO
-            self.GPIO = GPIO
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-            GPIO.add_event_detect(self.pin, GPIO.RISING, callback=self._pulse_callback)
+            self.line = (gpio or GPIOService.shared()).open_line(self.pin, bias="pull_down")
+            self.line.subscribe(self._pulse_callback)
             print("[RPM] GPIO initialized on pin", self.pin)
         except Exception as e:
             print(f"[RPM] GPIO unavailable, using simulation mode: {e}")
-            self.GPIO = None
             self.test_mode = True
 
-    def _pulse_callback(self, channel):
-        self._pulse_count += 1
+    def _pulse_callback(self, pin, rising, timestamp_ns):
+        # Kernel timestamp of the edge, no scheduling jitter of this thread
+        if rising:
+            self.estimator.record_edge(timestamp_ns)
 
     def read_rpm(self):
         """
-        Call this periodically (e.g. every 500ms).
-        RPM updates once per update_interval.
+        Call this periodically (20 Hz or faster for responsive shift lights).
         """
-        now = time.time()
-        elapsed = now - self._last_update
-
-        if elapsed >= self.update_interval:
-            pulses = self._pulse_count
-            self._pulse_count = 0
-            self._last_update = now
-
-            if self.test_mode:
+        if self.test_mode:
+            now = time.time()
+            if now - self._last_update >= self.update_interval:
+                self._last_update = now
                 self._rpm = self._simulate_rpm()
-            else:
-                self._rpm = int((pulses / self.pulses_per_revolution) * 60)
+            return self._rpm
 
+        self._rpm = int(round(self.estimator.read()))
         return self._rpm
 
     def _simulate_rpm(self):
@@ -60,5 +147,6 @@ class RPMreader:
         return int(self._rpm + (target - self._rpm) * 0.2)
 
     def cleanup(self):
-        if self.GPIO:
-            self.GPIO.cleanup(self.pin)
+        if self.line:
+            self.line.close()
+            self.line = None
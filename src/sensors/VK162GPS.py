@@ -2,16 +2,32 @@ import serial
 import time
 import random
 import glob
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
+import threading
+from types import MappingProxyType
+from datetime import datetime
+
+from src.sensors.NMEAParser import NMEAParser
+from src.sensors.NMEACapture import NMEACaptureWriter, read_capture
 
 
 class VK162GPS:
-    def __init__(self, port=None, baudrate=9600, test_mode=False):
+    def __init__(self, port=None, baudrate=9600, test_mode=False,
+                 capture_dir=None, replay_file=None, replay_speed=1.0):
+        """
+        capture_dir: tee the raw serial bytes into a capture file in this folder.
+        replay_file: use a capture file as the GPS source instead of the serial port,
+                     at replay_speed times real time (0 = as fast as possible).
+        """
         self.port = port
         self.baudrate = baudrate
         self.test_mode = test_mode
         self.ser = None
+        self.parser = NMEAParser()
+        self.capture_dir = capture_dir
+        self.replay_file = replay_file
+        self.replay_speed = replay_speed
+        self.replay_done = False
+        self._capture = None
 
         # Last known GPS data
         self._last_data = {
@@ -23,9 +39,32 @@ class VK162GPS:
             'fix_quality': "No Fix",
             'satellites': 0,           
             'satellites_visible': 0, 
-            'hdop': None
+            'hdop': None,
+            'course': None,
+            'altitude': None,
+            'fix_type': 1,
+            'pdop': None,
+            'vdop': None
         }
 
+        # Reader thread state (see start_reader)
+        self.on_fix = None
+        self.reader_running = False
+        self._fix = None
+        self._epoch = {}
+        self._epoch_no_fix = False
+        self._seen_gga = False
+        self._rx_buffer = bytearray()
+        self._lock = threading.Lock()
+        self._reader_thread = None
+        self._stop_event = threading.Event()
+
+        if replay_file:
+            self.test_mode = False
+            speed = f"{replay_speed}x" if replay_speed > 0 else "maximum speed"
+            print(f"[INFO] Replaying GPS capture {replay_file} at {speed}")
+            return
+
         # Auto-detect GPS
         if not port and not test_mode:
             ports = glob.glob('/dev/ttyACM*')
@@ -49,6 +88,8 @@ class VK162GPS:
         while time.time() - start < 2.0:
             if self.ser and self.ser.in_waiting:
                 print("[INFO] GPS is responding")
+                if capture_dir:
+                    self._capture = NMEACaptureWriter(capture_dir)
                 return
             time.sleep(0.1)
 
@@ -59,74 +100,7 @@ class VK162GPS:
     # ================= NMEA PARSING ======================
     # =====================================================
     def parse_nmea_sentence(self, sentence):
-        data = {}
-
-        if '*' in sentence:
-            sentence = sentence.split('*')[0]
-
-        parts = sentence.split(',')
-
-        try:
-            # ---------- GGA (fix + satellites used) ----------
-            if parts[0] == "$GPGGA":
-                fix = int(parts[6]) if parts[6].isdigit() else 0
-                data['fix_status'] = fix
-
-                fix_map = {
-                    0: "No Fix",
-                    1: "GPS Fix",
-                    2: "DGPS Fix"
-                }
-                data['fix_quality'] = fix_map.get(fix, "Unknown")
-
-                data['satellites'] = int(parts[7]) if parts[7].isdigit() else 0
-                data['hdop'] = float(parts[8]) if parts[8] else None
-
-            # ---------- GSV (satellites visible) ----------
-            elif parts[0] == "$GPGSV":
-                if parts[3].isdigit():
-                    data['satellites_visible'] = int(parts[3])
-
-            # ---------- RMC (position + speed) ----------
-            elif parts[0] == "$GPRMC" and parts[2] == 'A':
-                utc_time = parts[1]
-                utc_date = parts[9]
-
-                if len(utc_time) >= 6 and len(utc_date) == 6:
-                    dt = datetime(
-                        2000 + int(utc_date[4:6]),
-                        int(utc_date[2:4]),
-                        int(utc_date[0:2]),
-                        int(utc_time[0:2]),
-                        int(utc_time[2:4]),
-                        int(utc_time[4:6]),
-                        tzinfo=timezone.utc
-                    )
-                    data['timestamp'] = dt.astimezone(
-                        ZoneInfo("Europe/Amsterdam")
-                    ).strftime("%H:%M")
-
-                if parts[7]:
-                    data['speed'] = float(parts[7]) * 1.852
-
-                lat_raw = float(parts[3])
-                lon_raw = float(parts[5])
-
-                lat = int(lat_raw / 100) + (lat_raw % 100) / 60.0
-                lon = int(lon_raw / 100) + (lon_raw % 100) / 60.0
-
-                if parts[4] == 'S':
-                    lat = -lat
-                if parts[6] == 'W':
-                    lon = -lon
-
-                data['latitude'] = lat
-                data['longitude'] = lon
-
-        except Exception:
-            pass
-
-        return data
+        return self.parser.parse(sentence)
 
     # =====================================================
     # ================= MAIN UPDATE =======================
@@ -146,30 +120,161 @@ class VK162GPS:
             }
             return self._last_data
 
-        start = time.time()
-        while time.time() - start < 0.05:
-            if not self.ser or not self.ser.in_waiting:
-                break
+        if self.reader_running:
+            return self._fix or MappingProxyType(dict(self._last_data))
+
+        # Polled mode: parse everything that arrived since the last call
+        try:
+            if self.ser and self.ser.in_waiting:
+                self._on_serial_bytes(self.ser.read(self.ser.in_waiting))
+        except Exception:
+            pass
+
+        return self._last_data
+
+    # =====================================================
+    # ================= READER THREAD =====================
+    # =====================================================
+    def start_reader(self, on_fix=None):
+        """
+        Let a dedicated thread own the serial port. on_fix(snapshot) is called
+        from that thread with an immutable copy of the GPS data as soon as the
+        RMC + GGA sentences of one receiver epoch are complete.
+        Returns False in test mode (keep polling get_data() instead).
+        """
+        if self.reader_running:
+            return False
+
+        if self.replay_file:
+            target = self._replay_loop
+        elif self.test_mode or not self.ser:
+            return False
+        else:
+            target = self._reader_loop
+            self.ser.timeout = 0.1  # blocking bulk reads, short enough to notice stop
 
+        self.on_fix = on_fix
+        self._stop_event.clear()
+        self.reader_running = True
+        self._reader_thread = threading.Thread(target=target, daemon=True)
+        self._reader_thread.start()
+        print("[INFO] GPS reader thread started")
+        return True
+
+    def stop_reader(self):
+        if not self.reader_running:
+            return
+        self._stop_event.set()
+        if self._reader_thread:
+            self._reader_thread.join(timeout=1.0)
+        self._reader_thread = None
+        self.reader_running = False
+
+    def _reader_loop(self):
+        while not self._stop_event.is_set():
             try:
-                line = self.ser.readline().decode('ascii', errors='ignore').strip()
-                if not line.startswith('$'):
-                    continue
+                # Everything that is waiting, or block (up to the timeout) for the next byte
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except Exception as e:
+                print(f"[ERROR] GPS read failed: {e}")
+                time.sleep(0.5)
+                continue
 
-                parsed = self.parse_nmea_sentence(line)
-                for key, value in parsed.items():
-                    if value is not None:
-                        self._last_data[key] = value
+            if chunk:
+                self._on_serial_bytes(chunk)
+
+    def _replay_loop(self):
+        """Feed a capture file through the same path as the serial reader."""
+        start = time.monotonic()
+        try:
+            for offset, chunk in read_capture(self.replay_file):
+                if self._stop_event.is_set():
+                    return
+                if self.replay_speed > 0:
+                    delay = start + offset / self.replay_speed - time.monotonic()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        return
+                self.feed(chunk)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] GPS replay failed: {e}")
 
-            except Exception:
+        self.replay_done = True
+        print("[INFO] GPS replay finished")
+
+    def _on_serial_bytes(self, chunk):
+        if self._capture:
+            self._capture.write(chunk)
+        self.feed(chunk)
+
+    def feed(self, chunk):
+        """Append raw serial bytes and handle every complete NMEA line in them."""
+        buf = self._rx_buffer
+        buf += chunk
+
+        start = 0
+        while True:
+            end = buf.find(b'\n', start)
+            if end < 0:
                 break
+            line = buf[start:end].decode('ascii', errors='ignore').strip()
+            start = end + 1
+            if line.startswith('$'):
+                self._handle_sentence(line)
 
-        return self._last_data
+        if start:
+            del buf[:start]
+        if len(buf) > 4096:
+            # No line end in sight, this is noise
+            buf.clear()
+
+    def _handle_sentence(self, line):
+        parsed = self.parse_nmea_sentence(line)
+        # Bad checksum or parse error: the sentence tells nothing
+        if not parsed:
+            return
+        with self._lock:
+            for key, value in parsed.items():
+                if value is not None:
+                    self._last_data[key] = value
+
+        kind = line[3:6]
+        if kind not in ("RMC", "GGA"):
+            return
+
+        fields = line.split(',', 2)
+        self._epoch[kind] = fields[1] if len(fields) > 1 else ""
+        if kind == "GGA":
+            self._seen_gga = True
+        # RMC status V or GGA fix quality 0
+        if parsed.get('fix_status') == 0:
+            self._epoch_no_fix = True
+
+        # Epoch complete when RMC and GGA carry the same UTC time,
+        # or on every RMC for receivers that do not send GGA at all
+        complete = self._epoch.get("RMC") == self._epoch.get("GGA") or (kind == "RMC" and not self._seen_gga)
+        if not complete:
+            return
+
+        self._epoch.clear()
+        no_fix, self._epoch_no_fix = self._epoch_no_fix, False
+        with self._lock:
+            snapshot = dict(self._last_data)
+            if no_fix:
+                # Publish the lost fix, without the last position and speed
+                snapshot.update(latitude=None, longitude=None, course=None, speed=0.0)
+            snapshot['fix_time'] = time.monotonic()
+            self._fix = MappingProxyType(snapshot)
+        if self.on_fix:
+            self.on_fix(self._fix)
 
     # =====================================================
     # ================= CLEANUP ===========================
     # =====================================================
     def close(self):
+        self.stop_reader()
+        if self._capture:
+            self._capture.close()
+            self._capture = None
         if self.ser:
             self.ser.close()
             self.ser = None
\ No newline at end of file
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def process_age():
+    """Seconds since the process started (Linux only, 10 ms resolution), None elsewhere."""
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name may contain spaces, the fields after it do not
+            started_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - started_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimeline:
+    """
+    Where the boot time goes. Spans (start, end, thread) and marks in seconds
+    since the timeline was created; main.py creates it before its own imports.
+    The time the interpreter needed before that is the "python" span, if the
+    platform can tell. Thread safe, sensors are brought up in parallel.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events = []  # (name, start, end, thread)
+        self._lock = threading.Lock()
+        age = process_age()
+        if age is not None:
+            self.events.append(("python", -age, 0.0, threading.current_thread().name))
+
+    def now(self):
+        return time.perf_counter() - self.started
+
+    def add(self, name, start, end=None):
+        with self._lock:
+            self.events.append((name, start, start if end is None else end, threading.current_thread().name))
+
+    def mark(self, name):
+        self.add(name, self.now())
+
+    @contextmanager
+    def span(self, name):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add(name, start, self.now())
+
+    def snapshot(self):
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event[1])
+        return [
+            {"name": name, "start": round(start, 4), "end": round(end, 4), "thread": thread}
+            for name, start, end, thread in events
+        ]
+
+    def format_report(self):
+        """One line per event in time order: start, end and duration in seconds, thread."""
+        lines = [f"{'start':>8}{'end':>8}{'took':>8}  {'thread':<16}event"]
+        for event in self.snapshot():
+            took = event["end"] - event["start"]
+            took = f"{took:.3f}" if took else ""  # empty for marks
+            lines.append(
+                f"{event['start']:>8.3f}{event['end']:>8.3f}{took:>8}  {event['thread']:<16}{event['name']}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
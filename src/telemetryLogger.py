@@ -0,0 +1,179 @@
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Segment file layout:
+#   MAGIC, HEADER (length of the channel table, wall clock and monotonic time at the segment start),
+#   channel table (JSON list of names, id = index)
+#   blocks: BLOCK header (marker, record count, first and last timestamp) + count RECORD_DTYPE records
+# Timestamps are time.monotonic(), the wall clock of a Pi without RTC jumps when NTP
+# syncs. The block headers double as a sparse time index for the reader (src/telemetryReader.py).
+MAGIC = b"TLOG0002"
+HEADER = struct.Struct("<Idd")
+BLOCK = struct.Struct("<4sIdd")
+BLOCK_MARKER = b"BLK1"
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("channel", "<u2"), ("value", "<f8")])
+
+FSYNC_POLICIES = ("block", "interval", "never")
+
+
+class TelemetryLogger:
+    """
+    Append-only binary log of telemetry samples (monotonic time, channel id, value).
+    Every segment stores one wall clock anchor, the reader converts with it.
+
+    log() only stores the sample in a preallocated NumPy block; full blocks
+    (or a partial one at the first sample after flush_interval seconds) are
+    handed to a writer thread that appends them to the current segment file,
+    so the caller never waits for the SD card. Segments rotate at
+    max_segment_bytes.
+
+    fsync policy: "block" after every block, "interval" at most every
+    fsync_interval seconds, "never" leaves it to the OS.
+    """
+
+    def __init__(self, directory="logs", channels=(), block_records=4096,
+                 max_segment_bytes=16 * 1024 * 1024, fsync="interval",
+                 fsync_interval=10.0, flush_interval=5.0, max_queued_blocks=64):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy {fsync!r}, use one of {FSYNC_POLICIES}")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.channels = list(channels)
+        self.block_records = block_records
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.flush_interval = flush_interval
+
+        self.records = 0
+        self.blocks_written = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.segments = []
+
+        self._ids = {name: i for i, name in enumerate(self.channels)}
+        self._free = queue.SimpleQueue()
+        # Spare blocks, so a handoff does not allocate while the writer is busy
+        for _ in range(2):
+            self._free.put(np.empty(block_records, dtype=RECORD_DTYPE))
+        self._queue = queue.Queue(maxsize=max_queued_blocks)
+        self._block = self._new_block()
+        self._count = 0
+        self._flush_deadline = time.monotonic() + flush_interval
+
+        self._name = datetime.now().strftime("drive_%Y%m%d_%H%M%S")
+        self._file = None
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+        print(f"[INFO] Logging telemetry to {directory}/{self._name}_*.tlog")
+
+    # -----------------------------
+    # Producer side (caller's thread)
+    # -----------------------------
+    def log(self, name, value, t=None):
+        """Append a sample of a named channel; non-numeric values are ignored."""
+        channel = self._ids.get(name)
+        if channel is None or value is None or isinstance(value, str):
+            return
+        self.append(channel, value, t)
+
+    def append(self, channel, value, t=None):
+        block = self._block
+        i = self._count
+        block[i] = (time.monotonic() if t is None else t, channel, value)
+        self._count = i + 1
+        self.records += 1
+
+        # The deadline is checked on every sample, at a low sample rate a
+        # partial block would otherwise wait far longer than flush_interval
+        if self._count == self.block_records or time.monotonic() >= self._flush_deadline:
+            self._handoff()
+
+    def flush(self):
+        """Hand the partial block to the writer now."""
+        if self._count:
+            self._handoff()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+    def _handoff(self):
+        block, count = self._block, self._count
+        self._block = self._new_block()
+        self._count = 0
+        self._flush_deadline = time.monotonic() + self.flush_interval
+        try:
+            self._queue.put_nowait((block, count))
+        except queue.Full:
+            # SD card stalled for a long time: lose data, never the UI
+            self.dropped += count
+            self._free.put(block)
+
+    def _new_block(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.empty(self.block_records, dtype=RECORD_DTYPE)
+
+    # -----------------------------
+    # Writer thread
+    # -----------------------------
+    def _writer_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            block, count = item
+            try:
+                self._write_block(block[:count])
+            except OSError as e:
+                self.dropped += count
+                print(f"[ERROR] Telemetry log write failed: {e}")
+            self._free.put(block)
+
+        if self._file:
+            self._sync(force=True)
+            self._file.close()
+            self._file = None
+
+    def _write_block(self, records):
+        if self._file is None or self._file.tell() >= self.max_segment_bytes:
+            self._open_segment()
+
+        header = BLOCK.pack(BLOCK_MARKER, len(records), records["t"][0], records["t"][-1])
+        data = header + records.tobytes()
+        self._file.write(data)
+        self._file.flush()
+        self.blocks_written += 1
+        self.bytes_written += len(data)
+        self._sync()
+
+    def _open_segment(self):
+        if self._file:
+            self._sync(force=True)
+            self._file.close()
+
+        path = os.path.join(self.directory, f"{self._name}_{len(self.segments):03d}.tlog")
+        self._file = open(path, "wb")
+        table = json.dumps(self.channels).encode("utf-8")
+        self._file.write(MAGIC + HEADER.pack(len(table), time.time(), time.monotonic()) + table)
+        self.segments.append(path)
+
+    def _sync(self, force=False):
+        if self.fsync == "never" and not force:
+            return
+        now = time.monotonic()
+        if force or self.fsync == "block" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
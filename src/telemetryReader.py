@@ -0,0 +1,310 @@
+"""
+Reader for the telemetry logs written by src/telemetryLogger.py.
+
+Segment files are memory-mapped and only the block headers are parsed when
+a log is opened; they form a sparse time index, so reading a time range is
+a bisect plus NumPy views of the blocks in that range. Samples are never
+turned into Python objects. The index is in the logged monotonic time, the
+wall clock anchor of the last segment turns it into unix time.
+
+Export a drive (any segment of it) to CSV or GPX:
+    python -m src.telemetryReader logs/drive_20250101_120000_000.tlog --csv drive.csv
+    python -m src.telemetryReader logs/drive_20250101_120000_000.tlog --gpx drive.gpx --start 600 --end 1200
+"""
+import argparse
+import bisect
+import glob
+import json
+import mmap
+import os
+import re
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.telemetryLogger import MAGIC, HEADER, BLOCK, BLOCK_MARKER, RECORD_DTYPE
+
+SEGMENT_PATTERN = re.compile(r"^(.*)_(\d{3})\.tlog$")
+
+
+class TelemetrySegment:
+    """One memory-mapped segment file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic = self._mm[:len(MAGIC)]
+        if magic != MAGIC:
+            self.close()
+            if magic[:4] == MAGIC[:4]:
+                raise ValueError(f"Unsupported telemetry log version {magic.decode('ascii', 'replace')}: {path}")
+            raise ValueError(f"Not a telemetry log: {path}")
+
+        pos = len(MAGIC)
+        table_length, wall_time, monotonic_time = HEADER.unpack_from(self._mm, pos)
+        # Add to a logged timestamp for unix time
+        self.wall_offset = wall_time - monotonic_time
+        pos += HEADER.size
+        self.channels = json.loads(self._mm[pos:pos + table_length].decode("utf-8"))
+        pos += table_length
+
+        # Block index: first/last timestamp, record offset and count per block
+        self.t_first, self.t_last, self.offsets, self.counts = [], [], [], []
+        size = len(self._mm)
+        while pos + BLOCK.size <= size:
+            marker, count, t_first, t_last = BLOCK.unpack_from(self._mm, pos)
+            if marker != BLOCK_MARKER:
+                print(f"[WARN] {path}: corrupt block at byte {pos}, ignoring the rest")
+                break
+            pos += BLOCK.size
+            # The last block of a segment cut off by a power loss is partial
+            available = (size - pos) // RECORD_DTYPE.itemsize
+            if available < count:
+                count = available
+                if count:
+                    t_last = float(self._block(pos, count)["t"][-1])
+            if count:
+                self.t_first.append(t_first)
+                self.t_last.append(t_last)
+                self.offsets.append(pos)
+                self.counts.append(count)
+            pos += count * RECORD_DTYPE.itemsize
+
+    @property
+    def records(self):
+        return sum(self.counts)
+
+    def blocks(self, start=None, end=None):
+        """Record arrays of the blocks overlapping [start, end] (logged time), views into the file."""
+        first = 0 if start is None else bisect.bisect_left(self.t_last, start)
+        last = len(self.t_first) if end is None else bisect.bisect_right(self.t_first, end)
+        for i in range(first, last):
+            yield self._block(self.offsets[i], self.counts[i])
+
+    def _block(self, offset, count):
+        return np.frombuffer(self._mm, dtype=RECORD_DTYPE, count=count, offset=offset)
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # A caller still holds a view, the map goes with it
+                pass
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TelemetryLog:
+    """
+    All segments of one drive, read as a single time series. Channel ids of
+    the segments are mapped by name, so segments with different channel
+    tables can be combined.
+
+    Times in and out are unix time: the logged monotonic time plus the wall
+    clock offset of the last segment, the one most likely taken after the
+    clock was set. One offset for the whole drive keeps it monotonic.
+    """
+
+    def __init__(self, paths):
+        if isinstance(paths, str):
+            paths = find_segments(paths)
+        if not paths:
+            raise ValueError("No telemetry log segments given")
+
+        self.segments = [TelemetrySegment(path) for path in sorted(paths)]
+        self.channels = []
+        for segment in self.segments:
+            self.channels += [name for name in segment.channels if name not in self.channels]
+        self.wall_offset = self.segments[-1].wall_offset
+
+    @property
+    def records(self):
+        return sum(segment.records for segment in self.segments)
+
+    @property
+    def start_time(self):
+        first = min((s.t_first[0] for s in self.segments if s.t_first), default=None)
+        return None if first is None else first + self.wall_offset
+
+    @property
+    def end_time(self):
+        last = max((s.t_last[-1] for s in self.segments if s.t_last), default=None)
+        return None if last is None else last + self.wall_offset
+
+    def read(self, names=None, start=None, end=None):
+        """
+        Return {channel name: (timestamps, values)} as float64 arrays for the
+        samples in [start, end] (unix time, None = open ended).
+        """
+        names = list(self.channels if names is None else names)
+        for name in names:
+            if name not in self.channels:
+                raise KeyError(f"Unknown channel {name!r}, the log has {self.channels}")
+
+        # The index and the records are in logged time
+        start = None if start is None else start - self.wall_offset
+        end = None if end is None else end - self.wall_offset
+        parts = {name: [] for name in names}
+        for segment in self.segments:
+            ids = {segment.channels.index(name): name for name in names if name in segment.channels}
+            if not ids:
+                continue
+            wanted = np.array(sorted(ids), dtype=np.uint16)
+            for block in segment.blocks(start, end):
+                mask = np.isin(block["channel"], wanted)
+                if start is not None:
+                    mask &= block["t"] >= start
+                if end is not None:
+                    mask &= block["t"] <= end
+                selected = block[mask]
+                for channel_id, name in ids.items():
+                    parts[name].append(selected[selected["channel"] == channel_id])
+
+        result = {}
+        for name, chunks in parts.items():
+            records = np.concatenate(chunks) if chunks else np.empty(0, dtype=RECORD_DTYPE)
+            result[name] = (records["t"] + self.wall_offset, records["value"].astype(np.float64))
+        return result
+
+    def channel(self, name, start=None, end=None):
+        """(timestamps, values) of one channel."""
+        return self.read([name], start, end)[name]
+
+    def resample(self, names=None, interval=1.0, start=None, end=None):
+        """
+        Channels on a common time grid of interval seconds, each holding its
+        last value (NaN before its first sample). Returns (grid, {name: values}).
+        """
+        series = self.read(names, start, end)
+        start = self.start_time if start is None else start
+        end = self.end_time if end is None else end
+        if start is None or end is None:
+            return np.empty(0), {name: np.empty(0) for name in series}
+
+        grid = np.arange(start, end + interval / 2, interval)
+        return grid, {name: sample_and_hold(t, v, grid) for name, (t, v) in series.items()}
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+
+
+def find_segments(path):
+    """All segment files of the drive that the segment at path belongs to."""
+    match = SEGMENT_PATTERN.match(path)
+    if not match:
+        return [path]
+    return sorted(glob.glob(glob.escape(match.group(1)) + "_[0-9][0-9][0-9].tlog"))
+
+
+def sample_and_hold(t, values, grid):
+    """Value of a (sorted) series at every grid time, NaN before its first sample."""
+    index = np.searchsorted(t, grid, side="right") - 1
+    held = np.full(len(grid), np.nan)
+    valid = index >= 0
+    held[valid] = values[index[valid]]
+    return held
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def export_csv(log, path, names=None, interval=1.0, start=None, end=None):
+    """
+    Write the channels as CSV. With an interval: one row per interval with a
+    column per channel; interval 0: every sample as a (time, channel, value) row.
+    Returns the number of rows.
+    """
+    names = list(log.channels if names is None else names)
+    with open(path, "w", newline="") as f:
+        if interval:
+            grid, values = log.resample(names, interval, start, end)
+            f.write(",".join(["time"] + names) + "\n")
+            table = np.column_stack([grid] + [values[name] for name in names])
+            np.savetxt(f, table, delimiter=",", fmt=["%.3f"] + ["%.10g"] * len(names))
+            return len(grid)
+
+        series = log.read(names, start, end)
+        f.write("time,channel,value\n")
+        rows = 0
+        for name in names:
+            t, v = series[name]
+            np.savetxt(f, np.column_stack([t, v]), fmt=f"%.3f,{name},%.10g")
+            rows += len(t)
+        return rows
+
+
+def export_gpx(log, path, interval=0.0, start=None, end=None):
+    """
+    Write the GPS track (latitude/longitude channels) as GPX, one point per
+    fix or, with an interval, at most one per interval. Returns the number of points.
+    """
+    series = log.read(["latitude", "longitude"], start, end)
+    t, lat = series["latitude"]
+    if interval and len(t):
+        grid = np.arange(t[0], t[-1] + interval / 2, interval)
+        keep = np.unique(np.searchsorted(t, grid, side="right") - 1)
+        t, lat = t[keep], lat[keep]
+    lon = sample_and_hold(*series["longitude"], t)
+    valid = ~np.isnan(lon)
+    t, lat, lon = t[valid], lat[valid], lon[valid]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<gpx version="1.1" creator="dashboard-peugeot-106" xmlns="http://www.topografix.com/GPX/1/1">\n')
+        f.write(f"  <trk><name>{os.path.basename(log.segments[0].path)}</name><trkseg>\n")
+        for point_t, point_lat, point_lon in zip(t.tolist(), lat.tolist(), lon.tolist()):
+            stamp = datetime.fromtimestamp(point_t, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            f.write(f'    <trkpt lat="{point_lat:.7f}" lon="{point_lon:.7f}"><time>{stamp}</time></trkpt>\n')
+        f.write("  </trkseg></trk>\n</gpx>\n")
+    return len(t)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a recorded telemetry log and export it to CSV/GPX.")
+    parser.add_argument("log", nargs="+", help="segment file(s); one segment selects its whole drive")
+    parser.add_argument("--start", type=float, help="seconds from the start of the drive")
+    parser.add_argument("--end", type=float, help="seconds from the start of the drive")
+    parser.add_argument("--channels", help="comma separated channel names (default: all)")
+    parser.add_argument("--csv", help="write the channels to this CSV file")
+    parser.add_argument("--gpx", help="write the GPS track to this GPX file")
+    parser.add_argument("--interval", type=float,
+                        help="downsample to one row/point per interval seconds, 0 = every sample "
+                             "(default: 1 for CSV, 0 for GPX)")
+    args = parser.parse_args()
+
+    opened = time.perf_counter()
+    log = TelemetryLog(find_segments(args.log[0]) if len(args.log) == 1 else args.log)
+    origin = log.start_time
+    if origin is None:
+        print("[WARN] The log is empty")
+        return
+
+    print(f"[INFO] {len(log.segments)} segment(s), {log.records} records, "
+          f"{log.end_time - origin:.0f} s, opened in {time.perf_counter() - opened:.3f} s")
+    print(f"[INFO] Channels: {', '.join(log.channels)}")
+
+    start = None if args.start is None else origin + args.start
+    end = None if args.end is None else origin + args.end
+    names = args.channels.split(",") if args.channels else None
+
+    if args.csv:
+        began = time.perf_counter()
+        interval = 1.0 if args.interval is None else args.interval
+        rows = export_csv(log, args.csv, names, interval, start, end)
+        print(f"[INFO] Wrote {rows} rows to {args.csv} in {time.perf_counter() - began:.3f} s")
+    if args.gpx:
+        began = time.perf_counter()
+        points = export_gpx(log, args.gpx, args.interval or 0.0, start, end)
+        print(f"[INFO] Wrote {points} track points to {args.gpx} in {time.perf_counter() - began:.3f} s")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Property
+
+
+class Channel:
+    """
+    One telemetry value exposed to QML. Changes smaller than deadband
+    (numeric channels) are not published, they would not change the display.
+    log=False keeps derived values (e.g. the predicted map position) out of
+    the telemetry log.
+    """
+
+    def __init__(self, type, default, deadband=0.0, log=True):
+        self.type = type
+        self.default = default
+        self.deadband = deadband
+        self.log = log
+
+
+class TelemetryState(QObject):
+    """
+    Holds the telemetry channels declared in CHANNELS (see telemetry_class()).
+
+    Writes only mark a channel dirty; the latest value of every dirty channel
+    is published once per flush interval (one frame by default). A flush
+    emits the <name>Changed signal of each channel that actually changed
+    (outside its deadband) and one telemetryChanged(list of names), so a
+    sensor tick writing a dozen values costs one pass over the bindings.
+
+    Every write (before deadbands) of a logged channel is also passed to
+    logger.log() when a TelemetryLogger is attached.
+    """
+
+    CHANNELS = {}
+
+    telemetryChanged = Signal(list)
+
+    def __init__(self, flush_interval_ms=16):
+        super().__init__()
+        self._values = {name: channel.default for name, channel in self.CHANNELS.items()}
+        self._pending = {}
+        self.logger = None
+
+        self.writes = 0
+        self.flushes = 0
+        self.suppressed = 0
+
+        # Only runs while there are pending writes
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setTimerType(Qt.PreciseTimer)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    @property
+    def flush_interval_ms(self):
+        return self._flush_timer.interval()
+
+    @flush_interval_ms.setter
+    def flush_interval_ms(self, interval):
+        self._flush_timer.setInterval(interval)
+
+    def value(self, name):
+        """Published value of a channel."""
+        return self._values[name]
+
+    def write(self, name, value):
+        self.writes += 1
+        self._pending[name] = value
+        if self.logger is not None and self.CHANNELS[name].log:
+            self.logger.log(name, value)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Publish the pending writes now."""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        dirty = []
+        for name, value in pending.items():
+            old = self._values[name]
+            if value == old:
+                continue
+            deadband = self.CHANNELS[name].deadband
+            if deadband and old is not None and value is not None and abs(value - old) < deadband:
+                self.suppressed += 1
+                continue
+            self._values[name] = value
+            dirty.append(name)
+
+        self.flushes += 1
+        if not dirty:
+            return
+        for name in dirty:
+            getattr(self, name + "Changed").emit()
+        self.telemetryChanged.emit(dirty)
+
+
+def telemetry_class(class_name, channels, base=TelemetryState):
+    """Build a TelemetryState subclass with a Qt property + notify signal per channel."""
+    attrs = {"CHANNELS": dict(base.CHANNELS, **channels)}
+    for name, channel in channels.items():
+        notify = Signal()
+        attrs[name + "Changed"] = notify
+        attrs[name] = Property(
+            channel.type,
+            lambda self, name=name: self._values[name],
+            lambda self, value, name=name: self.write(name, value),
+            notify=notify,
+        )
+    return type(class_name, (base,), attrs)
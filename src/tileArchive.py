@@ -0,0 +1,171 @@
+"""
+Packed map tile archive.
+
+Stores a whole XYZ tile tree (<zoom>/<x>/<y>.png) in a single file, so the
+SD card holds one file per map instead of thousands of small ones. Every zoom
+level has a dense (x, y) index, looking up a tile is a multiplication and one
+struct read in the memory-mapped file.
+
+Build an archive from an existing tile tree:
+    python -m src.tileArchive src/dashboardGUI/lib/mapNL src/dashboardGUI/lib/mapNL.tiles
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+
+# File layout:
+#   MAGIC, HEADER (number of zoom levels)
+#   ZOOM entry per zoom level (zoom, first x, first y, columns, rows, offset of its index)
+#   per zoom level: columns * rows INDEX entries (offset, length), row-major, length 0 = no tile
+#   tile data
+MAGIC = b"TILEPAK1"
+HEADER = struct.Struct("<H")
+ZOOM = struct.Struct("<HiiIIQ")
+INDEX = struct.Struct("<QI")
+
+ARCHIVE_EXTENSION = ".tiles"
+
+
+class TileArchive:
+    """Read-only, memory-mapped tile archive."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a tile archive: {path}")
+
+        # zoom -> (first x, first y, columns, rows, index offset)
+        self._zooms = {}
+        pos = len(MAGIC)
+        (count,) = HEADER.unpack_from(self._mm, pos)
+        pos += HEADER.size
+        for _ in range(count):
+            zoom, min_x, min_y, columns, rows, index_offset = ZOOM.unpack_from(self._mm, pos)
+            self._zooms[zoom] = (min_x, min_y, columns, rows, index_offset)
+            pos += ZOOM.size
+
+    @property
+    def zooms(self):
+        return sorted(self._zooms)
+
+    def get(self, zoom, x, y):
+        """Return the encoded tile (png bytes), or None if the archive does not have it."""
+        level = self._zooms.get(zoom)
+        if level is None:
+            return None
+        min_x, min_y, columns, rows, index_offset = level
+
+        col = x - min_x
+        row = y - min_y
+        if not (0 <= col < columns and 0 <= row < rows):
+            return None
+
+        offset, length = INDEX.unpack_from(self._mm, index_offset + (row * columns + col) * INDEX.size)
+        if length == 0:
+            return None
+        return self._mm[offset:offset + length]
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def scan_tile_tree(root):
+    """Return {zoom: {(x, y): path}} for a <zoom>/<x>/<y>.png tile tree."""
+    tiles = {}
+    for zoom_name in os.listdir(root):
+        zoom_dir = os.path.join(root, zoom_name)
+        if not zoom_name.isdigit() or not os.path.isdir(zoom_dir):
+            continue
+        level = tiles.setdefault(int(zoom_name), {})
+        for x_name in os.listdir(zoom_dir):
+            x_dir = os.path.join(zoom_dir, x_name)
+            if not x_name.isdigit() or not os.path.isdir(x_dir):
+                continue
+            for file_name in os.listdir(x_dir):
+                y_name, ext = os.path.splitext(file_name)
+                if ext.lower() == ".png" and y_name.isdigit():
+                    level[(int(x_name), int(y_name))] = os.path.join(x_dir, file_name)
+    return {zoom: level for zoom, level in tiles.items() if level}
+
+
+def build_archive(tile_root, path):
+    """
+    Pack a tile tree into an archive at path. Identical tiles (sea, empty land)
+    are stored once. Returns (tiles, unique tiles, archive size in bytes).
+    """
+    tiles = scan_tile_tree(tile_root)
+    if not tiles:
+        raise ValueError(f"No <zoom>/<x>/<y>.png tiles found in {tile_root}")
+
+    # Place the zoom directory and indexes first, tile data follows
+    levels = []
+    pos = len(MAGIC) + HEADER.size + len(tiles) * ZOOM.size
+    for zoom in sorted(tiles):
+        xs = [x for x, _ in tiles[zoom]]
+        ys = [y for _, y in tiles[zoom]]
+        min_x, min_y = min(xs), min(ys)
+        columns, rows = max(xs) - min_x + 1, max(ys) - min_y + 1
+        levels.append((zoom, min_x, min_y, columns, rows, pos))
+        pos += columns * rows * INDEX.size
+    data_start = pos
+
+    tmp_path = path + ".tmp"
+    unique = {}
+    count = 0
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(len(levels)))
+        for level in levels:
+            f.write(ZOOM.pack(*level))
+
+        f.seek(data_start)
+        index = {}
+        for zoom, min_x, min_y, columns, rows, _ in levels:
+            for (x, y), tile_path in tiles[zoom].items():
+                with open(tile_path, "rb") as tile:
+                    data = tile.read()
+                digest = hashlib.sha1(data).digest()
+                if digest not in unique:
+                    unique[digest] = (f.tell(), len(data))
+                    f.write(data)
+                index[(zoom, (y - min_y) * columns + (x - min_x))] = unique[digest]
+                count += 1
+
+        for zoom, _, _, columns, rows, index_offset in levels:
+            f.seek(index_offset)
+            f.write(b"".join(
+                INDEX.pack(*index.get((zoom, i), (0, 0))) for i in range(columns * rows)
+            ))
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return count, len(unique), os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack a <zoom>/<x>/<y>.png tile tree into a single tile archive.")
+    parser.add_argument("tile_root", help="tile tree, e.g. src/dashboardGUI/lib/mapNL")
+    parser.add_argument("archive", nargs="?", help=f"output file (default: <tile_root>{ARCHIVE_EXTENSION})")
+    args = parser.parse_args()
+
+    tile_root = os.path.normpath(args.tile_root)
+    path = args.archive or tile_root + ARCHIVE_EXTENSION
+    count, unique, size = build_archive(tile_root, path)
+    print(f"[INFO] Packed {count} tiles ({unique} unique) into {path}, {size / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Trip computer: distance, moving time, average/max speed, time per RPM band
+and peak accelerations, updated in O(1) per sample.
+
+The state is a handful of numbers, checkpointed to a small JSON file so a
+power cut only loses the last few seconds of the trip.
+
+Reprocess a recorded drive (any segment of it, see src/telemetryReader.py):
+    python -m src.tripComputer logs/drive_20250101_120000_000.tlog
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+from src.motionModel import EARTH_RADIUS
+
+# Upper edges of the RPM bands, the last band is everything above
+RPM_BAND_EDGES = (1000, 2000, 3000, 4000, 5000)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Distance in metres between two positions in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, a)))
+
+
+class TripComputer:
+    """
+    Accumulates the trip statistics from sensor samples. Every update_*()
+    takes the time of the sample (seconds, any clock, only differences are
+    used) and does a constant amount of work.
+
+    - distance: sum of the distances between consecutive GPS fixes while
+      moving (GPS drift while standing still is ignored, as are jumps
+      faster than max_plausible_speed)
+    - moving time: time with a speed of at least min_speed, average speed
+      is distance / moving time
+    - RPM bands: seconds spent in each band of RPM_BAND_EDGES, engine running
+    - peak longitudinal (acceleration, braking) and lateral acceleration in g
+    """
+
+    def __init__(self, min_speed=3.0, max_gap=5.0, max_plausible_speed=100.0):
+        self.min_speed = min_speed  # km/h
+        self.max_gap = max_gap  # seconds, longer gaps between samples are not counted as time
+        self.max_plausible_speed = max_plausible_speed  # m/s
+        self.reset()
+
+    def reset(self, started=None):
+        self.started = time.time() if started is None else started
+        self.distance = 0.0  # metres
+        self.moving_time = 0.0  # seconds
+        self.max_speed = 0.0  # km/h
+        self.rpm_bands = [0.0] * (len(RPM_BAND_EDGES) + 1)  # seconds
+        self.peak_accel = 0.0  # g
+        self.peak_brake = 0.0
+        self.peak_lateral = 0.0
+
+        # Last samples, not part of the checkpoint
+        self._fix = None  # (lat, lon, t)
+        self._speed = None  # (km/h, t)
+        self._rpm = None  # (rpm, t)
+
+    @property
+    def average_speed(self):
+        """km/h over the moving time."""
+        return self.distance / self.moving_time * 3.6 if self.moving_time > 0 else 0.0
+
+    @property
+    def moving(self):
+        return self._speed is not None and self._speed[0] >= self.min_speed
+
+    # -----------------------------
+    # Samples
+    # -----------------------------
+    def update_speed(self, speed, t):
+        """GPS speed in km/h."""
+        if self.moving:
+            dt = t - self._speed[1]
+            if 0 < dt <= self.max_gap:
+                self.moving_time += dt
+        if speed > self.max_speed:
+            self.max_speed = speed
+        self._speed = (speed, t)
+
+    def update_position(self, lat, lon, t):
+        """GPS fix in degrees. Call after update_speed() of the same fix."""
+        if self._fix is not None and self.moving:
+            lat_p, lon_p, t_p = self._fix
+            dt = t - t_p
+            if dt > 0:
+                distance = haversine(lat_p, lon_p, lat, lon)
+                if distance <= self.max_plausible_speed * dt:
+                    self.distance += distance
+        self._fix = (lat, lon, t)
+
+    def update_rpm(self, rpm, t):
+        if self._rpm is not None and self._rpm[0] > 0:
+            dt = t - self._rpm[1]
+            if 0 < dt <= self.max_gap:
+                self.rpm_bands[bisect.bisect_right(RPM_BAND_EDGES, self._rpm[0])] += dt
+        self._rpm = (rpm, t)
+
+    def update_acceleration(self, ax, ay):
+        """Filtered MPU acceleration in g: ax lateral, ay longitudinal (forward positive)."""
+        if ay > self.peak_accel:
+            self.peak_accel = ay
+        if -ay > self.peak_brake:
+            self.peak_brake = -ay
+        if abs(ax) > self.peak_lateral:
+            self.peak_lateral = abs(ax)
+
+    # -----------------------------
+    # Checkpoint
+    # -----------------------------
+    def state(self):
+        return {
+            "started": self.started,
+            "distance": self.distance,
+            "moving_time": self.moving_time,
+            "max_speed": self.max_speed,
+            "rpm_bands": list(self.rpm_bands),
+            "peak_accel": self.peak_accel,
+            "peak_brake": self.peak_brake,
+            "peak_lateral": self.peak_lateral,
+        }
+
+    def restore(self, state):
+        self.reset(state["started"])
+        self.distance = state["distance"]
+        self.moving_time = state["moving_time"]
+        self.max_speed = state["max_speed"]
+        if len(state["rpm_bands"]) == len(self.rpm_bands):
+            self.rpm_bands = list(state["rpm_bands"])
+        self.peak_accel = state["peak_accel"]
+        self.peak_brake = state["peak_brake"]
+        self.peak_lateral = state["peak_lateral"]
+
+    def load(self, path):
+        """Continue the trip of a checkpoint file, if there is a valid one."""
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "r") as f:
+                self.restore(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[WARN] Ignoring trip checkpoint {path}: {e}")
+            return False
+        return True
+
+
+class TripCheckpoint:
+    """
+    Saves the state of a trip at most every interval seconds. The file is
+    written on a background thread (the fsync can take a while on an SD
+    card) and replaced atomically, a power cut keeps the previous checkpoint.
+    """
+
+    def __init__(self, path, interval=5.0):
+        self.path = path
+        self.interval = interval
+        self._last = time.monotonic()
+        self._thread = None
+
+    def update(self, trip):
+        """Start writing a checkpoint if one is due. Cheap, call it as often as convenient."""
+        now = time.monotonic()
+        if now - self._last < self.interval or (self._thread and self._thread.is_alive()):
+            return
+        self._last = now
+        self._thread = threading.Thread(target=self._write, args=(trip.state(),), daemon=True)
+        self._thread.start()
+
+    def save(self, trip):
+        """Write a checkpoint now, e.g. on shutdown."""
+        if self._thread:
+            self._thread.join()
+        self._write(trip.state())
+
+    def _write(self, state):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ERROR] Trip checkpoint failed: {e}")
+
+
+# -----------------------------
+# Offline reprocessing
+# -----------------------------
+REPLAY_CHANNELS = ("velocity", "latitude", "longitude", "rpm", "ax", "ay")
+
+
+def replay_log(log, trip=None, start=None, end=None):
+    """Feed a TelemetryLog through a TripComputer in time order. Returns the trip."""
+    import numpy as np
+
+    trip = trip or TripComputer()
+    series = log.read([name for name in REPLAY_CHANNELS if name in log.channels], start, end)
+
+    # Merge the channels by time; the fix channels share a timestamp per fix and
+    # the stable sort keeps latitude before longitude
+    names = list(series)
+    t = np.concatenate([series[name][0] for name in names])
+    values = np.concatenate([series[name][1] for name in names])
+    ids = np.concatenate([np.full(len(series[name][0]), i) for i, name in enumerate(names)])
+    order = np.argsort(t, kind="stable")
+
+    index = {name: i for i, name in enumerate(names)}
+    velocity, latitude, longitude, rpm, ax, ay = (index.get(name, -1) for name in REPLAY_CHANNELS)
+    lat = None
+    accel = [0.0, 0.0]
+    for i, sample_t, value in zip(ids[order].tolist(), t[order].tolist(), values[order].tolist()):
+        if i == velocity:
+            trip.update_speed(value, sample_t)
+        elif i == latitude:
+            lat = value
+        elif i == longitude:
+            if lat is not None:
+                trip.update_position(lat, value, sample_t)
+        elif i == rpm:
+            trip.update_rpm(value, sample_t)
+        elif i == ax or i == ay:
+            accel[i == ay] = value
+            trip.update_acceleration(*accel)
+    return trip
+
+
+def format_summary(trip):
+    hours, rest = divmod(int(trip.moving_time), 3600)
+    bands = [f"<{RPM_BAND_EDGES[0]}"] + [
+        f"{low}-{high}" for low, high in zip(RPM_BAND_EDGES, RPM_BAND_EDGES[1:])
+    ] + [f">{RPM_BAND_EDGES[-1]}"]
+    engine_time = sum(trip.rpm_bands) or 1.0
+    lines = [
+        f"distance           {trip.distance / 1000:.2f} km",
+        f"moving time        {hours}:{rest // 60:02d}:{rest % 60:02d}",
+        f"average speed      {trip.average_speed:.1f} km/h",
+        f"max speed          {trip.max_speed:.1f} km/h",
+        f"peak acceleration  {trip.peak_accel:.2f} g",
+        f"peak braking       {trip.peak_brake:.2f} g",
+        f"peak lateral       {trip.peak_lateral:.2f} g",
+    ]
+    for band, seconds in zip(bands, trip.rpm_bands):
+        lines.append(f"rpm {band:<14} {seconds / 60:6.1f} min  {seconds / engine_time * 100:5.1f} %")
+    return "\n".join(lines)
+
+
+def main():
+    from src.telemetryReader import TelemetryLog, find_segments
+
+    parser = argparse.ArgumentParser(description="Compute the trip statistics of a recorded telemetry log.")
+    parser.add_argument("log", nargs="+", help="segment file(s); one segment selects its whole drive")
+    args = parser.parse_args()
+
+    log = TelemetryLog(find_segments(args.log[0]) if len(args.log) == 1 else args.log)
+    if log.start_time is None:
+        print("[WARN] The log is empty")
+        return
+
+    began = time.perf_counter()
+    trip = TripComputer()
+    trip.reset(started=log.start_time)
+    replay_log(log, trip)
+    elapsed = time.perf_counter() - began
+    duration = log.end_time - log.start_time
+    print(format_summary(trip))
+    print(f"[INFO] {log.records} records, {duration:.0f} s drive processed in {elapsed:.2f} s "
+          f"({duration / max(elapsed, 1e-9):,.0f}x real time)")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from PySide6.QtCore import QObject, Signal, Property
+
+
+class ViewCache(QObject):
+    """
+    Decides which views of main.qml exist. Every view is a Loader that is
+    only active while its name is in warmViews: the view shown, the views
+    shown before it (keep in total, most recent first) and, with
+    preload_next, the next view of the button cycle, created in the
+    background so the next press does not wait for it.
+
+    The techno view is one of two components depending on showOverlays,
+    they are cached separately as "technoClassic" and "technoModern".
+    """
+
+    warmViewsChanged = Signal()
+
+    def __init__(self, backend, cycle, keep=2, preload_next=True):
+        super().__init__()
+        self.backend = backend
+        self.cycle = cycle
+        self.keep = max(1, keep)
+        self.preload_next = preload_next
+        self._recent = []  # most recent first
+        self._warm = []
+
+        backend.currentViewChanged.connect(self.update)
+        backend.showOverlaysChanged.connect(self.update)
+        self.update()
+
+    def component(self, view):
+        """Name of the cached component that shows a view."""
+        if view == "techno":
+            return "technoClassic" if self.backend.showOverlays else "technoModern"
+        return view
+
+    def update(self):
+        current = self.component(self.backend.currentView)
+        self._recent = ([current] + [name for name in self._recent if name != current])[:self.keep]
+
+        warm = list(self._recent)
+        if self.preload_next and self.backend.currentView in self.cycle:
+            index = self.cycle.index(self.backend.currentView)
+            upcoming = self.component(self.cycle[(index + 1) % len(self.cycle)])
+            if upcoming not in warm:
+                warm.append(upcoming)
+
+        if warm != self._warm:
+            self._warm = warm
+            self.warmViewsChanged.emit()
+
+    @Property(list, notify=warmViewsChanged)
+    def warmViews(self): return self._warm